@@ -0,0 +1,73 @@
+# benchmarks/bench_busca_titulo.py
+"""
+Compara a busca por trecho do título com e sem o índice de trigramas.
+
+Cria um banco SQLite temporário com N tarefas de títulos sintéticos e mede
+`TarefaDAO.filtrar_tarefas({"titulo": ...})` para termos raros e comuns,
+primeiro com `titulo LIKE '%valor%'` puro e depois usando o índice.
+
+Uso:
+    python -m benchmarks.bench_busca_titulo [quantidade] [repeticoes]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.dados import PALAVRAS
+
+
+def gerar_titulos(quantidade: int, semente: int = 42):
+    """Gera títulos determinísticos de 2 a 5 palavras com um código único."""
+    rnd = random.Random(semente)
+    for i in range(quantidade):
+        palavras = rnd.choices(PALAVRAS, k=rnd.randint(2, 5))
+        yield f"{' '.join(palavras).capitalize()} #{i:07d}"
+
+
+def medir(busca, repeticoes: int) -> tuple[float, int]:
+    tempos = []
+    encontrados = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        encontrados = len(busca())
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos), encontrados
+
+
+def main(quantidade: int = 1_000_000, repeticoes: int = 5) -> list[dict]:
+    os.environ["DB_ENGINE"] = "sqlite"
+    os.environ["DB_SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_titulo.db")
+
+    from dao.tarefa_dao import TarefaDAO
+    from models.tarefa import Tarefa
+
+    inicio = time.perf_counter()
+    TarefaDAO.inserir_lote((Tarefa(titulo=t, descricao="") for t in gerar_titulos(quantidade)),
+                           chunk_size=5000)
+    print(f"{quantidade:,} tarefas inseridas em {time.perf_counter() - inicio:.1f}s")
+
+    termos = {
+        "código único": f"#{quantidade // 2:07d}",
+        "palavra rara": "auditoria treinamento",
+        "palavra comum": "cliente",
+    }
+    resultados = []
+    for descricao, termo in termos.items():
+        linha = {"termo": termo, "tipo": descricao}
+        for usar_indice in (False, True):
+            TarefaDAO.usar_indice_titulo = usar_indice
+            duracao, encontrados = medir(lambda: TarefaDAO.filtrar_tarefas({"titulo": termo}), repeticoes)
+            linha["indice" if usar_indice else "like"] = duracao
+            linha["encontrados"] = encontrados
+        resultados.append(linha)
+        print(f"{descricao:<14} {termo!r:<26} {linha['encontrados']:>8} linhas  "
+              f"LIKE {linha['like'] * 1000:>9.1f} ms  índice {linha['indice'] * 1000:>9.1f} ms")
+    TarefaDAO.usar_indice_titulo = True
+    return resultados
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
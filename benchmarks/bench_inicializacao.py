@@ -0,0 +1,94 @@
+# benchmarks/bench_inicializacao.py
+"""
+Mede o custo de inicialização da linha de comando (ui/cli.py).
+
+Cada medição roda num interpretador novo, como numa chamada feita por cron
+ou script:
+- importação de main e ui.cli mais a montagem do parser, comparada com
+  ORCAMENTO_MS e conferida contra a lista MODULOS_PESADOS (nenhum deles
+  pode ser importado antes de um comando precisar do banco);
+- tempo total de `python main.py --help` e de `python -c pass`, para
+  referência do custo do próprio interpretador.
+
+Uso:
+    python -m benchmarks.bench_inicializacao [repeticoes]
+
+Sai com código 1 se o orçamento for estourado ou algum módulo pesado for
+importado.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Orçamento para importar main + ui.cli e montar o parser (menor tempo entre
+# as repetições). Medido em ~23 ms, dos quais ~15 ms são do argparse; importar
+# o DAO junto custava mais ~45 ms.
+ORCAMENTO_MS = 40.0
+
+MODULOS_PESADOS = ("dao.tarefa_dao", "db.motores", "db.sqlite", "dotenv", "mysql.connector", "ui.menu", "sqlite3")
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CODIGO = f"""
+import json, sys, time
+inicio = time.perf_counter()
+import main
+from ui import cli
+cli.criar_parser()
+ms = (time.perf_counter() - inicio) * 1000
+print(json.dumps({{"ms": ms, "pesados": [m for m in {MODULOS_PESADOS!r} if m in sys.modules]}}))
+"""
+
+
+def medir_importacao(repeticoes: int = 5) -> dict:
+    """
+    Importa main e ui.cli em `repeticoes` interpretadores novos.
+
+    Retorna {'min_ms', 'mediana_ms', 'pesados'}: o menor e o mediano tempo
+    de importação e os módulos de MODULOS_PESADOS que foram carregados.
+    """
+    tempos = []
+    pesados = set()
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, "-c", _CODIGO], cwd=RAIZ, capture_output=True, text=True, check=True)
+        resultado = json.loads(saida.stdout)
+        tempos.append(resultado["ms"])
+        pesados.update(resultado["pesados"])
+    tempos.sort()
+    return {"min_ms": tempos[0], "mediana_ms": tempos[len(tempos) // 2], "pesados": sorted(pesados)}
+
+
+def medir_comando(argumentos: list[str], repeticoes: int = 5) -> float:
+    """Menor tempo total, em ms, de `repeticoes` execuções do comando num processo novo."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, *argumentos], cwd=RAIZ, capture_output=True)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return min(tempos)
+
+
+def main(repeticoes: int = 10) -> int:
+    importacao = medir_importacao(repeticoes)
+    interpretador = medir_comando(["-c", "pass"], repeticoes)
+    ajuda = medir_comando(["main.py", "--help"], repeticoes)
+
+    print(f"Importação de main + ui.cli: min {importacao['min_ms']:.1f} ms, "
+          f"mediana {importacao['mediana_ms']:.1f} ms (orçamento {ORCAMENTO_MS:.0f} ms)")
+    print(f"python -c pass:              {interpretador:.1f} ms")
+    print(f"python main.py --help:       {ajuda:.1f} ms")
+
+    falhou = False
+    if importacao["pesados"]:
+        print(f"[REGRESSÃO] Módulos pesados importados na inicialização: {importacao['pesados']}")
+        falhou = True
+    if importacao["min_ms"] > ORCAMENTO_MS:
+        print(f"[REGRESSÃO] Inicialização acima do orçamento de {ORCAMENTO_MS:.0f} ms")
+        falhou = True
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:])))
@@ -0,0 +1,78 @@
+# benchmarks/bench_modelo.py
+"""
+Compara memória e velocidade de construção do modelo Tarefa.
+
+Cenários:
+- "dict": modelo antigo (atributos em __dict__, criado com Tarefa(**linha)).
+- "slots_init": modelo atual criado com Tarefa(**linha) (valida os campos).
+- "slots_de_linha": modelo atual criado com Tarefa.de_linha(tupla), como faz o DAO.
+
+Uso:
+    python -m benchmarks.bench_modelo [quantidade]
+"""
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from models.tarefa import Tarefa
+
+
+class TarefaDict:
+    """Réplica do modelo antigo, sem __slots__, para comparação."""
+    PRIORIDADE_VALIDAS = ["Baixa", "Media", "Alta"]
+    STATUS_VALIDOS = ["Pendente", "Concluída"]
+
+    def __init__(self, titulo, descricao, prioridade="Media", status="Pendente", data_criacao=None, id=None):
+        prioridade = prioridade.capitalize()
+        status = status.capitalize()
+        if prioridade not in TarefaDict.PRIORIDADE_VALIDAS:
+            raise ValueError(prioridade)
+        if status not in TarefaDict.STATUS_VALIDOS:
+            raise ValueError(status)
+        self.id = id
+        self.titulo = titulo
+        self.descricao = descricao
+        self.prioridade = prioridade
+        self.status = status
+        self.data_criacao = data_criacao or datetime.now()
+
+
+def gerar_linhas(quantidade: int) -> list[tuple]:
+    agora = datetime.now()
+    return [(i, f"Tarefa {i}", "Descrição", i % 3 + 1,
+             Tarefa.STATUS_VALIDOS[i % 2], agora) for i in range(quantidade)]
+
+
+def medir(nome: str, construir, linhas) -> dict:
+    inicio = time.perf_counter()
+    construir(linhas)
+    duracao = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    objetos = construir(linhas)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objetos
+    return {"cenario": nome, "segundos": duracao, "linhas_s": len(linhas) / duracao,
+            "bytes_por_objeto": memoria / len(linhas)}
+
+
+def main(quantidade: int = 200_000) -> list[dict]:
+    linhas = gerar_linhas(quantidade)
+    chaves = ("id", "titulo", "descricao", "prioridade", "status", "data_criacao")
+    dicts = [dict(zip(chaves, linha), prioridade=Tarefa.PRIORIDADE_POR_NIVEL[linha[3]])
+             for linha in linhas]
+
+    resultados = [
+        medir("dict", lambda _: [TarefaDict(**d) for d in dicts], linhas),
+        medir("slots_init", lambda _: [Tarefa(**d) for d in dicts], linhas),
+        medir("slots_de_linha", lambda ls: [Tarefa.de_linha(l) for l in ls], linhas),
+    ]
+    for r in resultados:
+        print(f"{r['cenario']:<16} {r['linhas_s']:>12,.0f} linhas/s  {r['bytes_por_objeto']:>7.1f} bytes/objeto")
+    return resultados
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,384 @@
+# benchmarks/carga.py
+"""
+Gerador de carga concorrente contra o TarefaDAO.
+
+Simula vários clientes ao mesmo tempo, cada um numa thread, sorteando a
+próxima operação por um mix configurável de leituras, filtros e escritas.
+Com --processos, cada processo roda --threads clientes e tem o próprio motor
+(pool ou conexões SQLite), como várias instâncias da aplicação.
+
+A cada intervalo mostra vazão, latências p50/p95/p99 (medidas no cliente) e
+erros; no fim, um resumo por operação, a espera por conexão (fase 'conexao'
+de utils.metricas) e as estatísticas do motor. É o que usamos para validar
+mudanças de pool, cache e índices sob contenção e para achar o ponto em que
+faltam conexões ou sobram travas.
+
+Uso:
+    python -m benchmarks.carga --threads 16 --duracao 30
+    python -m benchmarks.carga --processos 4 --threads 8 --mix buscar_por_id=80,inserir=20
+    python -m benchmarks.carga --sqlite /tmp/carga.db --popular 100000 --saida carga.json
+
+Sem --sqlite, usa o motor configurado em DB_ENGINE (MySQL por padrão).
+Erros são os contados por utils.metricas: falhas registradas pelo DAO via
+`_tratar_erro` e exceções que escaparam dele.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from itertools import combinations
+from types import SimpleNamespace
+
+OPERACOES = ("buscar_por_id", "filtrar_paginado", "listar_paginado", "inserir", "atualizar", "excluir")
+MIX_PADRAO = "buscar_por_id=50,filtrar_paginado=15,listar_paginado=15,inserir=10,atualizar=7,excluir=3"
+TAMANHO_PAGINA = 50
+
+
+def ler_mix(texto: str) -> dict[str, float]:
+    """Converte 'operacao=peso,...' em {operacao: peso}, validando nomes e pesos."""
+    mix = {}
+    for item in texto.split(","):
+        nome, _, peso = item.strip().partition("=")
+        if nome not in OPERACOES:
+            raise ValueError(f"Operação desconhecida no mix: {nome!r}. Use: {OPERACOES}")
+        try:
+            mix[nome] = float(peso)
+        except ValueError:
+            raise ValueError(f"Peso inválido para {nome}: {peso!r}") from None
+        if mix[nome] < 0:
+            raise ValueError(f"Peso negativo para {nome}")
+    if not sum(mix.values()):
+        raise ValueError("O mix precisa de ao menos uma operação com peso maior que zero")
+    return mix
+
+
+class _Cliente:
+    """Um usuário simulado: sorteia operações e guarda o próprio estado (IDs inseridos, página)."""
+
+    def __init__(self, config: SimpleNamespace, semente: int):
+        from benchmarks.dados import PALAVRAS, PRIORIDADES, STATUS, gerar_tarefas
+        from dao.tarefa_dao import TarefaDAO
+
+        self.dao = TarefaDAO
+        self.rnd = random.Random(semente)
+        self.config = config
+        self.operacoes = list(config.mix)
+        self.pesos = list(config.mix.values())
+        self.novas = gerar_tarefas(sys.maxsize, semente)
+        self.inseridos = []
+        self.token = None
+        self.ordenacao = (None, None)
+        # Filtros como os de uma tela de busca: uma palavra comum, prioridade e/ou status
+        valores = {"titulo": PALAVRAS[:20], "prioridade": PRIORIDADES, "status": STATUS}
+        self.combinacoes = [campos for quantidade in range(1, 4) for campos in combinations(valores, quantidade)]
+        self.valores = valores
+
+    def _id_existente(self) -> int:
+        return self.rnd.randint(self.config.menor_id, self.config.maior_id)
+
+    def executar(self) -> str:
+        """Executa uma operação sorteada e retorna o nome dela."""
+        operacao = self.rnd.choices(self.operacoes, self.pesos)[0]
+        getattr(self, operacao)()
+        return operacao
+
+    def buscar_por_id(self) -> None:
+        self.dao.buscar_por_id(self._id_existente())
+
+    def filtrar_paginado(self) -> None:
+        campos = self.rnd.choice(self.combinacoes)
+        filtros = {campo: self.rnd.choice(self.valores[campo]) for campo in campos}
+        self.dao.filtrar_paginado(filtros, limite=TAMANHO_PAGINA)
+
+    def listar_paginado(self) -> None:
+        # Continua rolando a listagem atual; ao chegar ao fim (ou com 20% de
+        # chance) recomeça com outra ordenação
+        if self.token is None or self.rnd.random() < 0.2:
+            campo = self.rnd.choice((None, *self.dao.campos_ordenacao))
+            self.ordenacao = (campo, self.rnd.choice(self.dao.direcoes) if campo else None)
+            self.token = None
+        _, self.token = self.dao.listar_paginado(*self.ordenacao, limite=TAMANHO_PAGINA, token=self.token)
+
+    def inserir(self) -> None:
+        tarefa_id = self.dao.inserir(next(self.novas))
+        if tarefa_id is not None:
+            self.inseridos.append(tarefa_id)
+
+    def atualizar(self) -> None:
+        tarefa = next(self.novas)
+        tarefa.id = self._id_existente()
+        self.dao.atualizar(tarefa)
+
+    def excluir(self) -> None:
+        # Exclui de preferência o que o próprio cliente inseriu, para a tabela não encolher
+        self.dao.excluir(self.inseridos.pop() if self.inseridos else self._id_existente())
+
+
+class _Coletor:
+    """Latências por intervalo e operação, compartilhadas pelas threads de um processo."""
+
+    def __init__(self, inicio: float, intervalo: float, intervalos: int):
+        from utils.metricas import Histograma
+
+        self._histograma = Histograma
+        self.inicio = inicio
+        self.intervalo = intervalo
+        self.intervalos = intervalos
+        self._lock = threading.Lock()
+        self._dados: dict[int, dict] = {}
+
+    def registrar(self, operacao: str, segundos: float) -> None:
+        with self._lock:
+            # Calculado sob o lock: depois que `retirar(k)` roda, nada mais cai em k
+            indice = min(int((time.time() - self.inicio) / self.intervalo), self.intervalos - 1)
+            operacoes = self._dados.setdefault(indice, {})
+            if (histograma := operacoes.get(operacao)) is None:
+                histograma = operacoes[operacao] = self._histograma()
+            histograma.observar(segundos)
+
+    def retirar(self, indice: int) -> dict:
+        with self._lock:
+            operacoes = self._dados.pop(indice, {})
+        return {nome: (h.contagens, h.soma, h.total, h.maximo) for nome, h in operacoes.items()}
+
+
+def _erros_dao() -> Counter:
+    from utils import metricas
+    return Counter({metodo: dados["erros"] for metodo, dados in metricas.instantaneo().items() if dados["erros"]})
+
+
+def _executar_processo(config: SimpleNamespace, processo: int, fila, largada, inicio_compartilhado) -> None:
+    """
+    Roda `config.threads` clientes até o fim do teste e envia, a cada
+    intervalo, as latências e os erros do processo para `fila`.
+    """
+    from dao.tarefa_dao import TarefaDAO
+    from utils import metricas
+
+    metricas_antes = metricas.ativo()
+    metricas.ativar()
+    if config.cache:
+        TarefaDAO.ativar_cache()
+    try:
+        _rodar_clientes(config, processo, fila, largada, inicio_compartilhado)
+    finally:
+        if not metricas_antes:
+            metricas.desativar()
+        if config.cache:
+            TarefaDAO.desativar_cache()
+
+
+def _rodar_clientes(config: SimpleNamespace, processo: int, fila, largada, inicio_compartilhado) -> None:
+    from db.motores import obter_motor
+    from utils import metricas
+
+    clientes = [_Cliente(config, config.semente + processo * 1000 + i) for i in range(config.threads)]
+    fila.put(("pronto", processo, None))
+    largada.wait()
+
+    inicio = inicio_compartilhado.value
+    fim = inicio + config.duracao
+    intervalos = max(1, round(config.duracao / config.intervalo))
+    coletor = _Coletor(inicio, config.intervalo, intervalos)
+
+    def rodar(cliente: _Cliente) -> None:
+        while time.time() < fim:
+            comeco = time.perf_counter()
+            try:
+                operacao = cliente.executar()
+            except Exception:
+                # Já contada como erro do método por utils.metricas
+                continue
+            coletor.registrar(operacao, time.perf_counter() - comeco)
+
+    threads = [threading.Thread(target=rodar, args=(cliente,), daemon=True) for cliente in clientes]
+    for thread in threads:
+        thread.start()
+
+    erros_antes = Counter()
+    for indice in range(intervalos):
+        if indice == intervalos - 1:
+            for thread in threads:
+                thread.join()
+        else:
+            time.sleep(max(0.0, inicio + (indice + 1) * config.intervalo - time.time()))
+        erros = _erros_dao()
+        fila.put(("intervalo", processo, (indice, coletor.retirar(indice), dict(erros - erros_antes))))
+        erros_antes = erros
+
+    conexao = {metodo: dados["fases"]["conexao"]["p99"]
+               for metodo, dados in metricas.instantaneo().items() if "conexao" in dados["fases"]}
+    fila.put(("fim", processo, {"motor": obter_motor().estatisticas(),
+                                "espera_conexao_p99": max(conexao.values(), default=0.0)}))
+
+
+def _faixa_ids() -> tuple[int, int]:
+    from db.motores import obter_motor
+
+    motor = obter_motor()
+    with motor.conexao() as conn, motor.cursor(conn) as cursor:
+        cursor.execute("SELECT MIN(id), MAX(id) FROM tarefas")
+        menor, maior = cursor.fetchone()
+    return menor or 1, maior or 1
+
+
+def executar(config: SimpleNamespace, saida=sys.stderr) -> dict:
+    """
+    Roda o teste de carga e devolve o relatório.
+
+    `config` tem os mesmos campos dos argumentos da linha de comando (mix já
+    convertido por `ler_mix`); `saida` recebe a linha de cada intervalo.
+    """
+    from utils.metricas import Histograma
+
+    if config.popular:
+        from benchmarks.dados import gerar_tarefas
+        from dao.tarefa_dao import TarefaDAO
+        _, erros = TarefaDAO.inserir_lote(gerar_tarefas(config.popular, config.semente), chunk_size=5000)
+        if erros:
+            raise RuntimeError(f"Falha ao popular a tabela: {erros[0]}")
+    config.menor_id, config.maior_id = _faixa_ids()
+
+    if config.processos > 1:
+        contexto = multiprocessing.get_context("spawn")
+        fila, largada, inicio = contexto.Queue(), contexto.Event(), contexto.Value("d", 0.0)
+        trabalhadores = [contexto.Process(target=_executar_processo, args=(config, i, fila, largada, inicio))
+                         for i in range(config.processos)]
+    else:
+        fila, largada, inicio = queue.Queue(), threading.Event(), SimpleNamespace(value=0.0)
+        trabalhadores = [threading.Thread(target=_executar_processo, args=(config, 0, fila, largada, inicio),
+                                          daemon=True)]
+    for trabalhador in trabalhadores:
+        trabalhador.start()
+
+    prontos = 0
+    while prontos < config.processos:
+        tipo, _, _ = fila.get()
+        prontos += tipo == "pronto"
+    inicio.value = time.time()
+    largada.set()
+
+    recebidos: dict[int, list] = {}
+    totais: dict[str, Histograma] = {}
+    erros_totais = Counter()
+    linha_tempo = []
+    finais = {}
+    proximo = 0
+    while len(finais) < config.processos:
+        tipo, processo, dados = fila.get()
+        if tipo == "fim":
+            finais[processo] = dados
+            continue
+        indice, operacoes, erros = dados
+        parcial = recebidos.setdefault(indice, [{}, Counter(), 0])
+        for nome, (contagens, soma, total, maximo) in operacoes.items():
+            for destino in (parcial[0].setdefault(nome, Histograma()), totais.setdefault(nome, Histograma())):
+                destino.contagens = [a + b for a, b in zip(destino.contagens, contagens)]
+                destino.soma += soma
+                destino.total += total
+                destino.maximo = max(destino.maximo, maximo)
+        parcial[1].update(erros)
+        erros_totais.update(erros)
+        parcial[2] += 1
+        # Mostra os intervalos em ordem, assim que todos os processos enviaram
+        while proximo in recebidos and recebidos[proximo][2] == config.processos:
+            item = _resumo_intervalo(proximo, config.intervalo, *recebidos.pop(proximo)[:2])
+            linha_tempo.append(item)
+            print(f"  t={item['segundo']:>5.0f}s {item['ops_s']:>9.0f} op/s  p50 {item['p50_ms']:>8.2f} ms  "
+                  f"p95 {item['p95_ms']:>8.2f} ms  p99 {item['p99_ms']:>8.2f} ms  "
+                  f"erros {item['erros']} ({item['taxa_erros']:.2%})", file=saida)
+            proximo += 1
+    for trabalhador in trabalhadores:
+        trabalhador.join()
+
+    operacoes = sum(h.total for h in totais.values())
+    return {
+        "config": {chave: valor for chave, valor in vars(config).items()},
+        "operacoes": operacoes,
+        "ops_s": operacoes / config.duracao,
+        "erros": dict(erros_totais),
+        "taxa_erros": sum(erros_totais.values()) / operacoes if operacoes else 0.0,
+        "por_operacao": {nome: {"contagem": h.total, "ops_s": h.total / config.duracao,
+                                **_percentis_ms(h)} for nome, h in sorted(totais.items())},
+        "espera_conexao_p99_ms": max(d["espera_conexao_p99"] for d in finais.values()) * 1000,
+        "motor": [finais[i]["motor"] for i in sorted(finais)],
+        "intervalos": linha_tempo,
+    }
+
+
+def _percentis_ms(histograma) -> dict:
+    return {"p50_ms": histograma.percentil(0.5) * 1000, "p95_ms": histograma.percentil(0.95) * 1000,
+            "p99_ms": histograma.percentil(0.99) * 1000, "max_ms": histograma.maximo * 1000}
+
+
+def _resumo_intervalo(indice: int, intervalo: float, operacoes: dict, erros: Counter) -> dict:
+    from utils.metricas import Histograma
+
+    todas = Histograma()
+    for h in operacoes.values():
+        todas.contagens = [a + b for a, b in zip(todas.contagens, h.contagens)]
+        todas.soma += h.soma
+        todas.total += h.total
+        todas.maximo = max(todas.maximo, h.maximo)
+    quantidade_erros = sum(erros.values())
+    return {
+        "segundo": (indice + 1) * intervalo,
+        "operacoes": todas.total,
+        "ops_s": todas.total / intervalo,
+        **_percentis_ms(todas),
+        "erros": quantidade_erros,
+        "taxa_erros": quantidade_erros / todas.total if todas.total else 0.0,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.carga", description="Teste de carga do TarefaDAO.")
+    parser.add_argument("--threads", type=int, default=8, help="clientes simultâneos por processo (padrão: 8)")
+    parser.add_argument("--processos", type=int, default=1, help="processos, cada um com seu motor (padrão: 1)")
+    parser.add_argument("--duracao", type=float, default=30.0, help="segundos de teste (padrão: 30)")
+    parser.add_argument("--intervalo", type=float, default=1.0, help="segundos por linha do relatório (padrão: 1)")
+    parser.add_argument("--mix", default=MIX_PADRAO, help=f"pesos das operações (padrão: {MIX_PADRAO})")
+    parser.add_argument("--popular", type=int, default=0, help="tarefas inseridas antes do teste")
+    parser.add_argument("--cache", action="store_true", help="liga o cache de buscar_por_id do DAO")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--sqlite", metavar="CAMINHO", help="usa um banco SQLite local em vez de DB_ENGINE")
+    parser.add_argument("--saida", help="grava o relatório em JSON neste arquivo")
+    args = parser.parse_args(argv)
+
+    if args.threads < 1 or args.processos < 1 or args.duracao <= 0 or args.intervalo <= 0:
+        parser.error("threads, processos, duracao e intervalo devem ser positivos")
+    try:
+        args.mix = ler_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.sqlite:
+        # Antes de importar o DAO; os processos filhos herdam o ambiente
+        os.environ["DB_ENGINE"] = "sqlite"
+        os.environ["DB_SQLITE_PATH"] = args.sqlite
+
+    config = SimpleNamespace(**{chave: valor for chave, valor in vars(args).items()
+                                if chave not in ("sqlite", "saida")})
+    relatorio = executar(config)
+
+    print(f"\n{relatorio['operacoes']:,} operações, {relatorio['ops_s']:,.0f} op/s, "
+          f"erros {sum(relatorio['erros'].values())} ({relatorio['taxa_erros']:.2%})", file=sys.stderr)
+    for nome, dados in relatorio["por_operacao"].items():
+        print(f"  {nome:<18} {dados['ops_s']:>9.0f} op/s  p50 {dados['p50_ms']:>8.2f}  p95 {dados['p95_ms']:>8.2f}  "
+              f"p99 {dados['p99_ms']:>8.2f}  max {dados['max_ms']:>8.2f} ms", file=sys.stderr)
+    print(f"  espera por conexão p99: {relatorio['espera_conexao_p99_ms']:.2f} ms", file=sys.stderr)
+    if relatorio["erros"]:
+        print(f"  erros por método: {relatorio['erros']}", file=sys.stderr)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False, default=str)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# benchmarks/dados.py
+"""
+Gerador determinístico de tarefas sintéticas para os benchmarks.
+
+A mesma semente gera sempre as mesmas tarefas. As distribuições imitam um
+uso real: palavras do título seguem uma cauda longa (poucas muito comuns,
+muitas raras), a maioria das tarefas tem prioridade Media e está Pendente, e
+as datas de criação crescem com o ID.
+"""
+import random
+from datetime import datetime, timedelta
+
+from models.tarefa import Tarefa
+
+PALAVRAS = ("relatorio", "reuniao", "cliente", "projeto", "revisar", "enviar", "orcamento",
+            "contrato", "planilha", "apresentacao", "fornecedor", "backup", "servidor",
+            "campanha", "auditoria", "treinamento", "pagamento", "entrega", "estoque", "suporte",
+            "agendar", "atualizar", "banco", "cadastro", "comprar", "configurar", "corrigir",
+            "documentar", "equipe", "fatura", "ferias", "financeiro", "homologar", "implantar",
+            "integracao", "inventario", "juridico", "ligar", "manutencao", "marketing", "mensal",
+            "migrar", "nota", "painel", "pedido", "pesquisa", "prazo", "publicar", "recibo",
+            "reembolso", "renovar", "requisito", "semanal", "seguranca", "site", "sistema",
+            "teste", "trimestral", "usuario", "validar", "vendas", "viagem", "voucher")
+
+# Pesos tipo Zipf: a n-ésima palavra aparece ~1/n vezes a primeira
+PESOS_PALAVRAS = tuple(1 / posicao for posicao in range(1, len(PALAVRAS) + 1))
+PRIORIDADES = ("Media", "Baixa", "Alta")
+PESOS_PRIORIDADES = (0.60, 0.25, 0.15)
+STATUS = ("Pendente", "Concluída")
+PESOS_STATUS = (0.70, 0.30)
+INICIO = datetime(2024, 1, 1)
+
+
+def gerar_tarefas(quantidade: int, semente: int = 42):
+    """
+    Gera `quantidade` tarefas determinísticas.
+
+    Títulos têm de 2 a 8 palavras (cerca de 15 a 80 caracteres) e 30% deles
+    terminam com um código numérico; descrições têm de 0 a 20 palavras.
+    """
+    rnd = random.Random(semente)
+    for i in range(quantidade):
+        titulo = " ".join(rnd.choices(PALAVRAS, PESOS_PALAVRAS, k=rnd.randint(2, 8))).capitalize()
+        if rnd.random() < 0.3:
+            titulo += f" #{rnd.randint(1, 99999):05d}"
+        descricao = " ".join(rnd.choices(PALAVRAS, PESOS_PALAVRAS, k=rnd.randint(0, 20)))
+        yield Tarefa(
+            titulo=titulo,
+            descricao=descricao,
+            prioridade=rnd.choices(PRIORIDADES, PESOS_PRIORIDADES)[0],
+            status=rnd.choices(STATUS, PESOS_STATUS)[0],
+            data_criacao=INICIO + timedelta(seconds=30 * i + rnd.randint(0, 29)),
+        )
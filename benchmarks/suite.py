@@ -0,0 +1,208 @@
+# benchmarks/suite.py
+"""
+Suíte de benchmarks dos caminhos quentes do TarefaDAO.
+
+Para cada tamanho de tabela, cria um banco SQLite temporário (sem servidor),
+carrega tarefas sintéticas determinísticas (benchmarks.dados) e mede:
+- inserir_lote (a própria carga) e inserir (uma tarefa por chamada);
+- buscar_por_id com IDs aleatórios, sem cache;
+- listar sem ordenação e com cada campo/direção de ordenação;
+- filtrar_tarefas com cada combinação de filtros.
+
+Cada cenário roda `repeticoes` vezes (leituras com um aquecimento antes) e
+guarda a mediana; o resultado sai em JSON.
+
+Uso:
+    python -m benchmarks.suite executar [--tamanhos 10000 100000 1000000] [--saida base.json]
+    python -m benchmarks.suite comparar base.json novo.json [--tolerancia 0.15]
+
+`comparar` sai com código 1 se algum cenário ficou mais lento que a
+tolerância, para uso em CI.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import combinations
+
+TAMANHOS = (10_000, 100_000, 1_000_000)
+SEMENTE = 42
+# Valores usados nos filtros: uma palavra de frequência média e os valores
+# mais raros de prioridade/status, como numa busca real
+FILTROS = {"titulo": "auditoria", "prioridade": "Alta", "status": "Concluída"}
+BUSCAS_POR_ID = 2000
+INSERCOES = 200
+# Diferença mínima (ms por operação) para contar como regressão, abaixo disso é ruído
+RUIDO_MS = 0.005
+
+
+def _medir(funcao, repeticoes: int, aquecer: bool = True) -> tuple[list[float], object]:
+    if aquecer:
+        funcao()
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos, resultado
+
+
+def _resultado(tamanho: int, cenario: str, tempos: list[float], operacoes: int, linhas: int | None = None) -> dict:
+    mediana = statistics.median(tempos)
+    return {
+        "tamanho": tamanho,
+        "cenario": cenario,
+        "operacoes": operacoes,
+        "repeticoes": len(tempos),
+        "mediana_s": mediana,
+        "min_s": min(tempos),
+        "ms_por_op": mediana / operacoes * 1000,
+        "min_ms_por_op": min(tempos) / operacoes * 1000,
+        "linhas": linhas,
+    }
+
+
+def executar_tamanho(tamanho: int, repeticoes: int = 3, semente: int = SEMENTE, pasta: str | None = None) -> list[dict]:
+    """Roda todos os cenários numa tabela nova com `tamanho` tarefas."""
+    from benchmarks.dados import gerar_tarefas
+    from dao.tarefa_dao import TarefaDAO
+    from db.motores import definir_motor
+    from db.sqlite import MotorSQLite
+
+    pasta = pasta or tempfile.mkdtemp(prefix="bench_tarefas_")
+    definir_motor(MotorSQLite(os.path.join(pasta, f"bench_{tamanho}.db")))
+    TarefaDAO.desativar_cache()
+    resultados = []
+    try:
+        inicio = time.perf_counter()
+        ids, erros = TarefaDAO.inserir_lote(gerar_tarefas(tamanho, semente), chunk_size=5000)
+        if erros:
+            raise RuntimeError(f"Falha ao carregar a tabela: {erros[0]}")
+        resultados.append(_resultado(tamanho, "inserir_lote", [time.perf_counter() - inicio], tamanho))
+
+        rnd = random.Random(semente)
+        alvos = [rnd.choice(ids) for _ in range(BUSCAS_POR_ID)]
+        tempos, _ = _medir(lambda: [TarefaDAO.buscar_por_id(tarefa_id) for tarefa_id in alvos], repeticoes)
+        resultados.append(_resultado(tamanho, "buscar_por_id", tempos, BUSCAS_POR_ID))
+
+        ordenacoes = [(None, None)] + [(campo, direcao) for campo in TarefaDAO.campos_ordenacao
+                                       for direcao in TarefaDAO.direcoes]
+        for campo, direcao in ordenacoes:
+            tempos, tarefas = _medir(lambda: TarefaDAO.listar(campo, direcao), repeticoes)
+            nome = f"listar[{campo} {direcao}]" if campo else "listar[-]"
+            resultados.append(_resultado(tamanho, nome, tempos, 1, len(tarefas)))
+
+        for quantidade in range(1, len(FILTROS) + 1):
+            for campos in combinations(FILTROS, quantidade):
+                filtros = {campo: FILTROS[campo] for campo in campos}
+                tempos, tarefas = _medir(lambda: TarefaDAO.filtrar_tarefas(filtros), repeticoes)
+                resultados.append(_resultado(tamanho, f"filtrar[{'+'.join(campos)}]", tempos, 1, len(tarefas)))
+
+        # Por último, para não alterar a tabela dos cenários de leitura
+        novas = list(gerar_tarefas(INSERCOES * repeticoes, semente + 1))
+        lotes = iter([novas[i:i + INSERCOES] for i in range(0, len(novas), INSERCOES)])
+        tempos, _ = _medir(lambda: [TarefaDAO.inserir(tarefa) for tarefa in next(lotes)], repeticoes, aquecer=False)
+        resultados.append(_resultado(tamanho, "inserir", tempos, INSERCOES))
+    finally:
+        definir_motor(None)
+    return resultados
+
+
+def executar(tamanhos=TAMANHOS, repeticoes: int = 3, semente: int = SEMENTE) -> dict:
+    """Roda a suíte em cada tamanho e devolve o relatório (o mesmo gravado em JSON)."""
+    resultados = []
+    for tamanho in tamanhos:
+        print(f"== {tamanho:,} tarefas", file=sys.stderr)
+        for item in executar_tamanho(tamanho, repeticoes, semente):
+            resultados.append(item)
+            linhas = f"  {item['linhas']:>9,} linhas" if item["linhas"] is not None else ""
+            print(f"  {item['cenario']:<32} {item['ms_por_op']:>12.4f} ms/op{linhas}", file=sys.stderr)
+    return {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "motor": "sqlite",
+        "semente": semente,
+        "repeticoes": repeticoes,
+        "resultados": resultados,
+    }
+
+
+def comparar(base: dict, novo: dict, tolerancia: float = 0.15) -> list[dict]:
+    """
+    Compara dois relatórios cenário a cenário (mesmo tamanho e nome).
+
+    Usa o melhor tempo por operação de cada cenário, menos sensível a ruído
+    da máquina que a mediana. Retorna um item por cenário presente nos dois,
+    com 'variacao' (razão novo/base - 1) e 'situacao': 'regressao' se
+    ficou mais lento que a tolerância (e acima de RUIDO_MS), 'melhora' se
+    ficou mais rápido na mesma proporção, ou 'igual'.
+    """
+    anteriores = {(item["tamanho"], item["cenario"]): item for item in base["resultados"]}
+    comparacao = []
+    for item in novo["resultados"]:
+        anterior = anteriores.get((item["tamanho"], item["cenario"]))
+        if anterior is None:
+            continue
+        antes, depois = anterior["min_ms_por_op"], item["min_ms_por_op"]
+        variacao = depois / antes - 1 if antes else 0.0
+        situacao = "igual"
+        if abs(depois - antes) >= RUIDO_MS:
+            if variacao > tolerancia:
+                situacao = "regressao"
+            elif variacao < -tolerancia:
+                situacao = "melhora"
+        comparacao.append({"tamanho": item["tamanho"], "cenario": item["cenario"], "base_ms": antes,
+                           "novo_ms": depois, "variacao": variacao, "situacao": situacao})
+    return comparacao
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description="Benchmarks do TarefaDAO.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    executar_cmd = comandos.add_parser("executar", help="roda a suíte e grava o JSON")
+    executar_cmd.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS))
+    executar_cmd.add_argument("--repeticoes", type=int, default=3)
+    executar_cmd.add_argument("--semente", type=int, default=SEMENTE)
+    executar_cmd.add_argument("--saida", help="arquivo JSON (padrão: saída padrão)")
+
+    comparar_cmd = comandos.add_parser("comparar", help="compara dois JSON e aponta regressões")
+    comparar_cmd.add_argument("base")
+    comparar_cmd.add_argument("novo")
+    comparar_cmd.add_argument("--tolerancia", type=float, default=0.15,
+                              help="aumento relativo aceito no tempo por operação (padrão: 0.15)")
+    args = parser.parse_args(argv)
+
+    if args.comando == "executar":
+        relatorio = json.dumps(executar(args.tamanhos, args.repeticoes, args.semente), indent=2, ensure_ascii=False)
+        if args.saida:
+            with open(args.saida, "w", encoding="utf-8") as arquivo:
+                arquivo.write(relatorio + "\n")
+        else:
+            print(relatorio)
+        return 0
+
+    with open(args.base, encoding="utf-8") as arquivo:
+        base = json.load(arquivo)
+    with open(args.novo, encoding="utf-8") as arquivo:
+        novo = json.load(arquivo)
+    comparacao = comparar(base, novo, args.tolerancia)
+    for item in comparacao:
+        marca = {"regressao": "REGRESSÃO", "melhora": "melhora", "igual": ""}[item["situacao"]]
+        print(f"{item['tamanho']:>9,}  {item['cenario']:<32} {item['base_ms']:>11.4f} -> "
+              f"{item['novo_ms']:>11.4f} ms/op  {item['variacao']:>+7.1%}  {marca}")
+    regressoes = sum(item["situacao"] == "regressao" for item in comparacao)
+    print(f"\n{regressoes} regressão(ões) acima de {args.tolerancia:.0%}.")
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# dao/cache.py
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Cache em memória com tamanho limitado (remoção LRU) e tempo de vida (TTL).
+
+    Parâmetros:
+    -----------
+    tamanho_max : int
+        Quantidade máxima de entradas mantidas.
+    ttl : float
+        Tempo de vida de cada entrada, em segundos.
+    relogio : callable
+        Fonte de tempo (padrão: time.monotonic). Útil para testes.
+
+    Observações:
+    ------------
+    - Thread-safe.
+    - `obter` devolve uma cópia rasa do valor, para que alterações feitas
+      pelo chamador não contaminem o cache.
+    - Para evitar que uma leitura lenta grave no cache um valor já
+      invalidado por uma escrita concorrente, pegue uma `marca()` antes de
+      ler do banco e passe-a para `guardar`.
+    """
+
+    def __init__(self, tamanho_max: int = 1024, ttl: float = 60.0, relogio=time.monotonic):
+        if tamanho_max < 1:
+            raise ValueError("tamanho_max deve ser maior que zero")
+        self.tamanho_max = tamanho_max
+        self.ttl = ttl
+        self._relogio = relogio
+        self._dados = OrderedDict()  # chave -> (valor, expira_em)
+        self._lock = threading.Lock()
+        self._invalidacoes = 0
+
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+        self.expiradas = 0
+
+
+    def marca(self) -> int:
+        """Retorna a marca atual de invalidações, a ser usada em `guardar`."""
+        return self._invalidacoes
+
+
+    def obter(self, chave):
+        """Retorna o valor em cache ou None se ausente/expirado."""
+        with self._lock:
+            item = self._dados.get(chave)
+            if item is None:
+                self.falhas += 1
+                return None
+            valor, expira_em = item
+            if expira_em <= self._relogio():
+                del self._dados[chave]
+                self.expiradas += 1
+                self.falhas += 1
+                return None
+            self._dados.move_to_end(chave)
+            self.acertos += 1
+        return copy.copy(valor)
+
+
+    def guardar(self, chave, valor, marca: int | None = None) -> None:
+        """
+        Guarda um valor no cache.
+
+        Se `marca` for informada e alguma invalidação ocorreu depois dela,
+        o valor é descartado, pois pode estar desatualizado.
+        """
+        with self._lock:
+            if marca is not None and marca != self._invalidacoes:
+                return
+            self._dados[chave] = (copy.copy(valor), self._relogio() + self.ttl)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.tamanho_max:
+                self._dados.popitem(last=False)
+                self.remocoes += 1
+
+
+    def invalidar(self, *chaves) -> None:
+        """Remove as chaves informadas do cache."""
+        with self._lock:
+            self._invalidacoes += 1
+            for chave in chaves:
+                self._dados.pop(chave, None)
+
+
+    def limpar(self) -> None:
+        """Remove todas as entradas do cache."""
+        with self._lock:
+            self._invalidacoes += 1
+            self._dados.clear()
+
+
+    def estatisticas(self) -> dict:
+        """Retorna contadores de acertos, falhas, remoções LRU, expirações e o tamanho atual."""
+        with self._lock:
+            return {
+                "tamanho": len(self._dados),
+                "tamanho_max": self.tamanho_max,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "remocoes": self.remocoes,
+                "expiradas": self.expiradas,
+            }
@@ -0,0 +1,206 @@
+# dao/consultas.py
+"""
+Compilador das consultas de leitura de tarefas.
+
+Cada combinação de campos filtrados, ordenação, direção e paginação é uma
+"forma" de consulta. O SQL de uma forma é montado uma única vez, apenas com
+nomes de campos e direções das listas fechadas abaixo, e fica em cache: as
+chamadas seguintes só montam os parâmetros.
+
+Como a mesma forma devolve sempre o mesmo objeto str, o motor reaproveita o
+statement já preparado na conexão (prepared statements do servidor no MySQL,
+cache de statements do sqlite3) em vez de analisar o SQL de novo.
+"""
+from functools import lru_cache
+
+from dao import indice_titulo
+
+TABELA = "tarefas"
+ATRIBUTOS = "id, titulo, descricao, prioridade, status, data_criacao"
+CAMPOS_FILTRO = ("titulo", "prioridade", "status")
+CAMPOS_ATUALIZAVEIS = ("prioridade", "status")
+# Campos que podem formar a chave natural da deduplicação da importação; as
+# candidatas são buscadas pelo primeiro campo indexado da chave
+CAMPOS_CHAVE = ("titulo", "descricao", "prioridade", "status", "data_criacao")
+CAMPOS_CHAVE_INDEXADOS = ("titulo", "data_criacao")
+CAMPOS_ORDENACAO = ("titulo", "prioridade", "status", "data_criacao")
+CAMPOS_AGRUPAMENTO = ("status", "prioridade")
+DIRECOES = ("ASC", "DESC")
+# Caractere de escape do LIKE do título. Vai como parâmetro (ESCAPE %s) para
+# valer igual no MySQL e no SQLite, que leem a barra em literais de formas diferentes
+ESCAPE_LIKE = "\\"
+
+
+def validar_ordenacao(campo_ordem: str | None, direcao: str | None) -> tuple[str | None, str | None]:
+    """
+    Confere o campo e a direção de ordenação contra as listas permitidas.
+
+    Retorna o par normalizado (direção em maiúsculas). Lança ValueError se
+    algum dos dois não for permitido.
+    """
+    if campo_ordem is not None and campo_ordem not in CAMPOS_ORDENACAO:
+        raise ValueError(f"Campo de ordenação inválido. Use: {CAMPOS_ORDENACAO}")
+    if direcao is not None:
+        direcao = direcao.upper()
+        if direcao not in DIRECOES:
+            raise ValueError(f"Direção inválida. Use: {DIRECOES}")
+    return campo_ordem, direcao
+
+
+def campos_filtro(filtros: dict | None) -> tuple[str, ...]:
+    """
+    Campos de `filtros` na ordem canônica de CAMPOS_FILTRO.
+
+    A ordem canônica faz com que {'status': ..., 'titulo': ...} e
+    {'titulo': ..., 'status': ...} usem a mesma consulta compilada. Lança
+    ValueError para campos que não podem ser filtrados.
+    """
+    if not filtros:
+        return ()
+    invalidos = [campo for campo in filtros if campo not in CAMPOS_FILTRO]
+    if invalidos:
+        raise ValueError(f"Campo de filtro inválido: {invalidos[0]!r}. Use: {CAMPOS_FILTRO}")
+    return tuple(campo for campo in CAMPOS_FILTRO if campo in filtros)
+
+
+@lru_cache(maxsize=512)
+def compilar(filtros: tuple[str, ...] = (), campo_ordem: str | None = None, direcao: str | None = None,
+             trigramas: int = 0, pagina: bool = False, limitada: bool = False) -> str:
+    """
+    Compila o SELECT de uma forma de consulta.
+
+    Parâmetros:
+    -----------
+    filtros : tuple[str, ...]
+        Campos filtrados, na ordem de `campos_filtro`.
+    campo_ordem : str | None
+        Campo de ordenação. Com `pagina` ou `limitada`, o id entra como
+        desempate.
+    direcao : str | None
+        'ASC' ou 'DESC'. Sem direção a consulta não é ordenada.
+    trigramas : int
+        Quantos trigramas do índice de título conferir (0 = só o LIKE).
+    pagina : bool
+        Acrescenta o predicado de chave (keyset) da página seguinte.
+    limitada : bool
+        Termina com LIMIT %s.
+
+    Retorna:
+    --------
+    str
+        SQL com marcadores `%s`. Os parâmetros seguem esta ordem: para cada
+        filtro, os trigramas, o padrão LIKE e ESCAPE_LIKE (título) ou o valor da coluna;
+        depois valor, valor e id da chave de página (ou só o id, sem
+        ordenação); por último o limite.
+
+    Observações:
+    ------------
+    - Nomes de campos e direções nunca vêm do chamador sem passar pelas
+      listas permitidas, então não há como injetar SQL pela ordenação.
+    """
+    validar_ordenacao(campo_ordem, direcao)
+    condicoes = list(_condicoes(filtros, trigramas))
+    paginada = pagina or limitada
+    if pagina:
+        comparador = "<" if direcao == "DESC" else ">"
+        if campo_ordem:
+            condicoes.append(f"{campo_ordem} {comparador}= %s AND "
+                             f"({campo_ordem} {comparador} %s OR id {comparador} %s)")
+        else:
+            condicoes.append(f"id {comparador} %s")
+
+    sql = f"SELECT {ATRIBUTOS} FROM {TABELA}"
+    if condicoes:
+        sql += " WHERE " + " AND ".join(condicoes)
+    if paginada:
+        direcao = direcao or "ASC"
+        sql += f" ORDER BY {campo_ordem} {direcao}, id {direcao}" if campo_ordem else f" ORDER BY id {direcao}"
+    elif campo_ordem and direcao:
+        sql += f" ORDER BY {campo_ordem} {direcao}"
+    if limitada:
+        sql += " LIMIT %s"
+    return sql
+
+
+@lru_cache(maxsize=128)
+def compilar_contagem(filtros: tuple[str, ...] = (), trigramas: int = 0) -> str:
+    """
+    Compila a contagem das tarefas que atendem aos filtros, limitada a `LIMIT %s`.
+
+    Parâmetros: os dos filtros (como em `compilar`) e o limite da contagem.
+    """
+    condicoes = _condicoes(filtros, trigramas)
+    where = " WHERE " + " AND ".join(condicoes) if condicoes else ""
+    return f"SELECT COUNT(*) FROM (SELECT 1 FROM {TABELA}{where} LIMIT %s) AS alvo"
+
+
+def campos_agrupamento(campos) -> tuple[str, ...]:
+    """
+    Campos de agrupamento na ordem canônica de CAMPOS_AGRUPAMENTO.
+
+    Lança ValueError se não houver campos ou algum não puder ser agrupado.
+    """
+    invalidos = [campo for campo in campos if campo not in CAMPOS_AGRUPAMENTO]
+    if not campos or invalidos:
+        raise ValueError(f"Campo de agrupamento inválido. Use: {CAMPOS_AGRUPAMENTO}")
+    return tuple(campo for campo in CAMPOS_AGRUPAMENTO if campo in campos)
+
+
+@lru_cache(maxsize=64)
+def compilar_agrupamento(agrupamento: tuple[str, ...], filtros: tuple[str, ...] = (), trigramas: int = 0) -> str:
+    """
+    Compila a contagem de tarefas por combinação de valores de `agrupamento`.
+
+    Parâmetros: os dos filtros (como em `compilar`). As colunas do resultado
+    são os campos de `agrupamento` seguidos da contagem.
+    """
+    condicoes = _condicoes(filtros, trigramas)
+    where = " WHERE " + " AND ".join(condicoes) if condicoes else ""
+    colunas = ", ".join(campos_agrupamento(agrupamento))
+    return f"SELECT {colunas}, COUNT(*) FROM {TABELA}{where} GROUP BY {colunas}"
+
+
+CONTAGEM_POR_DIA = (f"SELECT DATE(data_criacao) AS dia, COUNT(*) FROM {TABELA} "
+                    "WHERE data_criacao >= %s AND data_criacao < %s GROUP BY DATE(data_criacao)")
+
+
+@lru_cache(maxsize=128)
+def compilar_ids(filtros: tuple[str, ...] = (), trigramas: int = 0, bloqueio: str = "") -> str:
+    """
+    Compila a leitura, por ordem de id, do próximo bloco de IDs que atendem aos filtros.
+
+    Parâmetros: os dos filtros (como em `compilar`), o último id do bloco
+    anterior e o tamanho do bloco. `bloqueio` é o sufixo de trava de linhas
+    do motor (ver `Motor.bloqueio_leitura`).
+    """
+    if bloqueio not in ("", " FOR UPDATE"):
+        raise ValueError(f"Bloqueio inválido: {bloqueio!r}")
+    condicoes = (*_condicoes(filtros, trigramas), "id > %s")
+    return f"SELECT id FROM {TABELA} WHERE {' AND '.join(condicoes)} ORDER BY id LIMIT %s{bloqueio}"
+
+
+def padrao_titulo(valor: str) -> str:
+    """
+    Padrão LIKE de `valor` em qualquer posição do título.
+
+    `%`, `_` e o próprio ESCAPE_LIKE são escapados: o valor é buscado ao pé
+    da letra, como no índice de trigramas, seja qual for o seu tamanho.
+    """
+    for especial in (ESCAPE_LIKE, "%", "_"):
+        valor = valor.replace(especial, ESCAPE_LIKE + especial)
+    return f"%{valor}%"
+
+
+def _condicoes(filtros: tuple[str, ...], trigramas: int) -> tuple[str, ...]:
+    """Condições SQL dos filtros, com os trigramas do índice de título antes do LIKE."""
+    if filtros != campos_filtro(dict.fromkeys(filtros)):
+        raise ValueError(f"Campos de filtro fora da ordem canônica: {filtros}")
+    condicoes = []
+    for campo in filtros:
+        if campo == "titulo":
+            if trigramas:
+                condicoes.append(indice_titulo.condicao_sql(trigramas))
+            condicoes.append("titulo LIKE %s ESCAPE %s")
+        else:
+            condicoes.append(f"{campo} = %s")
+    return tuple(condicoes)
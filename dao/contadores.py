@@ -0,0 +1,155 @@
+# dao/contadores.py
+"""
+Contadores de tarefas por (status, prioridade), mantidos a cada escrita.
+
+Mesmo um GROUP BY lê o índice inteiro da tabela tarefas. Aqui cada escrita
+do TarefaDAO soma ou subtrai, na mesma transação, a variação de cada par
+(status, nível de prioridade) na tabela `tarefas_contadores`. Ler os totais
+é somar algumas dezenas de linhas, qualquer que seja o tamanho de tarefas.
+
+Cada par é dividido em FATIAS linhas e cada transação soma numa fatia
+sorteada. Assim, no MySQL, escritas concorrentes do mesmo par raramente
+disputam a trava da mesma linha até o commit. Os totais são a soma das fatias.
+
+A tabela é criada e preenchida pelas migrações em db/schema.py.
+
+Uso:
+    python -m dao.contadores verificar     # compara com um GROUP BY em tarefas
+    python -m dao.contadores reconstruir   # recalcula os contadores do zero
+"""
+import argparse
+import random
+import sys
+from collections import Counter
+
+TABELA = "tarefas_contadores"
+
+# Linhas por par (status, prioridade)
+FATIAS = 8
+
+# Soma numa fatia, criando a linha se ela não existir, num único comando atômico
+_SOMAR = {
+    "mysql": f"INSERT INTO {TABELA} (status, prioridade, fatia, quantidade) VALUES (%s, %s, %s, %s) "
+             "ON DUPLICATE KEY UPDATE quantidade = quantidade + %s",
+    "sqlite": f"INSERT INTO {TABELA} (status, prioridade, fatia, quantidade) VALUES (%s, %s, %s, %s) "
+              "ON CONFLICT (status, prioridade, fatia) DO UPDATE SET quantidade = quantidade + excluded.quantidade",
+}
+_INSERIR = f"INSERT INTO {TABELA} (status, prioridade, fatia, quantidade) VALUES (%s, %s, %s, %s)"
+
+# Totais gravados e contagem real numa única consulta (um único snapshot)
+_COMPARAR = (f"SELECT 0, status, prioridade, SUM(quantidade) FROM {TABELA} GROUP BY status, prioridade "
+             "UNION ALL SELECT 1, status, prioridade, COUNT(*) FROM tarefas GROUP BY status, prioridade")
+
+
+def ajustar(cursor, motor_nome: str, entradas=(), saidas=()) -> None:
+    """
+    Soma 1 ao contador de cada chave de `entradas` e subtrai 1 de cada chave de `saidas`.
+
+    Parâmetros:
+    -----------
+    cursor :
+        Cursor da mesma transação que gravou as tarefas.
+    motor_nome : str
+        'mysql' ou 'sqlite' (`Motor.nome`), que escolhe a sintaxe do upsert.
+    entradas, saidas : Iterable[tuple[str, int]]
+        Chaves (status, nível de prioridade) das linhas que passaram a
+        existir e das que deixaram de existir (uma atualização é saída da
+        chave antiga e entrada da nova).
+
+    Observações:
+    ------------
+    - Os pares são atualizados em ordem, para que duas transações nunca
+      travem as mesmas linhas em ordens diferentes (deadlock).
+    - A migração cria as linhas de todos os pares válidos; um par sem linha
+      (status fora de Tarefa.STATUS_VALIDOS) é inserido pelo mesmo upsert,
+      então duas transações não podem inserir a mesma linha ao mesmo tempo.
+    """
+    somar = _SOMAR[motor_nome]
+    variacoes = Counter(entradas)
+    variacoes.subtract(saidas)
+    fatia = random.randrange(FATIAS)
+    for (status, prioridade), variacao in sorted(variacoes.items()):
+        if not variacao:
+            continue
+        parametros = (status, prioridade, fatia, variacao)
+        if motor_nome == "mysql":
+            parametros += (variacao,)  # o %s do ON DUPLICATE KEY UPDATE
+        cursor.execute(somar, parametros)
+
+
+def totais(cursor) -> dict[tuple[str, int], int]:
+    """Quantidade de tarefas por (status, nível de prioridade), lida dos contadores."""
+    cursor.execute(f"SELECT status, prioridade, SUM(quantidade) FROM {TABELA} GROUP BY status, prioridade")
+    return {(status, prioridade): int(quantidade) for status, prioridade, quantidade in cursor.fetchall()}
+
+
+def divergencias(cursor) -> dict[tuple[str, int], tuple[int, int]]:
+    """
+    Compara os contadores com a contagem real da tabela tarefas.
+
+    Retorna {(status, nível): (contado, real)} só com os pares que divergem.
+    """
+    cursor.execute(_COMPARAR)
+    comparacao = {}
+    for origem, status, prioridade, quantidade in cursor.fetchall():
+        par = comparacao.setdefault((status, prioridade), [0, 0])
+        par[origem] = int(quantidade)
+    return {chave: tuple(par) for chave, par in comparacao.items() if par[0] != par[1]}
+
+
+def reconstruir(cursor) -> int:
+    """
+    Recalcula os contadores a partir de um GROUP BY em tarefas.
+
+    Retorna o total de tarefas contadas. O commit fica com o chamador.
+
+    Observações:
+    ------------
+    - O DELETE vem antes da contagem: no MySQL ele trava todas as linhas de
+      contadores, então escritas concorrentes esperam o commit da
+      reconstrução e somam sobre os valores novos em vez de se perderem.
+    """
+    from models.tarefa import Tarefa
+
+    cursor.execute(f"DELETE FROM {TABELA}")
+    cursor.execute("SELECT status, prioridade, COUNT(*) FROM tarefas GROUP BY status, prioridade")
+    reais = {(status, prioridade): quantidade for status, prioridade, quantidade in cursor.fetchall()}
+    pares = set(reais) | {(status, nivel) for status in Tarefa.STATUS_VALIDOS for nivel in Tarefa.PRIORIDADE_POR_NIVEL}
+    cursor.executemany(_INSERIR, [(status, prioridade, fatia, reais.get((status, prioridade), 0) if fatia == 0 else 0)
+                                  for status, prioridade in sorted(pares) for fatia in range(FATIAS)])
+    return sum(reais.values())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m dao.contadores",
+                                     description="Confere ou reconstrói os contadores de tarefas.")
+    parser.add_argument("comando", choices=("verificar", "reconstruir"))
+    args = parser.parse_args(argv)
+
+    from dao.tarefa_dao import TarefaDAO
+    from models.tarefa import Tarefa
+
+    if args.comando == "reconstruir":
+        total = TarefaDAO.reconstruir_contadores()
+        if total is None:
+            print("⚠️ Erro ao reconstruir os contadores. Veja logs/erros.log.", file=sys.stderr)
+            return 1
+        print(f"Contadores reconstruídos: {total:,} tarefa(s).")
+        return 0
+
+    diferencas = TarefaDAO.verificar_contadores()
+    if diferencas is None:
+        print("⚠️ Erro ao verificar os contadores. Veja logs/erros.log.", file=sys.stderr)
+        return 1
+    for (status, nivel), (contado, real) in sorted(diferencas.items()):
+        prioridade = Tarefa.PRIORIDADE_POR_NIVEL.get(nivel, nivel)
+        print(f"[DIVERGE] {status}/{prioridade}: contador {contado:,}, real {real:,}")
+    if diferencas:
+        print(f"\n{len(diferencas)} par(es) divergente(s). Use: python -m dao.contadores reconstruir")
+        return 1
+    print("Contadores conferem com a tabela de tarefas.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+# dao/escrita_adiada.py
+"""
+Escrita adiada (write-behind) de tarefas para produtores de alta frequência.
+
+`EscritaAdiada.inserir/atualizar` só guardam a tarefa em memória; uma thread
+de fundo grava o acumulado com `inserir_lote` e `atualizar_lote` dentro de
+uma `TarefaDAO.transacao()` quando há LOTE_MAX escritas pendentes ou quando
+a mais antiga espera INTERVALO segundos.
+
+Uso:
+    escrita = EscritaAdiada()
+    escrita.iniciar()
+    tarefa = Tarefa("Processar pedido 42", "")
+    escrita.inserir(tarefa)
+    ...
+    tarefa.status = "Concluída"
+    escrita.atualizar(tarefa)
+    ...
+    escrita.descarregar()   # grava o que estiver pendente e espera
+    escrita.fechar()        # idem, encerra a thread e devolve o que não foi gravado
+"""
+import atexit
+import copy
+import os
+import threading
+import time
+from time import perf_counter
+
+from dao.tarefa_dao import TarefaDAO
+from utils import metricas
+from utils.logger import _log_erro
+from utils.metricas import Histograma
+
+#Limites de descarga: quantidade de escritas pendentes e idade da mais antiga
+LOTE_MAX = int(os.getenv("ESCRITA_LOTE_MAX", "500"))
+INTERVALO = float(os.getenv("ESCRITA_INTERVALO", "0.5"))
+#Pendentes a partir dos quais inserir/atualizar esperam a próxima descarga
+CAPACIDADE = int(os.getenv("ESCRITA_CAPACIDADE", "10000"))
+#Descargas com erro que uma escrita aguenta antes de ser descartada
+TENTATIVAS = int(os.getenv("ESCRITA_TENTATIVAS", "3"))
+
+
+class EscritaAdiada:
+    """
+    Fila de escritas de tarefas gravada em lotes por uma thread de fundo.
+
+    Parâmetros:
+    -----------
+    lote_max : int
+        Escritas pendentes que disparam uma descarga.
+    intervalo : float
+        Segundos que a escrita mais antiga espera antes de uma descarga.
+    capacidade : int
+        Escritas pendentes a partir das quais `inserir`/`atualizar` bloqueiam
+        até a descarga em andamento liberar espaço.
+    tentativas : int
+        Descargas com erro que uma escrita aguenta antes de ser descartada.
+    nome : str
+        Nome do medidor do tamanho da fila em `metricas.exportar_prometheus`
+        e do método das latências de descarga em `metricas.instantaneo`.
+
+    Observações:
+    ------------
+    - A tarefa é copiada ao entrar na fila: mudanças feitas depois no objeto
+      só são gravadas com uma nova chamada.
+    - Atualizações pendentes do mesmo ID são aglutinadas: grava-se só a
+      última. Uma tarefa ainda não inserida passada a `atualizar` substitui
+      a inserção pendente.
+    - Ordem por ID: as descargas são feitas uma de cada vez e, numa
+      descarga, as inserções vêm antes das atualizações. Uma escrita com
+      erro volta para a fila, a não ser que já exista outra mais nova para
+      a mesma tarefa, então uma gravação antiga nunca sobrescreve uma nova.
+    - Após a inserção, o ID gerado é atribuído à tarefa original.
+    - A fila fica em memória. O construtor registra `fechar` no atexit, com
+      ou sem a thread, então o término normal do programa grava o que estiver
+      pendente. Um processo morto por sinal ou `os._exit` perde a fila.
+    - `fechar` devolve as escritas que não conseguiu gravar; quem fecha
+      decide o que fazer com elas.
+    """
+
+    def __init__(self, lote_max: int = LOTE_MAX, intervalo: float = INTERVALO,
+                 capacidade: int = CAPACIDADE, tentativas: int = TENTATIVAS, nome: str = "escrita_adiada"):
+        if lote_max < 1:
+            raise ValueError("lote_max deve ser maior que zero")
+        if capacidade < lote_max:
+            raise ValueError("capacidade deve ser maior ou igual a lote_max")
+        self.lote_max = lote_max
+        self.intervalo = intervalo
+        self.capacidade = capacidade
+        self.tentativas = tentativas
+        self.nome = nome
+        self._condicao = threading.Condition()
+        self._descarga_lock = threading.Lock()
+        # id(tarefa original) -> [original, cópia, tentativas]; id da tarefa -> [cópia, tentativas]
+        self._insercoes: dict[int, list] = {}
+        self._atualizacoes: dict[int, list] = {}
+        self._em_gravacao: dict[int, list] = {}
+        self._primeira_em = None
+        self._thread = None
+        self._fechado = False
+        self._latencia = Histograma()
+        self._pico = 0
+        self._descargas = 0
+        self._gravadas = 0
+        self._aglutinadas = 0
+        self._falhas = 0
+        self._descartadas = 0
+        #Também sem iniciar(): quem só usa descarregar() não perde a fila ao sair
+        atexit.register(self.fechar)
+
+    def iniciar(self) -> None:
+        """Inicia a thread de descarga (uma vez só)."""
+        with self._condicao:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, name=self.nome, daemon=True)
+                self._thread.start()
+                metricas.registrar_medidor(f"{self.nome}_pendentes",
+                                           "Escritas de tarefas aguardando gravação.", self.pendentes)
+
+    def inserir(self, tarefa) -> None:
+        """Coloca a inserção da tarefa na fila. O ID é atribuído a `tarefa` depois da gravação."""
+        if tarefa.id is not None:
+            raise ValueError("A tarefa a inserir não pode ter ID; use atualizar")
+        self._enfileirar(id(tarefa), "_insercoes", [tarefa, copy.copy(tarefa), 0])
+
+    def atualizar(self, tarefa) -> None:
+        """Coloca a atualização da tarefa na fila, substituindo uma pendente do mesmo ID."""
+        if tarefa.id is None:
+            with self._condicao:
+                #Inserção sendo gravada: espera para saber o ID (ou a inserção voltar para a fila)
+                while id(tarefa) in self._em_gravacao:
+                    self._condicao.wait()
+                if id(tarefa) in self._insercoes:
+                    self._insercoes[id(tarefa)][1:] = [copy.copy(tarefa), 0]
+                    self._aglutinadas += 1
+                    return
+            if tarefa.id is None:
+                raise ValueError("A tarefa precisa de um ID válido para ser atualizada")
+        self._enfileirar(tarefa.id, "_atualizacoes", [copy.copy(tarefa), 0])
+
+    def pendentes(self) -> int:
+        """Escritas aguardando gravação."""
+        return len(self._insercoes) + len(self._atualizacoes)
+
+    def descarregar(self) -> bool:
+        """
+        Grava agora tudo o que está na fila, na thread de quem chamou.
+
+        Retorna False se alguma escrita falhou (e voltou para a fila ou foi
+        descartada).
+        """
+        return self._descarregar()
+
+    def fechar(self, timeout: float = 10.0) -> list:
+        """
+        Grava o que está na fila e encerra a thread. Depois disso, novas escritas dão erro.
+
+        Se depois de esperar a thread (até `timeout`) ainda houver escritas
+        pendentes, como as devolvidas por uma última descarga com erro, faz
+        mais uma descarga aqui mesmo. O que sobrar é registrado no log,
+        contado em 'descartadas' e devolvido.
+
+        Retorna:
+        --------
+        list[Tarefa]
+            Tarefas que não foram gravadas (cópias, como entraram na fila):
+            inserções primeiro, depois atualizações. Vazia se tudo foi
+            gravado ou se a fila já estava fechada.
+        """
+        with self._condicao:
+            if self._fechado:
+                return []
+            self._fechado = True
+            self._condicao.notify_all()
+        atexit.unregister(self.fechar)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            metricas.remover_medidor(f"{self.nome}_pendentes")
+        if self.pendentes():
+            self._descarregar()
+        with self._condicao:
+            restantes = [copia for _, copia, _ in self._insercoes.values()]
+            restantes += [tarefa for tarefa, _ in self._atualizacoes.values()]
+            self._descartadas += len(restantes)
+            self._insercoes, self._atualizacoes = {}, {}
+        if restantes:
+            _log_erro(f"{len(restantes)} escrita(s) adiada(s) descartada(s) ao fechar, sem gravar", None, self.nome)
+        return restantes
+
+    def estatisticas(self) -> dict:
+        """
+        Contadores da fila.
+
+        Formato: {'pendentes', 'pico', 'descargas', 'gravadas', 'aglutinadas',
+        'falhas', 'descartadas', 'latencia'}, com 'latencia' no formato de
+        `Histograma.resumo` (duração das descargas, em segundos).
+        """
+        with self._condicao:
+            return {
+                "pendentes": self.pendentes(),
+                "pico": self._pico,
+                "descargas": self._descargas,
+                "gravadas": self._gravadas,
+                "aglutinadas": self._aglutinadas,
+                "falhas": self._falhas,
+                "descartadas": self._descartadas,
+                "latencia": self._latencia.resumo(),
+            }
+
+    def _enfileirar(self, chave: int, fila: str, entrada: list) -> None:
+        while True:
+            with self._condicao:
+                #A descarga troca os dicionários: o destino só é lido com a trava
+                destino = getattr(self, fila)
+                if self._fechado:
+                    raise RuntimeError("A escrita adiada já foi fechada")
+                if chave in destino:
+                    destino[chave][-2:] = entrada[-2:]
+                    self._aglutinadas += 1
+                    return
+                pendentes = self.pendentes()
+                if pendentes < self.capacidade:
+                    destino[chave] = entrada
+                    self._pico = max(self._pico, pendentes + 1)
+                    if self._primeira_em is None:
+                        self._primeira_em = time.monotonic()
+                        self._condicao.notify_all()
+                    elif pendentes + 1 >= self.lote_max:
+                        self._condicao.notify_all()
+                    return
+                if self._thread is not None:
+                    self._condicao.notify_all()
+                    self._condicao.wait()
+                    continue
+            #Sem a thread, quem encheu a fila faz a descarga
+            self._descarregar()
+
+    def _executar(self) -> None:
+        while True:
+            with self._condicao:
+                while not self._fechado:
+                    if self._primeira_em is None:
+                        self._condicao.wait()
+                        continue
+                    espera = self._primeira_em + self.intervalo - time.monotonic()
+                    if espera <= 0 or self.pendentes() >= self.lote_max:
+                        break
+                    self._condicao.wait(espera)
+                fechado = self._fechado
+            self._descarregar()
+            if fechado:
+                return
+
+    def _descarregar(self) -> bool:
+        with self._descarga_lock:
+            with self._condicao:
+                insercoes, self._insercoes = self._insercoes, {}
+                atualizacoes, self._atualizacoes = self._atualizacoes, {}
+                self._em_gravacao = insercoes
+                self._primeira_em = None
+                self._condicao.notify_all()
+            if not insercoes and not atualizacoes:
+                return True
+
+            inicio = perf_counter()
+            falhas_insercao, falhas_atualizacao, ids = self._gravar(list(insercoes.values()),
+                                                                    list(atualizacoes.values()))
+            duracao = perf_counter() - inicio
+            for (original, _, _), novo_id in zip(insercoes.values(), ids):
+                if novo_id is not None:
+                    original.id = novo_id
+
+            with self._condicao:
+                self._descargas += 1
+                self._latencia.observar(duracao)
+                falhas = len(falhas_insercao) + len(falhas_atualizacao)
+                self._gravadas += len(insercoes) + len(atualizacoes) - falhas
+                self._falhas += falhas
+                self._devolver(falhas_insercao, self._insercoes, lambda entrada: id(entrada[0]))
+                self._devolver(falhas_atualizacao, self._atualizacoes, lambda entrada: entrada[0].id)
+                self._em_gravacao = {}
+                self._condicao.notify_all()
+            if metricas.ativo():
+                metricas.observar(self.nome, "descarga", duracao)
+            return not falhas
+
+    def _gravar(self, insercoes: list, atualizacoes: list) -> tuple[list, list, list]:
+        """Grava uma descarga numa transação. Retorna as entradas com erro e os IDs inseridos."""
+        try:
+            with TarefaDAO.transacao():
+                ids, falhas_insercao = [], []
+                if insercoes:
+                    ids, _ = TarefaDAO.inserir_lote((copia for _, copia, _ in insercoes), self.lote_max)
+                    falhas_insercao = [entrada for entrada, novo_id in zip(insercoes, ids) if novo_id is None]
+                falhas_atualizacao = []
+                if atualizacoes:
+                    _, erros = TarefaDAO.atualizar_lote((tarefa for tarefa, _ in atualizacoes), self.lote_max)
+                    for erro in erros:
+                        fim = erro["inicio"] + (erro["quantidade"] or len(atualizacoes))
+                        falhas_atualizacao.extend(atualizacoes[erro["inicio"]:fim])
+            return falhas_insercao, falhas_atualizacao, ids
+        except Exception as e:
+            _log_erro(f"Erro ao gravar {len(insercoes) + len(atualizacoes)} escrita(s) adiada(s)", e, self.nome)
+            return insercoes, atualizacoes, []
+
+    def _devolver(self, falhas: list, destino: dict, chave) -> None:
+        """Devolve à frente da fila as escritas com erro que não têm outra mais nova pendente."""
+        devolvidas = {}
+        for entrada in falhas:
+            entrada[-1] += 1
+            if chave(entrada) in destino:
+                continue
+            if entrada[-1] >= self.tentativas:
+                self._descartadas += 1
+                _log_erro(f"Escrita adiada descartada após {entrada[-1]} tentativa(s)", None, self.nome)
+                continue
+            devolvidas[chave(entrada)] = entrada
+        if devolvidas:
+            novo = {**devolvidas, **destino}
+            destino.clear()
+            destino.update(novo)
+            if self._primeira_em is None:
+                self._primeira_em = time.monotonic()
+            self._condicao.notify_all()
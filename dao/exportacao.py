@@ -0,0 +1,167 @@
+# dao/exportacao.py
+"""
+Exportação de tarefas para CSV ou JSONL, em fluxo.
+
+As linhas saem do banco em lotes (`fetchmany`) por um cursor sem buffer e
+são gravadas no arquivo lote a lote, sem virar objetos Tarefa: a memória
+usada é a de um lote, qualquer que seja o tamanho da tabela. O trabalho de
+banco fica em `TarefaDAO.exportar`; aqui estão os formatos e o comando.
+
+Uso:
+    python -m dao.exportacao tarefas.csv
+    python -m dao.exportacao tarefas.jsonl.gz --status Pendente --ordem data_criacao --direcao DESC
+    python -m dao.exportacao - --formato jsonl --titulo relatorio > tarefas.jsonl
+
+O formato sai da extensão (.csv, .jsonl, com ou sem .gz) ou de --formato;
+arquivos terminados em .gz são compactados com gzip.
+"""
+import argparse
+import csv
+import gzip
+import json
+import sys
+from contextlib import contextmanager
+from time import perf_counter
+
+from models.tarefa import Tarefa
+
+# Nível do gzip: o 9 (padrão do módulo gzip) custa bem mais CPU para ganhar pouco
+NIVEL_GZIP = 6
+COLUNAS = ("id", "titulo", "descricao", "prioridade", "status", "data_criacao")
+FORMATOS = ("csv", "jsonl")
+
+
+def _valores(linha: tuple) -> tuple:
+    """Linha do banco (ordem de TarefaDAO.atributos) com prioridade por nome e data em ISO 8601."""
+    tarefa_id, titulo, descricao, nivel, status, data_criacao = linha
+    return (tarefa_id, titulo, descricao, Tarefa.PRIORIDADE_POR_NIVEL[nivel], status,
+            data_criacao.isoformat(" ") if data_criacao else None)
+
+
+class _EscritorCSV:
+    def __init__(self, arquivo):
+        self._csv = csv.writer(arquivo)
+        self._csv.writerow(COLUNAS)
+
+    def escrever(self, linhas: list[tuple]) -> None:
+        self._csv.writerows(map(_valores, linhas))
+
+
+class _EscritorJSONL:
+    def __init__(self, arquivo):
+        self._arquivo = arquivo
+
+    def escrever(self, linhas: list[tuple]) -> None:
+        self._arquivo.write("".join(json.dumps(dict(zip(COLUNAS, _valores(linha))), ensure_ascii=False) + "\n"
+                                    for linha in linhas))
+
+
+_ESCRITORES = {"csv": _EscritorCSV, "jsonl": _EscritorJSONL}
+
+
+def criar_escritor(arquivo, formato: str):
+    """
+    Retorna o escritor do formato sobre um arquivo de texto já aberto.
+
+    O escritor tem um método `escrever(linhas)`, que recebe as tuplas vindas
+    do banco. No CSV, o cabeçalho é gravado aqui. Lança ValueError para
+    formato desconhecido.
+    """
+    if formato not in _ESCRITORES:
+        raise ValueError(f"Formato de exportação inválido. Use: {FORMATOS}")
+    return _ESCRITORES[formato](arquivo)
+
+
+def formato_do_caminho(caminho: str) -> str:
+    """'jsonl' para caminhos .jsonl/.jsonl.gz, 'csv' para o resto."""
+    return "jsonl" if caminho.removesuffix(".gz").endswith(".jsonl") else "csv"
+
+
+@contextmanager
+def abrir_destino(caminho: str, compactar: bool | None = None):
+    """
+    Abre o arquivo de destino para texto em UTF-8 ('-' é a saída padrão).
+
+    `compactar` None compacta com gzip quando o caminho termina em .gz.
+    """
+    if caminho == "-":
+        yield sys.stdout
+        return
+    if compactar is None:
+        compactar = caminho.endswith(".gz")
+    if compactar:
+        arquivo = gzip.open(caminho, "wt", compresslevel=NIVEL_GZIP, encoding="utf-8", newline="")
+    else:
+        arquivo = open(caminho, "w", encoding="utf-8", newline="")
+    with arquivo:
+        yield arquivo
+
+
+def exportar_arquivo(caminho: str, formato: str | None = None, filtros: dict | None = None,
+                     campo_ordem: str = None, direcao: str = None, compactar: bool | None = None,
+                     tamanho_lote: int = 1000) -> tuple[int | None, float]:
+    """
+    Exporta as tarefas para um arquivo.
+
+    Parâmetros:
+    -----------
+    caminho : str
+        Arquivo de destino ('-' para a saída padrão).
+    formato : str | None
+        'csv' ou 'jsonl' (padrão: pela extensão do caminho).
+    filtros, campo_ordem, direcao
+        Mesmo formato de `TarefaDAO.filtrar_tarefas`.
+    compactar : bool | None
+        Grava com gzip (padrão: quando o caminho termina em .gz).
+    tamanho_lote : int
+        Linhas lidas do banco e gravadas por vez.
+
+    Retorna:
+    --------
+    tuple[int | None, float]
+        Linhas exportadas (None em caso de erro no banco; o arquivo fica
+        incompleto) e a duração em segundos.
+    """
+    from dao.tarefa_dao import TarefaDAO
+
+    formato = formato or formato_do_caminho(caminho)
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação inválido. Use: {FORMATOS}")
+    inicio = perf_counter()
+    with abrir_destino(caminho, compactar) as arquivo:
+        linhas = TarefaDAO.exportar(arquivo, formato, filtros, campo_ordem, direcao, tamanho_lote)
+    return linhas, perf_counter() - inicio
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m dao.exportacao", description="Exporta tarefas em CSV ou JSONL.")
+    parser.add_argument("caminho", help="arquivo de destino (.csv, .jsonl, com .gz para gzip; '-' para a saída padrão)")
+    parser.add_argument("--formato", choices=FORMATOS, help="padrão: pela extensão do arquivo")
+    parser.add_argument("--gzip", action="store_true", default=None, help="compacta mesmo sem a extensão .gz")
+    parser.add_argument("--titulo", help="filtra pelo título (busca parcial)")
+    parser.add_argument("--prioridade", help="filtra pela prioridade")
+    parser.add_argument("--status", help="filtra pelo status")
+    parser.add_argument("--ordem", dest="campo_ordem", help="campo de ordenação")
+    parser.add_argument("--direcao", help="ASC ou DESC")
+    parser.add_argument("--lote", type=int, default=1000, help="linhas por lote (padrão: 1000)")
+    args = parser.parse_args(argv)
+
+    if args.lote < 1:
+        parser.error("--lote deve ser maior que zero")
+    filtros = {campo: valor for campo in ("titulo", "prioridade", "status")
+               if (valor := getattr(args, campo)) is not None}
+    try:
+        linhas, segundos = exportar_arquivo(args.caminho, args.formato, filtros, args.campo_ordem,
+                                            args.direcao, args.gzip, args.lote)
+    except ValueError as e:
+        parser.error(str(e))
+    if linhas is None:
+        print("⚠️ Erro ao exportar as tarefas; o arquivo ficou incompleto. Veja logs/erros.log.", file=sys.stderr)
+        return 1
+    taxa = linhas / segundos if segundos else 0.0
+    print(f"{linhas:,} tarefa(s) exportada(s) em {segundos:.2f} s ({taxa:,.0f} linhas/s).", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
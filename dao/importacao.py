@@ -0,0 +1,383 @@
+# dao/importacao.py
+"""
+Importação paralela de tarefas a partir de arquivos CSV ou JSONL.
+
+O arquivo é lido em blocos de `tamanho_lote` registros. Cada bloco é
+convertido e validado em Tarefa num pool de processos e gravado por
+`TarefaDAO.inserir_lote` (INSERTs de várias linhas, um commit por bloco) em
+várias conexões ao mesmo tempo. Os blocos em andamento são limitados, então
+a memória não cresce com o arquivo.
+
+- Registros inválidos vão para o arquivo de rejeitadas (JSONL, com a linha,
+  o erro e o registro original), sem interromper a importação.
+- Blocos gravados ficam anotados num arquivo de progresso; rodar o mesmo
+  comando depois de uma queda pula esses blocos. O progresso é anotado logo
+  após o commit, então uma queda entre os dois pode repetir um bloco; com
+  --chave, a repetição é descartada como duplicada.
+- Com --chave, tarefas cuja chave natural (ex.: titulo,data_criacao) já
+  apareceu no arquivo ou já existe no banco são descartadas como duplicadas.
+
+Uso:
+    python -m dao.importacao tarefas.csv.gz
+    python -m dao.importacao tarefas.jsonl --processos 4 --conexoes 4 --chave titulo,data_criacao
+
+O formato sai da extensão (.csv, .jsonl, com ou sem .gz) ou de --formato. O
+CSV segue o formato da exportação (dao/exportacao.py); a coluna id é ignorada.
+"""
+import argparse
+import csv
+import gzip
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from time import perf_counter
+
+from dao.exportacao import FORMATOS, formato_do_caminho
+from models.tarefa import Tarefa
+
+SUFIXO_PROGRESSO = ".progresso.json"
+SUFIXO_REJEITADAS = ".rejeitadas.jsonl"
+# Linhas por INSERT: um bloco grande vira vários comandos, para não estourar
+# max_allowed_packet (MySQL) nem o limite de parâmetros do SQLite
+LINHAS_POR_INSERT = 1000
+
+
+class _BlocoComErro(Exception):
+    """Lote de `inserir_lote` com erro: desfaz a transação do bloco inteiro."""
+
+
+def _abrir(caminho: str):
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, "rt", encoding="utf-8", newline="")
+    return open(caminho, encoding="utf-8", newline="")
+
+
+def _registros(arquivo, formato: str):
+    """Gera (número da linha, registro bruto) do arquivo: dict no CSV, texto no JSONL."""
+    if formato == "csv":
+        leitor = csv.DictReader(arquivo)
+        for registro in leitor:
+            yield leitor.line_num, registro
+    else:
+        for numero, linha in enumerate(arquivo, start=1):
+            if linha.strip():
+                yield numero, linha
+
+
+def _converter(registro: dict) -> Tarefa:
+    titulo = (registro.get("titulo") or "").strip()
+    if not titulo:
+        raise ValueError("Título obrigatório")
+    data_criacao = registro.get("data_criacao") or None
+    if data_criacao is not None:
+        data_criacao = datetime.fromisoformat(data_criacao)
+    return Tarefa(
+        titulo=titulo,
+        descricao=registro.get("descricao") or "",
+        prioridade=registro.get("prioridade") or "Media",
+        status=registro.get("status") or "Pendente",
+        data_criacao=data_criacao,
+    )
+
+
+def validar_bloco(formato: str, registros: list[tuple]) -> tuple[list[tuple[int, Tarefa]], list[dict]]:
+    """
+    Converte um bloco de registros brutos em Tarefa. Roda nos processos do pool.
+
+    Retorna as tarefas válidas, como (linha, Tarefa) na ordem do arquivo, e as
+    rejeitadas, cada uma como {'linha', 'erro', 'registro'}.
+    """
+    tarefas = []
+    rejeitadas = []
+    for linha, registro in registros:
+        try:
+            if formato == "jsonl":
+                registro = json.loads(registro)
+                if not isinstance(registro, dict):
+                    raise ValueError("A linha deve ser um objeto JSON")
+            tarefas.append((linha, _converter(registro)))
+        except (ValueError, TypeError, AttributeError) as e:
+            rejeitadas.append({"linha": linha, "erro": str(e), "registro": registro})
+    return tarefas, rejeitadas
+
+
+class _Progresso:
+    """
+    Blocos já gravados de um arquivo, persistidos em JSON a cada bloco.
+
+    Guarda o tamanho e a data de modificação do arquivo e o tamanho do bloco:
+    se algum mudou, o progresso não vale mais para a retomada.
+    """
+
+    def __init__(self, caminho: str, origem: str, tamanho_lote: int):
+        self.caminho = caminho
+        estado = os.stat(origem)
+        self.identidade = {"arquivo": os.path.abspath(origem), "bytes": estado.st_size,
+                           "modificado": estado.st_mtime, "tamanho_lote": tamanho_lote}
+        self.concluidos: set[int] = set()
+
+    def carregar(self) -> bool:
+        """Lê o progresso salvo. Retorna False se não houver; ValueError se for de outro arquivo."""
+        if not os.path.exists(self.caminho):
+            return False
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            salvo = json.load(arquivo)
+        if {chave: salvo.get(chave) for chave in self.identidade} != self.identidade:
+            raise ValueError(f"O progresso em {self.caminho} é de outra versão do arquivo ou de outro "
+                             "tamanho de lote. Use reiniciar=True (--reiniciar) para importar do zero.")
+        self.concluidos = set(range(salvo["ate"])) | set(salvo["concluidos"])
+        return True
+
+    def concluir(self, bloco: int) -> None:
+        self.concluidos.add(bloco)
+        ate = 0
+        while ate in self.concluidos:
+            ate += 1
+        estado = {**self.identidade, "ate": ate, "concluidos": sorted(b for b in self.concluidos if b >= ate)}
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(estado, arquivo)
+        os.replace(temporario, self.caminho)
+
+    def remover(self) -> None:
+        if os.path.exists(self.caminho):
+            os.remove(self.caminho)
+
+
+def importar_arquivo(caminho: str, formato: str | None = None, tamanho_lote: int = 5000,
+                     processos: int | None = None, conexoes: int = 4, chave: tuple[str, ...] | None = None,
+                     rejeitadas: str | None = None, reiniciar: bool = False,
+                     intervalo_progresso: float = 2.0, saida=sys.stderr) -> dict:
+    """
+    Importa um arquivo CSV ou JSONL de tarefas.
+
+    Parâmetros:
+    -----------
+    caminho : str
+        Arquivo de origem (.gz é lido com gzip).
+    formato : str | None
+        'csv' ou 'jsonl' (padrão: pela extensão).
+    tamanho_lote : int
+        Registros por bloco, que é também a unidade de commit e de retomada.
+        Cada INSERT leva no máximo LINHAS_POR_INSERT linhas do bloco.
+    processos : int | None
+        Processos que validam os blocos (padrão: os.cpu_count()).
+    conexoes : int
+        Blocos gravados ao mesmo tempo, cada um na sua conexão. No MySQL,
+        mantenha abaixo de DB_POOL_SIZE; no SQLite, que tem um escritor por
+        vez, é sempre 1.
+    chave : tuple[str, ...] | None
+        Campos da chave natural para deduplicação (ver
+        `TarefaDAO.chaves_existentes`). None importa tudo.
+    rejeitadas : str | None
+        Arquivo JSONL das linhas rejeitadas (padrão: caminho + '.rejeitadas.jsonl').
+    reiniciar : bool
+        Ignora o progresso salvo e importa do começo.
+    intervalo_progresso : float
+        Segundos entre as linhas de progresso.
+    saida : arquivo de texto | None
+        Destino das linhas de progresso (padrão: stderr; None não mostra).
+
+    Retorna:
+    --------
+    dict
+        lidas, inseridas, rejeitadas, duplicadas, blocos, blocos_pulados,
+        blocos_com_erro (números dos blocos não gravados), conexoes (as
+        usadas), segundos e linhas_s.
+
+    Observações:
+    ------------
+    - Blocos com erro de banco não são anotados no progresso: rodar de novo
+      tenta só eles (e os que não chegaram a ser gravados).
+    - O arquivo de progresso é apagado quando todos os blocos foram gravados.
+    """
+    from dao import consultas
+    from dao.tarefa_dao import TarefaDAO
+    from db.motores import obter_motor
+    from utils.logger import _log_erro
+
+    formato = formato or formato_do_caminho(caminho)
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de importação inválido. Use: {FORMATOS}")
+    if tamanho_lote < 1 or conexoes < 1 or (processos is not None and processos < 1):
+        raise ValueError("tamanho_lote, processos e conexoes devem ser maiores que zero")
+    if chave:
+        chave = tuple(chave)
+        if any(campo not in consultas.CAMPOS_CHAVE for campo in chave):
+            raise ValueError(f"Chave inválida. Use campos de: {consultas.CAMPOS_CHAVE}")
+        if not any(campo in consultas.CAMPOS_CHAVE_INDEXADOS for campo in chave):
+            raise ValueError(f"A chave precisa incluir um destes campos: {consultas.CAMPOS_CHAVE_INDEXADOS}")
+    processos = processos or os.cpu_count() or 1
+    if obter_motor().nome == "sqlite" and conexoes > 1:
+        # O SQLite aceita um escritor por vez: conexões extras só esperariam
+        # a trava (e estourariam o busy_timeout com blocos grandes)
+        conexoes = 1
+
+    progresso = _Progresso(caminho + SUFIXO_PROGRESSO, caminho, tamanho_lote)
+    if reiniciar:
+        progresso.remover()
+    retomada = progresso.carregar()
+
+    lock = threading.Lock()
+    totais = {"lidas": 0, "inseridas": 0, "rejeitadas": 0, "duplicadas": 0,
+              "blocos": 0, "blocos_pulados": 0, "blocos_com_erro": []}
+    vistas = set()
+    inicio = perf_counter()
+    proximo_aviso = inicio + intervalo_progresso
+
+    def avisar(final: bool = False) -> None:
+        nonlocal proximo_aviso
+        agora = perf_counter()
+        if saida is None or (not final and agora < proximo_aviso):
+            return
+        proximo_aviso = agora + intervalo_progresso
+        taxa = totais["inseridas"] / (agora - inicio) if agora > inicio else 0.0
+        print(f"  lidas {totais['lidas']:,}  inseridas {totais['inseridas']:,}  rejeitadas {totais['rejeitadas']:,}"
+              f"  duplicadas {totais['duplicadas']:,}  ({taxa:,.0f} linhas/s)", file=saida)
+
+    def falhou(bloco: int) -> None:
+        with lock:
+            totais["blocos_com_erro"].append(bloco)
+
+    def gravar(bloco: int, tarefas: list[tuple[int, Tarefa]], descartadas: list[dict]) -> None:
+        # Roda numa thread de escrita: cada chamada ao DAO usa uma conexão própria
+        if tarefas and chave:
+            existentes = TarefaDAO.chaves_existentes(chave, [TarefaDAO.chave(t, chave) for _, t in tarefas])
+            if existentes is None:
+                falhou(bloco)
+                return
+            if existentes:
+                restantes = []
+                for linha, tarefa in tarefas:
+                    if TarefaDAO.chave(tarefa, chave) in existentes:
+                        descartadas.append(_duplicada(linha, tarefa, "já existe no banco"))
+                    else:
+                        restantes.append((linha, tarefa))
+                tarefas = restantes
+        if tarefas:
+            try:
+                # Uma transação por bloco: os INSERTs entram juntos ou nenhum entra
+                with TarefaDAO.transacao():
+                    _, erros = TarefaDAO.inserir_lote([tarefa for _, tarefa in tarefas],
+                                                      chunk_size=min(len(tarefas), LINHAS_POR_INSERT))
+                    if erros:
+                        raise _BlocoComErro()
+            except _BlocoComErro:
+                falhou(bloco)
+                return
+            except obter_motor().Erro as e:
+                _log_erro(f"Erro no banco de dados ao gravar o bloco {bloco}", e, "importar_arquivo")
+                falhou(bloco)
+                return
+        with lock:
+            # Rejeitadas e progresso só são gravados com o bloco já no banco,
+            # para a retomada não repetir nem perder linhas rejeitadas
+            for item in descartadas:
+                arquivo_rejeitadas.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+            arquivo_rejeitadas.flush()
+            progresso.concluir(bloco)
+            duplicadas = sum(item["erro"].startswith("Duplicada") for item in descartadas)
+            totais["inseridas"] += len(tarefas)
+            totais["rejeitadas"] += len(descartadas) - duplicadas
+            totais["duplicadas"] += duplicadas
+            avisar()
+
+    def separar_duplicadas(tarefas: list[tuple[int, Tarefa]], descartadas: list[dict]) -> list[tuple[int, Tarefa]]:
+        # Roda na thread principal, na ordem do arquivo: a primeira ocorrência fica
+        if not chave:
+            return tarefas
+        unicas = []
+        for linha, tarefa in tarefas:
+            valor = TarefaDAO.chave(tarefa, chave)
+            if valor in vistas:
+                descartadas.append(_duplicada(linha, tarefa, "repetida no arquivo"))
+            else:
+                vistas.add(valor)
+                unicas.append((linha, tarefa))
+        return unicas
+
+    caminho_rejeitadas = rejeitadas or caminho + SUFIXO_REJEITADAS
+    contexto = multiprocessing.get_context("spawn")
+    with (_abrir(caminho) as arquivo, open(caminho_rejeitadas, "a" if retomada else "w", encoding="utf-8")
+          as arquivo_rejeitadas,
+          ProcessPoolExecutor(processos, mp_context=contexto) as validacao,
+          ThreadPoolExecutor(conexoes, thread_name_prefix="importacao") as escrita):
+        validando = deque()
+        gravando = deque()
+
+        def encaminhar(bloco: int, futuro) -> None:
+            tarefas, descartadas = futuro.result()
+            tarefas = separar_duplicadas(tarefas, descartadas)
+            gravando.append(escrita.submit(gravar, bloco, tarefas, descartadas))
+            while len(gravando) > 2 * conexoes:
+                gravando.popleft().result()
+
+        registros = _registros(arquivo, formato)
+        for bloco, lote in enumerate(iter(lambda: list(islice(registros, tamanho_lote)), [])):
+            totais["blocos"] += 1
+            with lock:
+                totais["lidas"] += len(lote)
+            if bloco in progresso.concluidos:
+                totais["blocos_pulados"] += 1
+                continue
+            validando.append((bloco, validacao.submit(validar_bloco, formato, lote)))
+            while len(validando) > 2 * processos:
+                encaminhar(*validando.popleft())
+        while validando:
+            encaminhar(*validando.popleft())
+        for futuro in gravando:
+            futuro.result()
+
+    segundos = perf_counter() - inicio
+    avisar(final=True)
+    if not totais["blocos_com_erro"]:
+        progresso.remover()
+    totais["blocos_com_erro"].sort()
+    return {**totais, "conexoes": conexoes, "segundos": segundos, "linhas_s": totais["inseridas"] / segundos if segundos else 0.0}
+
+
+def _duplicada(linha: int, tarefa: Tarefa, motivo: str) -> dict:
+    registro = {"titulo": tarefa.titulo, "descricao": tarefa.descricao, "prioridade": tarefa.prioridade,
+                "status": tarefa.status, "data_criacao": tarefa.data_criacao.isoformat(" ")}
+    return {"linha": linha, "erro": f"Duplicada (chave {motivo})", "registro": registro}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m dao.importacao", description="Importa tarefas de CSV ou JSONL.")
+    parser.add_argument("caminho", help="arquivo de origem (.csv, .jsonl, com .gz para gzip)")
+    parser.add_argument("--formato", choices=FORMATOS, help="padrão: pela extensão do arquivo")
+    parser.add_argument("--lote", type=int, default=5000, help="registros por bloco/commit (padrão: 5000)")
+    parser.add_argument("--processos", type=int, help="processos de validação (padrão: número de CPUs)")
+    parser.add_argument("--conexoes", type=int, default=4, help="blocos gravados em paralelo (padrão: 4)")
+    parser.add_argument("--chave", help="campos da chave natural para deduplicar, ex.: titulo,data_criacao")
+    parser.add_argument("--rejeitadas", help="arquivo das linhas rejeitadas (padrão: <arquivo>.rejeitadas.jsonl)")
+    parser.add_argument("--reiniciar", action="store_true", help="ignora o progresso salvo e importa do zero")
+    args = parser.parse_args(argv)
+
+    chave = tuple(campo.strip() for campo in args.chave.split(",")) if args.chave else None
+    try:
+        resultado = importar_arquivo(args.caminho, args.formato, args.lote, args.processos, args.conexoes,
+                                     chave, args.rejeitadas, args.reiniciar)
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+
+    print(f"{resultado['inseridas']:,} tarefa(s) importada(s) em {resultado['segundos']:.2f} s "
+          f"({resultado['linhas_s']:,.0f} linhas/s); {resultado['rejeitadas']:,} rejeitada(s), "
+          f"{resultado['duplicadas']:,} duplicada(s).", file=sys.stderr)
+    if resultado["blocos_pulados"]:
+        print(f"Retomada: {resultado['blocos_pulados']} bloco(s) já importado(s) foram pulados.", file=sys.stderr)
+    if resultado["blocos_com_erro"]:
+        print(f"⚠️ {len(resultado['blocos_com_erro'])} bloco(s) não gravado(s) por erro no banco (veja "
+              "logs/erros.log). Rode o mesmo comando de novo para tentar só eles.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# dao/indice_titulo.py
+"""
+Índice invertido de trigramas para busca de substring no título das tarefas.
+
+`titulo LIKE '%valor%'` não pode usar índice B-tree e varre a tabela toda.
+Aqui cada título é quebrado em trigramas (sequências de 3 caracteres,
+normalizados sem acento e em minúsculas) gravados em `tarefas_trigramas`.
+Uma busca por substring primeiro seleciona as tarefas que contêm os
+trigramas mais raros do valor buscado (consulta indexada) e só essas
+candidatas passam pelo LIKE.
+
+A tabela é criada pelas migrações em db/schema.py.
+"""
+import unicodedata
+
+TABELA = "tarefas_trigramas"
+
+# Valores buscados com menos caracteres que isso não geram trigramas e
+# continuam usando apenas o LIKE.
+TAMANHO_MINIMO = 3
+
+# Limite de ocorrências contadas por trigrama ao escolher o mais raro
+AMOSTRA = 1000
+
+# Quantos trigramas, além do mais raro, são conferidos no próprio índice
+MAX_FILTROS = 2
+
+# Se até o trigrama mais raro aparece em mais que essa fração das tarefas,
+# a varredura com LIKE sai mais barata que o índice.
+SELETIVIDADE_MAXIMA = 0.05
+
+
+def normalizar(texto: str) -> str:
+    """Remove acentos e converte para minúsculas, como a collation do MySQL compara."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).lower()
+
+
+def trigramas(texto: str | None) -> set[str]:
+    """Retorna o conjunto de trigramas do texto normalizado."""
+    if not texto:
+        return set()
+    normalizado = normalizar(texto)
+    return {normalizado[i:i + 3] for i in range(len(normalizado) - 2)}
+
+
+def indexar(cursor, tarefas) -> None:
+    """
+    Grava os trigramas dos títulos informados.
+
+    Parâmetros:
+    -----------
+    cursor :
+        Cursor da mesma transação que gravou as tarefas.
+    tarefas : Iterable[tuple[int, str]]
+        Pares (id, titulo).
+    """
+    linhas = [(trigrama, tarefa_id) for tarefa_id, titulo in tarefas for trigrama in trigramas(titulo)]
+    if linhas:
+        cursor.executemany(f"INSERT INTO {TABELA} (trigrama, tarefa_id) VALUES (%s, %s)", linhas)
+
+
+def remover(cursor, ids) -> None:
+    """Remove os trigramas das tarefas informadas."""
+    ids = list(ids)
+    if ids:
+        marcadores = ", ".join(["%s"] * len(ids))
+        cursor.execute(f"DELETE FROM {TABELA} WHERE tarefa_id IN ({marcadores})", ids)
+
+
+def selecionar(cursor, valor: str) -> list[str] | None:
+    """
+    Escolhe os trigramas de `valor` a conferir no índice.
+
+    Parâmetros:
+    -----------
+    cursor :
+        Cursor usado para estimar a frequência de cada trigrama.
+    valor : str
+        Trecho de título buscado.
+
+    Retorna:
+    --------
+    list[str] | None
+        Trigramas a conferir, do mais raro para o mais comum (ver
+        `condicao_sql`). Retorna lista vazia se algum trigrama não aparece
+        em nenhuma tarefa (a busca não tem resultado), ou None quando o
+        índice não compensa (valor curto demais ou comum demais) e só o
+        LIKE deve ser usado.
+
+    Observações:
+    ------------
+    - Conta (até AMOSTRA) as ocorrências de cada trigrama numa única
+      consulta e parte do mais raro, conferindo os MAX_FILTROS seguintes com
+      EXISTS. Assim o custo é proporcional à menor lista de ocorrências, e
+      não à soma de todas. O LIKE continua conferindo o resultado final.
+    - Se todos os trigramas atingem a AMOSTRA, eles são contados de novo
+      até SELETIVIDADE_MAXIMA da tabela para decidir entre índice e
+      varredura.
+    """
+    if len(normalizar(valor)) < TAMANHO_MINIMO:
+        return None
+    grupos = sorted(trigramas(valor))
+
+    frequencias, total_tarefas = _contar(cursor, grupos, AMOSTRA)
+    if 0 in frequencias.values():
+        return []
+
+    if min(frequencias.values()) >= AMOSTRA:
+        # Todos comuns na primeira amostra: recontar com um limite maior
+        limite = int(total_tarefas * SELETIVIDADE_MAXIMA)
+        if limite <= AMOSTRA:
+            return None
+        frequencias, _ = _contar(cursor, grupos, limite)
+        if min(frequencias.values()) >= limite:
+            return None
+
+    return sorted(grupos, key=frequencias.get)[:1 + MAX_FILTROS]
+
+
+def condicao_sql(quantidade: int) -> str:
+    """
+    SQL que restringe `id` às tarefas com `quantidade` trigramas, um marcador `%s` por trigrama.
+
+    A busca parte do primeiro trigrama (o mais raro) e confere os demais com EXISTS.
+    """
+    sql = f"id IN (SELECT t0.tarefa_id FROM {TABELA} t0 WHERE t0.trigrama = %s"
+    for i in range(1, quantidade):
+        sql += (f" AND EXISTS (SELECT 1 FROM {TABELA} t{i}"
+                f" WHERE t{i}.trigrama = %s AND t{i}.tarefa_id = t0.tarefa_id)")
+    return sql + ")"
+
+
+def _contar(cursor, grupos: list[str], limite: int) -> tuple[dict[str, int], int]:
+    """
+    Conta as ocorrências de cada trigrama (no máximo `limite`) numa única consulta.
+
+    Retorna as contagens e uma estimativa do total de tarefas (maior ID).
+    """
+    consulta = " UNION ALL ".join(
+        f"SELECT {i}, COUNT(*) FROM (SELECT 1 FROM {TABELA} WHERE trigrama = %s LIMIT %s) AS amostra_{i}"
+        for i in range(len(grupos))
+    )
+    consulta += " UNION ALL SELECT -1, MAX(id) FROM tarefas"
+    cursor.execute(consulta, [param for trigrama in grupos for param in (trigrama, limite)])
+    resultado = dict(cursor.fetchall())
+    total_tarefas = resultado.pop(-1) or 0
+    return {grupos[i]: total for i, total in resultado.items()}, total_tarefas
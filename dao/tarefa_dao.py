@@ -1,8 +1,41 @@
 # dao/tarefa_dao.py
-import mysql.connector
-from db.db import DataCon
+import base64
+import json
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from time import perf_counter
+
+from dao import consultas, contadores, exportacao, indice_titulo, transacao
+from dao.cache import CacheLRU
+from db.motores import obter_motor
 from models.tarefa import Tarefa
-from utils.logger import _log_erro, _tratar_erro
+from utils import metricas
+from utils.logger import _log_erro
+
+
+def _tratar_erro(mensagem: str, e: Exception, metodo: str, retorno_padrao):
+    """
+    Registra o erro e devolve `retorno_padrao`, como utils.logger._tratar_erro.
+
+    Dentro de `TarefaDAO.transacao()` o erro é relançado depois de
+    registrado, para que a transação inteira seja desfeita.
+    """
+    _log_erro(mensagem, e, metodo)
+    if transacao.atual() is not None:
+        raise e
+    return retorno_padrao
+
+
+class LimiteSegurancaExcedido(ValueError):
+    """
+    Mais tarefas atendem ao filtro de `atualizar_por_filtro`/`excluir_por_filtro`
+    que o `limite_seguranca` permite; nada foi alterado.
+    """
+
+    def __init__(self, limite: int):
+        super().__init__(f"Mais de {limite} tarefas atendem ao filtro; nada foi alterado.")
+        self.limite = limite
 
 
 class TarefaDAO:
@@ -10,10 +43,96 @@ class TarefaDAO:
     Classe responsável pelo CRUD de tarefas no banco de dados.
     Fornece métodos para criar, ler, atualizar, excluir e filtrar tarefas.
     """
-    atributos = "id, titulo, descricao, prioridade, status, data_criacao"
-    tabela = "tarefas"
+    atributos = consultas.ATRIBUTOS
+    tabela = consultas.TABELA
+    campos_ordenacao = consultas.CAMPOS_ORDENACAO
+    direcoes = consultas.DIRECOES
+    _query_por_id = f"SELECT {consultas.ATRIBUTOS} FROM {consultas.TABELA} WHERE id = %s"
+    _cache: CacheLRU | None = None
+    # Usa o índice de trigramas (dao.indice_titulo) nas buscas por título
+    usar_indice_titulo = True
+    # Lê as contagens sem filtro da tabela de contadores (dao.contadores)
+    usar_contadores = True
+
+    @staticmethod
+    def ativar_cache(tamanho_max: int = 1024, ttl: float = 60.0) -> None:
+        """
+        Ativa o cache em memória de `buscar_por_id`.
+
+        Parâmetros:
+        -----------
+        tamanho_max : int
+            Quantidade máxima de tarefas em cache (remoção LRU).
+        ttl : float
+            Tempo de vida de cada entrada, em segundos.
+
+        Observações:
+        ------------
+        - inserir, inserir_lote, atualizar e excluir invalidam as entradas
+          que alteram, então leituras após uma escrita local nunca ficam
+          desatualizadas. Escritas feitas por outros processos só aparecem
+          após o TTL.
+        """
+        TarefaDAO._cache = CacheLRU(tamanho_max, ttl)
+
 
     @staticmethod
+    def desativar_cache() -> None:
+        """Desativa e descarta o cache de tarefas."""
+        TarefaDAO._cache = None
+
+
+    @staticmethod
+    def estatisticas_cache() -> dict | None:
+        """Retorna os contadores do cache (acertos, falhas, remoções...) ou None se desativado."""
+        return TarefaDAO._cache.estatisticas() if TarefaDAO._cache else None
+
+
+    @staticmethod
+    @contextmanager
+    def transacao():
+        """
+        Agrupa várias chamadas do DAO numa única conexão e num único commit.
+
+        Exemplo:
+            with TarefaDAO.transacao():
+                tarefa = TarefaDAO.buscar_por_id(7)
+                tarefa.status = "Concluída"
+                TarefaDAO.atualizar(tarefa)
+                TarefaDAO.excluir(8)
+
+        Retorna:
+        --------
+        Transacao
+            A conexão da transação (ver dao/transacao.py). Não é preciso
+            usá-la: os métodos do DAO a encontram sozinhos.
+
+        Observações:
+        ------------
+        - O commit é feito uma vez, ao sair do bloco. Uma exceção dentro do
+          bloco desfaz tudo e é relançada.
+        - Dentro do bloco, erros de banco nos métodos do DAO são registrados
+          e relançados em vez de virarem None/False. Os métodos em lote
+          continuam desfazendo só o lote com erro e o apontando no relatório.
+        - Blocos aninhados viram savepoints: uma exceção no bloco interno
+          desfaz só ele (se tratada, o externo segue).
+        - No SQLite a transação pega a trava de escrita do banco logo no
+          início (BEGIN IMMEDIATE), então o que for lido no bloco não muda
+          até o commit. No MySQL as leituras de `buscar_por_id` não travam
+          linhas: outra conexão ainda pode alterá-las antes do commit.
+        - Dentro do bloco o cache de `buscar_por_id` não é usado. As tarefas
+          alteradas saem do cache de novo após o commit.
+        - Vale para a thread (contexto) que abriu o bloco.
+        """
+        externa = transacao.atual()
+        with transacao.abrir(obter_motor()) as atual:
+            yield atual
+        if externa is None:
+            TarefaDAO._invalidar_cache(*atual.alterados)
+
+
+    @staticmethod
+    @metricas.medido
     def buscar_por_id(tarefa_id: int) -> Tarefa | None:
         """
         Busca uma tarefa pelo seu ID.
@@ -31,23 +150,169 @@ class TarefaDAO:
 
         Observações:
         ------------
-        - Usa conexão gerenciada pelo DataCon.
+        - Usa conexão gerenciada pelo motor de armazenamento (ver `obter_motor`).
+        - Consulta o cache primeiro, se estiver ativo (ver `ativar_cache`).
         - Tratamento de erros feito por `_tratar_erro`.
         """
-        query = f"SELECT {TarefaDAO.atributos} FROM {TarefaDAO.tabela} WHERE id = %s"
+        # Dentro de uma transação o cache fica de fora: ele não pode guardar
+        # valores que ainda não foram confirmados
+        cache = TarefaDAO._cache if transacao.atual() is None else None
+        if cache:
+            if (tarefa := cache.obter(tarefa_id)) is not None:
+                return tarefa
+            marca = cache.marca()
+
+        motor = obter_motor()
         try:
-            with DataCon() as conn, conn.cursor(dictionary=True) as cursor:
-                cursor.execute(query, (tarefa_id,))
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn, preparado=True) as cursor:
+                cursor.execute(TarefaDAO._query_por_id, (tarefa_id,))
                 if not (linha := cursor.fetchone()):
                     return None
-                return Tarefa(**linha)
-        except mysql.connector.Error as e:
+                tarefa = Tarefa.de_linha(linha)
+                if cache:
+                    cache.guardar(tarefa_id, tarefa, marca)
+                return tarefa
+        except motor.Erro as e:
             return _tratar_erro("Erro no banco de dados ao buscar tarefa", e, "buscar_por_id", None)
         except Exception as e:
             return _tratar_erro("Erro inesperado ao buscar tarefa", e, "buscar_por_id", None)
 
 
     @staticmethod
+    @metricas.medido
+    def buscar_por_ids(ids, tamanho_lote: int = 500) -> tuple[dict[int, Tarefa], list[int]]:
+        """
+        Busca várias tarefas de uma vez, evitando uma consulta por ID.
+
+        Parâmetros:
+        -----------
+        ids : Iterable[int]
+            IDs das tarefas. Repetições são ignoradas.
+        tamanho_lote : int
+            Quantidade máxima de IDs por consulta `WHERE id IN (...)`.
+
+        Retorna:
+        --------
+        tuple[dict[int, Tarefa], list[int]]
+            Dicionário id -> Tarefa com as tarefas encontradas e a lista dos IDs
+            que não existem no banco. Em caso de erro retorna ({}, todos os IDs).
+
+        Observações:
+        ------------
+        - Com o cache ativo, só os IDs ausentes do cache vão ao banco, e as
+          tarefas lidas são guardadas nele.
+        - Todas as consultas usam uma única conexão.
+        """
+        if tamanho_lote < 1:
+            raise ValueError("tamanho_lote deve ser maior que zero")
+
+        unicos = list(dict.fromkeys(ids))
+        encontradas = {}
+        frios = unicos
+        cache = TarefaDAO._cache if transacao.atual() is None else None
+        if cache:
+            frios = []
+            for tarefa_id in unicos:
+                if (tarefa := cache.obter(tarefa_id)) is not None:
+                    encontradas[tarefa_id] = tarefa
+                else:
+                    frios.append(tarefa_id)
+            marca = cache.marca()
+
+        if frios:
+            motor = obter_motor()
+            try:
+                with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                    for inicio in range(0, len(frios), tamanho_lote):
+                        lote = frios[inicio:inicio + tamanho_lote]
+                        marcadores = ", ".join(["%s"] * len(lote))
+                        cursor.execute(
+                            f"SELECT {TarefaDAO.atributos} FROM {TarefaDAO.tabela} WHERE id IN ({marcadores})",
+                            lote
+                        )
+                        for tarefa in TarefaDAO._montar(cursor.fetchall()):
+                            encontradas[tarefa.id] = tarefa
+                            if cache:
+                                cache.guardar(tarefa.id, tarefa, marca)
+            except motor.Erro as e:
+                return _tratar_erro("Erro no banco de dados ao buscar tarefas", e, "buscar_por_ids", ({}, unicos))
+            except Exception as e:
+                return _tratar_erro("Erro inesperado ao buscar tarefas", e, "buscar_por_ids", ({}, unicos))
+
+        faltantes = [tarefa_id for tarefa_id in unicos if tarefa_id not in encontradas]
+        return encontradas, faltantes
+
+
+    @staticmethod
+    @metricas.medido
+    def chaves_existentes(campos: tuple[str, ...], chaves, tamanho_lote: int = 500) -> set[tuple] | None:
+        """
+        Retorna quais das chaves naturais informadas já existem no banco.
+
+        Parâmetros:
+        -----------
+        campos : tuple[str, ...]
+            Campos da chave, de `consultas.CAMPOS_CHAVE`, incluindo ao menos um
+            de `consultas.CAMPOS_CHAVE_INDEXADOS`.
+        chaves : Iterable[tuple]
+            Valores de cada chave, na ordem de `campos` e no formato do modelo
+            (prioridade pelo nome). Use `TarefaDAO.chave(tarefa, campos)`.
+        tamanho_lote : int
+            Quantidade máxima de valores por consulta `IN (...)`.
+
+        Retorna:
+        --------
+        set[tuple] | None
+            Subconjunto de `chaves` já gravado. Retorna None em caso de erro.
+
+        Observações:
+        ------------
+        - A consulta filtra pelo primeiro campo indexado da chave e compara a
+          chave inteira em memória.
+        - Datas são comparadas como gravadas na coluna (o MySQL guarda DATETIME
+          sem frações de segundo).
+        """
+        campos = tuple(campos)
+        if not campos or any(campo not in consultas.CAMPOS_CHAVE for campo in campos):
+            raise ValueError(f"Chave inválida. Use campos de: {consultas.CAMPOS_CHAVE}")
+        indexado = next((campo for campo in campos if campo in consultas.CAMPOS_CHAVE_INDEXADOS), None)
+        if indexado is None:
+            raise ValueError(f"A chave precisa incluir um destes campos: {consultas.CAMPOS_CHAVE_INDEXADOS}")
+        if tamanho_lote < 1:
+            raise ValueError("tamanho_lote deve ser maior que zero")
+
+        procuradas = {tuple(TarefaDAO._valor_coluna(campo, valor) for campo, valor in zip(campos, chave)): chave
+                      for chave in chaves}
+        posicao = campos.index(indexado)
+        valores = list({chave[posicao] for chave in procuradas})
+        existentes = set()
+        motor = obter_motor()
+        try:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                for inicio in range(0, len(valores), tamanho_lote):
+                    lote = valores[inicio:inicio + tamanho_lote]
+                    cursor.execute(
+                        f"SELECT {', '.join(campos)} FROM {TarefaDAO.tabela} "
+                        f"WHERE {indexado} IN ({', '.join(['%s'] * len(lote))})",
+                        lote
+                    )
+                    existentes.update(procuradas[linha] for linha in map(tuple, cursor.fetchall())
+                                      if linha in procuradas)
+            return existentes
+        except motor.Erro as e:
+            return _tratar_erro("Erro no banco de dados ao buscar chaves", e, "chaves_existentes", None)
+        except Exception as e:
+            return _tratar_erro("Erro inesperado ao buscar chaves", e, "chaves_existentes", None)
+
+
+    @staticmethod
+    def chave(tarefa: Tarefa, campos: tuple[str, ...]) -> tuple:
+        """Valores da chave natural `campos` de uma tarefa (ver `chaves_existentes`)."""
+        return tuple(getattr(tarefa, campo) for campo in campos)
+
+
+    @staticmethod
+    @metricas.medido
     def inserir(tarefa: Tarefa) -> int | None:
         """
         Insere uma nova tarefa no banco de dados.
@@ -73,24 +338,128 @@ class TarefaDAO:
             INSERT INTO {TarefaDAO.tabela} (titulo, descricao, prioridade, status, data_criacao)
             VALUES (%s, %s, %s, %s, %s)
         """
+        nivel = Tarefa.nivel_prioridade(tarefa.prioridade)
+        motor = obter_motor()
         try:
-            with DataCon() as conn, conn.cursor() as cursor:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
                 cursor.execute(query, (
                     tarefa.titulo,
                     tarefa.descricao,
-                    tarefa.prioridade,
+                    nivel,
                     tarefa.status,
                     tarefa.data_criacao
                 ))
+                novo_id = cursor.lastrowid
+                indice_titulo.indexar(cursor, [(novo_id, tarefa.titulo)])
+                contadores.ajustar(cursor, motor.nome, [(tarefa.status, nivel)])
                 conn.commit()
-                return cursor.lastrowid
-        except mysql.connector.Error as e:
+                TarefaDAO._invalidar_cache(novo_id)
+                return novo_id
+        except motor.Erro as e:
             return _tratar_erro("Erro no banco de dados ao inserir tarefa", e, "inserir", None)
         except Exception as e:
             return _tratar_erro("Erro inesperado ao inserir tarefa", e, "inserir", None)
 
 
     @staticmethod
+    @metricas.medido
+    def inserir_lote(tarefas, chunk_size: int = 1000) -> tuple[list[int | None], list[dict]]:
+        """
+        Insere muitas tarefas usando INSERTs de múltiplas linhas, um lote por transação.
+
+        Parâmetros:
+        -----------
+        tarefas : Iterable[Tarefa]
+            Tarefas a inserir. O iterável é consumido aos poucos (streaming),
+            então pode ser um gerador de tamanho arbitrário.
+        chunk_size : int
+            Quantidade de linhas por INSERT/commit (padrão: 1000).
+
+        Retorna:
+        --------
+        tuple[list[int | None], list[dict]]
+            - IDs gerados, na mesma ordem da entrada. Linhas de um lote que
+              falhou recebem None.
+            - Relatório de erros, um dicionário por lote com falha contendo
+              'lote', 'inicio' (posição da primeira linha do lote na entrada),
+              'quantidade' e 'erro'.
+
+        Observações:
+        ------------
+        - Um lote com erro sofre rollback e é registrado no log, mas não
+          interrompe os lotes seguintes.
+        - Os IDs de um lote são derivados do `lastrowid` do INSERT de
+          múltiplas linhas (ver `Motor.ids_inseridos`). Se o motor não garante
+          IDs consecutivos nesse INSERT (MySQL com innodb_autoinc_lock_mode=2,
+          ver `Motor.ids_consecutivos`), o lote continua num único INSERT e
+          os IDs são relidos na mesma transação: o snapshot é fixado por um
+          SELECT MAX(id) antes do INSERT, e acima desse id ele só mostra as
+          linhas do próprio lote. Isso depende do isolamento REPEATABLE READ,
+          o padrão do InnoDB.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size deve ser maior que zero")
+
+        base = f"""
+            INSERT INTO {TarefaDAO.tabela} (titulo, descricao, prioridade, status, data_criacao)
+            VALUES """
+        ids = []
+        erros = []
+        iterador = iter(tarefas)
+        motor = obter_motor()
+        try:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                consecutivos = motor.ids_consecutivos(cursor)
+                for numero, lote in enumerate(iter(lambda: list(islice(iterador, chunk_size)), [])):
+                    parametros = []
+                    chaves = []
+                    for tarefa in lote:
+                        nivel = Tarefa.nivel_prioridade(tarefa.prioridade)
+                        parametros.extend((
+                            tarefa.titulo,
+                            tarefa.descricao,
+                            nivel,
+                            tarefa.status,
+                            tarefa.data_criacao
+                        ))
+                        chaves.append((tarefa.status, nivel))
+                    try:
+                        if not consecutivos:
+                            # Leitura consistente antes do INSERT: fixa o snapshot da transação
+                            cursor.execute(f"SELECT MAX(id) FROM {TarefaDAO.tabela}")
+                            maior_id = cursor.fetchall()[0][0] or 0
+                        cursor.execute(base + ", ".join(["(%s, %s, %s, %s, %s)"] * len(lote)), parametros)
+                        if consecutivos:
+                            novos_ids = motor.ids_inseridos(cursor, len(lote))
+                        else:
+                            # Acima de maior_id, o snapshot só mostra as linhas desta transação
+                            cursor.execute(f"SELECT id FROM {TarefaDAO.tabela} WHERE id > %s ORDER BY id LIMIT %s",
+                                           (maior_id, len(lote)))
+                            novos_ids = [linha[0] for linha in cursor.fetchall()]
+                            if len(novos_ids) != len(lote):
+                                raise motor.Erro(f"{len(novos_ids)} IDs relidos para {len(lote)} linhas inseridas")
+                        indice_titulo.indexar(cursor, zip(novos_ids, (t.titulo for t in lote)))
+                        contadores.ajustar(cursor, motor.nome, chaves)
+                        conn.commit()
+                    except motor.Erro as e:
+                        conn.rollback()
+                        _log_erro(f"Erro no banco de dados ao inserir lote {numero}", e, "inserir_lote")
+                        erros.append({"lote": numero, "inicio": len(ids), "quantidade": len(lote), "erro": str(e)})
+                        ids.extend([None] * len(lote))
+                        continue
+                    TarefaDAO._invalidar_cache(*novos_ids)
+                    ids.extend(novos_ids)
+            return ids, erros
+        except motor.Erro as e:
+            erros.append({"lote": None, "inicio": len(ids), "quantidade": None, "erro": str(e)})
+            return _tratar_erro("Erro no banco de dados ao inserir lote de tarefas", e, "inserir_lote", (ids, erros))
+        except Exception as e:
+            erros.append({"lote": None, "inicio": len(ids), "quantidade": None, "erro": str(e)})
+            return _tratar_erro("Erro inesperado ao inserir lote de tarefas", e, "inserir_lote", (ids, erros))
+
+
+    @staticmethod
+    @metricas.medido
     def listar(campo_ordem: str = None, direcao: str = None) -> list[Tarefa]:
         """
         Lista todas as tarefas do banco de dados, opcionalmente ordenadas.
@@ -109,23 +478,27 @@ class TarefaDAO:
 
         Observações:
         ------------
-        - Query parametrizada.
-        - Uso de cursor dictionary para facilitar criação do objeto Tarefa.
+        - Consulta compilada por `dao.consultas` e executada como statement
+          preparado. Campo ou direção fora de `campos_ordenacao`/`direcoes`
+          lança ValueError.
+        - Linhas convertidas com Tarefa.de_linha (sem revalidação).
+        - Prioridade é ordenada pelo nível (Baixa < Media < Alta); use 'DESC'
+          para ver as mais urgentes primeiro.
         """
-        query = f"SELECT {TarefaDAO.atributos} FROM {TarefaDAO.tabela}"
-        if campo_ordem and direcao:
-            query += f" ORDER BY {campo_ordem} {direcao}"
+        query = consultas.compilar((), *consultas.validar_ordenacao(campo_ordem, direcao))
+        motor = obter_motor()
         try:
-            with DataCon() as conn, conn.cursor(dictionary=True) as cursor:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn, preparado=True) as cursor:
                 cursor.execute(query)
-                return [Tarefa(**row) for row in cursor.fetchall()]
-        except mysql.connector.Error as e:
+                return TarefaDAO._montar(cursor.fetchall())
+        except motor.Erro as e:
             return _tratar_erro("Erro no banco de dados ao listar tarefas", e, "listar", [])
         except Exception as e:
             return _tratar_erro("Erro inesperado ao listar tarefas", e, "listar", [])
 
 
     @staticmethod
+    @metricas.medido
     def atualizar(tarefa: Tarefa) -> bool:
         """
         Atualiza uma tarefa existente no banco de dados.
@@ -155,24 +528,36 @@ class TarefaDAO:
         SET titulo=%s, descricao=%s, prioridade=%s, status=%s
         WHERE id = %s
         """
+        nivel = Tarefa.nivel_prioridade(tarefa.prioridade)
+        motor = obter_motor()
         try:
-            with DataCon() as conn, conn.cursor() as cursor:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                motor.iniciar_escrita(conn)
+                anteriores = TarefaDAO._travar_ids(cursor, [tarefa.id], motor)
                 cursor.execute(query, (
                     tarefa.titulo,
                     tarefa.descricao,
-                    tarefa.prioridade,
+                    nivel,
                     tarefa.status,
                     tarefa.id
                 ))
+                alterou = cursor.rowcount > 0
+                if alterou:
+                    indice_titulo.remover(cursor, [tarefa.id])
+                    indice_titulo.indexar(cursor, [(tarefa.id, tarefa.titulo)])
+                if anteriores:
+                    contadores.ajustar(cursor, motor.nome, [(tarefa.status, nivel)], anteriores.values())
                 conn.commit()
-                return cursor.rowcount > 0
-        except mysql.connector.Error as e:
+                TarefaDAO._invalidar_cache(tarefa.id)
+                return alterou
+        except motor.Erro as e:
             return _tratar_erro("Erro no banco de dados ao atualizar tarefa", e, "atualizar", False)
         except Exception as e:
             return _tratar_erro("Erro inesperado ao atualizar tarefa", e, "atualizar", False)
 
 
     @staticmethod
+    @metricas.medido
     def excluir(id: int) -> bool:
         """
         Exclui uma tarefa pelo seu ID.
@@ -198,18 +583,348 @@ class TarefaDAO:
             return False
 
         query = f"DELETE FROM {TarefaDAO.tabela} WHERE id = %s"
+        motor = obter_motor()
         try:
-            with DataCon() as conn, conn.cursor() as cursor:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                motor.iniciar_escrita(conn)
+                anteriores = TarefaDAO._travar_ids(cursor, [id], motor)
                 cursor.execute(query, (id,))
+                excluiu = cursor.rowcount > 0
+                if excluiu:
+                    indice_titulo.remover(cursor, [id])
+                    contadores.ajustar(cursor, motor.nome, saidas=anteriores.values())
                 conn.commit()
-                return cursor.rowcount > 0
-        except mysql.connector.Error as e:
+                TarefaDAO._invalidar_cache(id)
+                return excluiu
+        except motor.Erro as e:
             return _tratar_erro("Erro no banco de dados ao excluir tarefa", e, "excluir", False)
         except Exception as e:
             return _tratar_erro("Erro inesperado ao excluir tarefa", e, "excluir", False)
 
 
     @staticmethod
+    @metricas.medido
+    def atualizar_lote(tarefas, chunk_size: int = 1000) -> tuple[int, list[dict]]:
+        """
+        Atualiza muitas tarefas pelo ID, um lote por transação.
+
+        Parâmetros:
+        -----------
+        tarefas : Iterable[Tarefa]
+            Tarefas com ID e os novos valores de título, descrição, prioridade e
+            status. O iterável é consumido aos poucos, como em `inserir_lote`.
+        chunk_size : int
+            Quantidade de tarefas por transação (padrão: 1000).
+
+        Retorna:
+        --------
+        tuple[int, list[dict]]
+            Quantidade de linhas afetadas (no MySQL, linhas regravadas com os
+            mesmos valores não contam) e o relatório de erros no formato de
+            `inserir_lote`.
+
+        Observações:
+        ------------
+        - IDs inexistentes são ignorados; se o mesmo ID aparece mais de uma
+          vez no lote, vale a última ocorrência.
+        - Um lote com alguma tarefa sem ID não é gravado e entra no relatório
+          de erros, como um lote com erro de banco.
+        - Mantém o índice de títulos, os contadores e o cache, como `atualizar`.
+        - Um lote com erro sofre rollback e não interrompe os seguintes.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size deve ser maior que zero")
+
+        query = f"""
+        UPDATE {TarefaDAO.tabela}
+        SET titulo=%s, descricao=%s, prioridade=%s, status=%s
+        WHERE id = %s
+        """
+        afetadas = 0
+        lidas = 0
+        erros = []
+        iterador = iter(tarefas)
+        motor = obter_motor()
+        try:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                for numero, lote in enumerate(iter(lambda: list(islice(iterador, chunk_size)), [])):
+                    if any(tarefa.id is None for tarefa in lote):
+                        _log_erro(f"Tarefa sem ID no lote {numero}; lote ignorado", None, "atualizar_lote")
+                        erros.append({"lote": numero, "inicio": lidas, "quantidade": len(lote),
+                                      "erro": "Todas as tarefas precisam de um ID válido para serem atualizadas"})
+                        lidas += len(lote)
+                        continue
+                    por_id = {tarefa.id: tarefa for tarefa in lote}
+                    try:
+                        motor.iniciar_escrita(conn)
+                        anteriores = TarefaDAO._travar_ids(cursor, por_id, motor)
+                        existentes = [por_id[tarefa_id] for tarefa_id in anteriores]
+                        if existentes:
+                            linhas = [(
+                                tarefa.titulo,
+                                tarefa.descricao,
+                                Tarefa.nivel_prioridade(tarefa.prioridade),
+                                tarefa.status,
+                                tarefa.id
+                            ) for tarefa in existentes]
+                            cursor.executemany(query, linhas)
+                            afetadas_lote = cursor.rowcount
+                            indice_titulo.remover(cursor, (tarefa.id for tarefa in existentes))
+                            indice_titulo.indexar(cursor, [(tarefa.id, tarefa.titulo) for tarefa in existentes])
+                            contadores.ajustar(cursor, motor.nome, ((status, nivel) for _, _, nivel, status, _ in linhas),
+                                               anteriores.values())
+                        conn.commit()
+                    except motor.Erro as e:
+                        conn.rollback()
+                        _log_erro(f"Erro no banco de dados ao atualizar lote {numero}", e, "atualizar_lote")
+                        erros.append({"lote": numero, "inicio": lidas, "quantidade": len(lote), "erro": str(e)})
+                        continue
+                    finally:
+                        lidas += len(lote)
+                    if existentes:
+                        afetadas += afetadas_lote
+                        TarefaDAO._invalidar_cache(*por_id)
+            return afetadas, erros
+        except motor.Erro as e:
+            erros.append({"lote": None, "inicio": lidas, "quantidade": None, "erro": str(e)})
+            return _tratar_erro("Erro no banco de dados ao atualizar lote de tarefas", e, "atualizar_lote", (afetadas, erros))
+        except Exception as e:
+            erros.append({"lote": None, "inicio": lidas, "quantidade": None, "erro": str(e)})
+            return _tratar_erro("Erro inesperado ao atualizar lote de tarefas", e, "atualizar_lote", (afetadas, erros))
+
+
+    @staticmethod
+    @metricas.medido
+    def excluir_lote(ids, chunk_size: int = 1000) -> tuple[int, list[dict]]:
+        """
+        Exclui muitas tarefas pelo ID, um lote por transação.
+
+        Parâmetros:
+        -----------
+        ids : Iterable[int]
+            IDs das tarefas, consumidos aos poucos.
+        chunk_size : int
+            Quantidade de IDs por `DELETE ... WHERE id IN (...)` (padrão: 1000).
+
+        Retorna:
+        --------
+        tuple[int, list[dict]]
+            Quantidade de tarefas excluídas e o relatório de erros no formato
+            de `inserir_lote`.
+
+        Observações:
+        ------------
+        - IDs inexistentes são ignorados.
+        - Remove também os trigramas do título e as entradas do cache, e
+          desconta as tarefas dos contadores.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size deve ser maior que zero")
+
+        excluidas = 0
+        lidas = 0
+        erros = []
+        iterador = iter(ids)
+        motor = obter_motor()
+        try:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                for numero, lote in enumerate(iter(lambda: list(islice(iterador, chunk_size)), [])):
+                    unicos = list(dict.fromkeys(lote))
+                    try:
+                        motor.iniciar_escrita(conn)
+                        excluidas_lote = TarefaDAO._excluir_ids(cursor, unicos, motor)
+                        conn.commit()
+                    except motor.Erro as e:
+                        conn.rollback()
+                        _log_erro(f"Erro no banco de dados ao excluir lote {numero}", e, "excluir_lote")
+                        erros.append({"lote": numero, "inicio": lidas, "quantidade": len(lote), "erro": str(e)})
+                        continue
+                    finally:
+                        lidas += len(lote)
+                    excluidas += excluidas_lote
+                    TarefaDAO._invalidar_cache(*unicos)
+            return excluidas, erros
+        except motor.Erro as e:
+            erros.append({"lote": None, "inicio": lidas, "quantidade": None, "erro": str(e)})
+            return _tratar_erro("Erro no banco de dados ao excluir lote de tarefas", e, "excluir_lote", (excluidas, erros))
+        except Exception as e:
+            erros.append({"lote": None, "inicio": lidas, "quantidade": None, "erro": str(e)})
+            return _tratar_erro("Erro inesperado ao excluir lote de tarefas", e, "excluir_lote", (excluidas, erros))
+
+
+    @staticmethod
+    @metricas.medido
+    def atualizar_por_filtro(filtros: dict, valores: dict, limite_seguranca: int | None = 1000,
+                             chunk_size: int = 1000) -> tuple[int, list[dict]]:
+        """
+        Altera prioridade e/ou status de todas as tarefas que atendem aos filtros.
+
+        Exemplo: `atualizar_por_filtro({"prioridade": "Alta"}, {"status": "Concluída"})`.
+
+        Parâmetros:
+        -----------
+        filtros : dict
+            Mesmo formato de `filtrar_tarefas`.
+        valores : dict
+            Novos valores, com chaves 'prioridade' e/ou 'status'.
+        limite_seguranca : int | None
+            Máximo de tarefas que o filtro pode alcançar. Se mais tarefas
+            atenderem, nada é alterado. None desliga o limite e é obrigatório
+            para filtros vazios (todas as tarefas).
+        chunk_size : int
+            Quantidade de tarefas alteradas por transação (padrão: 1000).
+
+        Retorna:
+        --------
+        tuple[int, list[dict]]
+            Quantidade de linhas afetadas e o relatório de erros no formato
+            de `inserir_lote`.
+
+        Observações:
+        ------------
+        - As tarefas são percorridas por ordem de id em lotes de `chunk_size`,
+          cada lote numa transação, então a operação não segura travas sobre
+          a tabela inteira. Um lote com erro não desfaz os anteriores.
+        - Valores inválidos lançam ValueError antes de qualquer escrita.
+        - Se mais de `limite_seguranca` tarefas atendem ao filtro, lança
+          LimiteSegurancaExcedido (um ValueError) sem alterar nada; cabe a
+          quem chamou avisar o usuário.
+        """
+        campos, parametros_valores = TarefaDAO._valores_atualizacao(valores)
+        atribuicoes = ", ".join(f"{campo} = %s" for campo in campos)
+
+        novos = dict(zip(campos, parametros_valores))
+
+        def aplicar(cursor, ids, motor):
+            anteriores = TarefaDAO._travar_ids(cursor, ids, motor).values()
+            marcadores = ", ".join(["%s"] * len(ids))
+            cursor.execute(f"UPDATE {TarefaDAO.tabela} SET {atribuicoes} WHERE id IN ({marcadores})",
+                           [*parametros_valores, *ids])
+            afetadas = cursor.rowcount
+            contadores.ajustar(cursor, motor.nome, [(novos.get("status", status), novos.get("prioridade", nivel))
+                                                    for status, nivel in anteriores], anteriores)
+            return afetadas
+
+        return TarefaDAO._aplicar_por_filtro(filtros, limite_seguranca, chunk_size, aplicar, "atualizar_por_filtro")
+
+
+    @staticmethod
+    @metricas.medido
+    def excluir_por_filtro(filtros: dict, limite_seguranca: int | None = 1000,
+                           chunk_size: int = 1000) -> tuple[int, list[dict]]:
+        """
+        Exclui todas as tarefas que atendem aos filtros.
+
+        Parâmetros, retorno e limite de segurança iguais aos de
+        `atualizar_por_filtro`. Remove também os trigramas do título e as
+        entradas do cache.
+        """
+        return TarefaDAO._aplicar_por_filtro(filtros, limite_seguranca, chunk_size,
+                                             TarefaDAO._excluir_ids, "excluir_por_filtro")
+
+
+    @staticmethod
+    @metricas.medido
+    def reindexar_titulos(tamanho_lote: int = 5000) -> int | None:
+        """
+        Recria do zero o índice de trigramas dos títulos.
+
+        Parâmetros:
+        -----------
+        tamanho_lote : int
+            Quantidade de tarefas lidas e indexadas por vez.
+
+        Retorna:
+        --------
+        int | None
+            Quantidade de tarefas indexadas, ou None em caso de erro.
+
+        Observações:
+        ------------
+        - A migração que cria o índice já o preenche; use para reparar um
+          índice inconsistente.
+        """
+        motor = obter_motor()
+        total = 0
+        try:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                cursor.execute(f"DELETE FROM {indice_titulo.TABELA}")
+                ultimo_id = 0
+                while True:
+                    cursor.execute(
+                        f"SELECT id, titulo FROM {TarefaDAO.tabela} WHERE id > %s ORDER BY id LIMIT %s",
+                        (ultimo_id, tamanho_lote)
+                    )
+                    if not (linhas := cursor.fetchall()):
+                        break
+                    indice_titulo.indexar(cursor, linhas)
+                    total += len(linhas)
+                    ultimo_id = linhas[-1][0]
+                conn.commit()
+                return total
+        except motor.Erro as e:
+            return _tratar_erro("Erro no banco de dados ao reindexar títulos", e, "reindexar_titulos", None)
+        except Exception as e:
+            return _tratar_erro("Erro inesperado ao reindexar títulos", e, "reindexar_titulos", None)
+
+
+    @staticmethod
+    @metricas.medido
+    def verificar_contadores() -> dict[tuple[str, int], tuple[int, int]] | None:
+        """
+        Compara a tabela de contadores com um GROUP BY na tabela de tarefas.
+
+        Retorna:
+        --------
+        dict | None
+            {(status, nível de prioridade): (contado, real)} com os pares que
+            divergem (vazio se tudo confere), ou None em caso de erro.
+
+        Observações:
+        ------------
+        - Lê a tabela de tarefas inteira; use para auditoria, não em telas.
+        """
+        motor = obter_motor()
+        try:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                return contadores.divergencias(cursor)
+        except motor.Erro as e:
+            return _tratar_erro("Erro no banco de dados ao verificar contadores", e, "verificar_contadores", None)
+        except Exception as e:
+            return _tratar_erro("Erro inesperado ao verificar contadores", e, "verificar_contadores", None)
+
+
+    @staticmethod
+    @metricas.medido
+    def reconstruir_contadores() -> int | None:
+        """
+        Recalcula do zero a tabela de contadores, numa única transação.
+
+        Retorna:
+        --------
+        int | None
+            Total de tarefas contadas, ou None em caso de erro.
+
+        Observações:
+        ------------
+        - As escritas do DAO mantêm os contadores; use para reparar
+          divergências apontadas por `verificar_contadores` (ex: linhas
+          alteradas fora do DAO).
+        """
+        motor = obter_motor()
+        try:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                total = contadores.reconstruir(cursor)
+                conn.commit()
+                return total
+        except motor.Erro as e:
+            return _tratar_erro("Erro no banco de dados ao reconstruir contadores", e, "reconstruir_contadores", None)
+        except Exception as e:
+            return _tratar_erro("Erro inesperado ao reconstruir contadores", e, "reconstruir_contadores", None)
+
+
+    @staticmethod
+    @metricas.medido
     def filtrar_tarefas(filtros: dict, campo_ordem: str = None, direcao: str = None) -> list[Tarefa]:
         """
         Filtra tarefas aplicando múltiplas condições e ordenação opcional.
@@ -231,31 +946,469 @@ class TarefaDAO:
 
         Observações:
         ------------
-        - Usa query parametrizada para segurança.
-        - Permite filtro parcial para título (LIKE).
+        - Consulta compilada por `dao.consultas` e executada como statement
+          preparado. Campos de filtro ou ordenação fora das listas permitidas
+          lançam ValueError.
+        - Permite filtro parcial para título (LIKE). `%` e `_` no valor são
+          buscados literalmente, não como curingas. Com 3 ou mais caracteres
+          as candidatas vêm do índice de trigramas, evitando varrer a tabela.
         """
-        condicoes = []
-        parametros = []
-        query = f"SELECT {TarefaDAO.atributos} FROM {TarefaDAO.tabela}"
+        campos = consultas.campos_filtro(filtros)
+        campo_ordem, direcao = consultas.validar_ordenacao(campo_ordem, direcao)
+        motor = obter_motor()
+        try:
+            with (TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor,
+                  motor.cursor(conn, preparado=True) as preparado):
+                if (filtro := TarefaDAO._parametros_filtros(filtros, campos, cursor)) is None:
+                    return []
+                trigramas, parametros = filtro
+                preparado.execute(consultas.compilar(campos, campo_ordem, direcao, trigramas), parametros)
+                return TarefaDAO._montar(preparado.fetchall())
+        except motor.Erro as e:
+            return _tratar_erro("Erro no banco de dados ao filtrar tarefas", e, "filtrar_tarefas", [])
+        except Exception as e:
+            return _tratar_erro("Erro inesperado ao filtrar tarefas", e, "filtrar_tarefas", [])
+
+
+    @staticmethod
+    @metricas.medido
+    def exportar(arquivo, formato: str = "csv", filtros: dict | None = None, campo_ordem: str = None,
+                 direcao: str = None, tamanho_lote: int = 1000) -> int | None:
+        """
+        Grava as tarefas em CSV ou JSONL num arquivo de texto já aberto, em fluxo.
 
-        if filtros:
-            for campo, valor in filtros.items():
-                if campo == "titulo":
-                    condicoes.append("titulo LIKE %s")
-                    parametros.append(f"%{valor}%")
+        Parâmetros:
+        -----------
+        arquivo : arquivo de texto
+            Destino (ver `dao.exportacao.abrir_destino` para gzip e arquivos).
+        formato : str
+            'csv' (com cabeçalho) ou 'jsonl' (um objeto por linha).
+        filtros, campo_ordem, direcao
+            Mesmo formato de `filtrar_tarefas` (filtros vazios ou None exportam tudo).
+        tamanho_lote : int
+            Linhas lidas por `fetchmany` e gravadas de uma vez.
+
+        Retorna:
+        --------
+        int | None
+            Quantidade de tarefas exportadas. Retorna None em caso de erro; o
+            que já foi gravado fica no arquivo.
+
+        Observações:
+        ------------
+        - As linhas vêm de um cursor sem buffer (no MySQL, o servidor envia
+          conforme o fetchmany pede) e vão direto para o arquivo, sem virar
+          Tarefa: a memória fica em um lote, qualquer que seja a tabela.
+        - A conexão fica ocupada até o fim da exportação.
+        """
+        if tamanho_lote < 1:
+            raise ValueError("tamanho_lote deve ser maior que zero")
+        escritor = exportacao.criar_escritor(arquivo, formato)
+        campos = consultas.campos_filtro(filtros)
+        campo_ordem, direcao = consultas.validar_ordenacao(campo_ordem, direcao)
+        motor = obter_motor()
+        try:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor, motor.cursor(conn) as fluxo:
+                if (filtro := TarefaDAO._parametros_filtros(filtros, campos, cursor)) is None:
+                    return 0
+                trigramas, parametros = filtro
+                fluxo.execute(consultas.compilar(campos, campo_ordem, direcao, trigramas), parametros)
+                exportadas = 0
+                while linhas := fluxo.fetchmany(tamanho_lote):
+                    escritor.escrever(linhas)
+                    exportadas += len(linhas)
+                return exportadas
+        except motor.Erro as e:
+            return _tratar_erro("Erro no banco de dados ao exportar tarefas", e, "exportar", None)
+        except Exception as e:
+            return _tratar_erro("Erro inesperado ao exportar tarefas", e, "exportar", None)
+
+
+    @staticmethod
+    @metricas.medido
+    def contar_por(*campos: str, filtros: dict | None = None) -> dict | None:
+        """
+        Conta as tarefas agrupadas por status, prioridade ou ambos, no banco.
+
+        Parâmetros:
+        -----------
+        *campos : str
+            'status', 'prioridade' ou os dois.
+        filtros : dict | None
+            Mesmo formato de `filtrar_tarefas`, aplicado antes de agrupar.
+
+        Retorna:
+        --------
+        dict | None
+            Contagem por valor (ex: {'Pendente': 12, 'Concluída': 3}) ou, com
+            os dois campos, por par (status, prioridade). Todos os valores
+            válidos aparecem, com 0 quando não há tarefas. Retorna None em
+            caso de erro.
+
+        Observações:
+        ------------
+        - Sem filtros, soma as linhas da tabela de contadores (ver
+          `dao.contadores`), em tempo constante. Com filtros, usa GROUP BY:
+          só as contagens saem do banco, nunca as linhas.
+        - Ex: contar_por('status', 'prioridade')[('Pendente', 'Alta')].
+        """
+        agrupamento = consultas.campos_agrupamento(campos)
+        campos_filtrados = consultas.campos_filtro(filtros)
+        valores = {"status": Tarefa.STATUS_VALIDOS, "prioridade": Tarefa.PRIORIDADE_VALIDAS}
+        if len(agrupamento) == 1:
+            contagens = dict.fromkeys(valores[agrupamento[0]], 0)
+        else:
+            contagens = {(status, prioridade): 0 for status in valores["status"] for prioridade in valores["prioridade"]}
+
+        motor = obter_motor()
+        try:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                if not campos_filtrados and TarefaDAO.usar_contadores:
+                    linhas = [(*(status if campo == "status" else nivel for campo in agrupamento), quantidade)
+                              for (status, nivel), quantidade in contadores.totais(cursor).items()]
                 else:
-                    condicoes.append(f"{campo} = %s")
-                    parametros.append(valor)
-        if condicoes:
-            query += " WHERE " + " AND ".join(condicoes)
-        if campo_ordem and direcao:
-            query += f" ORDER BY {campo_ordem} {direcao}"
+                    if (filtro := TarefaDAO._parametros_filtros(filtros, campos_filtrados, cursor)) is None:
+                        return contagens
+                    trigramas, parametros = filtro
+                    cursor.execute(consultas.compilar_agrupamento(agrupamento, campos_filtrados, trigramas), parametros)
+                    linhas = cursor.fetchall()
+                for *chave, quantidade in linhas:
+                    chave = tuple(Tarefa.PRIORIDADE_POR_NIVEL[valor] if campo == "prioridade" else valor
+                                  for campo, valor in zip(agrupamento, chave))
+                    chave = chave if len(chave) > 1 else chave[0]
+                    contagens[chave] = contagens.get(chave, 0) + quantidade
+            return contagens
+        except motor.Erro as e:
+            return _tratar_erro("Erro no banco de dados ao contar tarefas", e, "contar_por", None)
+        except Exception as e:
+            return _tratar_erro("Erro inesperado ao contar tarefas", e, "contar_por", None)
+
+
+    @staticmethod
+    @metricas.medido
+    def contar_por_dia(inicio: date, fim: date) -> dict[date, int] | None:
+        """
+        Conta as tarefas criadas em cada dia de um intervalo, no banco.
+
+        Parâmetros:
+        -----------
+        inicio : date
+            Primeiro dia do intervalo.
+        fim : date
+            Último dia do intervalo (incluído).
+
+        Retorna:
+        --------
+        dict[date, int] | None
+            Quantidade de tarefas criadas por dia, em ordem, com 0 nos dias
+            sem tarefas. Retorna None em caso de erro.
+
+        Observações:
+        ------------
+        - Usa o índice por data_criacao para o intervalo e GROUP BY por dia.
+        """
+        if isinstance(inicio, datetime):
+            inicio = inicio.date()
+        if isinstance(fim, datetime):
+            fim = fim.date()
+        if fim < inicio:
+            raise ValueError("fim deve ser igual ou posterior a inicio")
+        contagens = {inicio + timedelta(days=i): 0 for i in range((fim - inicio).days + 1)}
 
+        motor = obter_motor()
         try:
-            with DataCon() as conn, conn.cursor(dictionary=True) as cursor:
-                cursor.execute(query, parametros)
-                return [Tarefa(**row) for row in cursor.fetchall()]
-        except mysql.connector.Error as e:
-            return _tratar_erro("Erro no banco de dados ao filtrar tarefas", e, "filtrar_tarefas", [])
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                cursor.execute(consultas.CONTAGEM_POR_DIA, (datetime.combine(inicio, time.min),
+                                                            datetime.combine(fim + timedelta(days=1), time.min)))
+                for dia, quantidade in cursor.fetchall():
+                    # O MySQL devolve date; o SQLite, o texto 'AAAA-MM-DD'
+                    contagens[date.fromisoformat(dia) if isinstance(dia, str) else dia] = quantidade
+            return contagens
+        except motor.Erro as e:
+            return _tratar_erro("Erro no banco de dados ao contar tarefas por dia", e, "contar_por_dia", None)
         except Exception as e:
-            return _tratar_erro("Erro inesperado ao filtrar tarefas", e, "filtrar_tarefas", [])
+            return _tratar_erro("Erro inesperado ao contar tarefas por dia", e, "contar_por_dia", None)
+
+
+    @staticmethod
+    @metricas.medido
+    def listar_paginado(campo_ordem: str = None, direcao: str = None,
+                        limite: int = 50, token: str | None = None) -> tuple[list[Tarefa], str | None]:
+        """
+        Lista as tarefas uma página por vez.
+
+        Mesmo comportamento de `filtrar_paginado` sem filtros.
+        """
+        return TarefaDAO.filtrar_paginado(None, campo_ordem, direcao, limite, token)
+
+
+    @staticmethod
+    @metricas.medido
+    def filtrar_paginado(filtros: dict | None = None, campo_ordem: str = None, direcao: str = None,
+                         limite: int = 50, token: str | None = None) -> tuple[list[Tarefa], str | None]:
+        """
+        Filtra tarefas retornando uma página de resultados e um token de continuação.
+
+        Parâmetros:
+        -----------
+        filtros : dict | None
+            Mesmo formato de `filtrar_tarefas`.
+        campo_ordem : str | None
+            'titulo', 'prioridade', 'status' ou 'data_criacao'. Sem ordenação,
+            as tarefas são paginadas por ID.
+        direcao : str | None
+            'ASC' (padrão) ou 'DESC'.
+        limite : int
+            Quantidade máxima de tarefas por página.
+        token : str | None
+            Token devolvido pela página anterior (None para a primeira página).
+
+        Retorna:
+        --------
+        tuple[list[Tarefa], str | None]
+            Tarefas da página e o token da próxima página (None se for a última).
+            Retorna ([], None) em caso de erro.
+
+        Observações:
+        ------------
+        - Usa paginação por chave (keyset) sobre (campo_ordem, id) em vez de
+          OFFSET, então qualquer página custa o mesmo que a primeira.
+        - O token é opaco e só vale para a mesma ordenação que o gerou.
+        """
+        if limite < 1:
+            raise ValueError("limite deve ser maior que zero")
+        campos = consultas.campos_filtro(filtros)
+        campo_ordem, direcao = consultas.validar_ordenacao(campo_ordem, direcao or "ASC")
+
+        parametros_pagina = []
+        if token:
+            valor, ultimo_id = TarefaDAO._ler_token(token, campo_ordem, direcao)
+            parametros_pagina = [valor, valor, ultimo_id] if campo_ordem else [ultimo_id]
+
+        motor = obter_motor()
+        try:
+            with (TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor,
+                  motor.cursor(conn, preparado=True) as preparado):
+                if (filtro := TarefaDAO._parametros_filtros(filtros, campos, cursor)) is None:
+                    return [], None
+                trigramas, parametros = filtro
+                query = consultas.compilar(campos, campo_ordem, direcao, trigramas,
+                                           pagina=bool(token), limitada=True)
+                preparado.execute(query, [*parametros, *parametros_pagina, limite + 1])
+                tarefas = TarefaDAO._montar(preparado.fetchall())
+        except motor.Erro as e:
+            return _tratar_erro("Erro no banco de dados ao paginar tarefas", e, "filtrar_paginado", ([], None))
+        except Exception as e:
+            return _tratar_erro("Erro inesperado ao paginar tarefas", e, "filtrar_paginado", ([], None))
+
+        if len(tarefas) <= limite:
+            return tarefas, None
+        tarefas = tarefas[:limite]
+        ultima = tarefas[-1]
+        valor = TarefaDAO._valor_coluna(campo_ordem, getattr(ultima, campo_ordem)) if campo_ordem else None
+        return tarefas, TarefaDAO._gerar_token(campo_ordem, direcao, valor, ultima.id)
+
+
+    @staticmethod
+    def _aplicar_por_filtro(filtros: dict, limite_seguranca: int | None, chunk_size: int,
+                            aplicar, metodo: str) -> tuple[int, list[dict]]:
+        """
+        Percorre em lotes de IDs as tarefas que atendem aos filtros, chamando `aplicar(cursor, ids, motor)`.
+
+        `aplicar` faz a escrita do lote e devolve as linhas afetadas; cada lote
+        é confirmado na sua própria transação.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size deve ser maior que zero")
+        campos = consultas.campos_filtro(filtros)
+        if not campos and limite_seguranca is not None:
+            raise ValueError("Filtro vazio alcança todas as tarefas; use limite_seguranca=None para confirmar")
+
+        afetadas = 0
+        lidas = 0
+        erros = []
+        motor = obter_motor()
+        try:
+            with TarefaDAO._conexao(motor) as conn, motor.cursor(conn) as cursor:
+                if (filtro := TarefaDAO._parametros_filtros(filtros, campos, cursor)) is None:
+                    return 0, []
+                trigramas, parametros = filtro
+
+                if limite_seguranca is not None:
+                    cursor.execute(consultas.compilar_contagem(campos, trigramas),
+                                   [*parametros, limite_seguranca + 1])
+                    if cursor.fetchone()[0] > limite_seguranca:
+                        raise LimiteSegurancaExcedido(limite_seguranca)
+
+                query_ids = consultas.compilar_ids(campos, trigramas, motor.bloqueio_leitura)
+                ultimo_id = 0
+                numero = 0
+                while True:
+                    motor.iniciar_escrita(conn)
+                    cursor.execute(query_ids, [*parametros, ultimo_id, chunk_size])
+                    if not (ids := [linha[0] for linha in cursor.fetchall()]):
+                        conn.commit()
+                        break
+                    ultimo_id = ids[-1]
+                    try:
+                        afetadas_lote = aplicar(cursor, ids, motor)
+                        conn.commit()
+                    except motor.Erro as e:
+                        conn.rollback()
+                        _log_erro(f"Erro no banco de dados no lote {numero}", e, metodo)
+                        erros.append({"lote": numero, "inicio": lidas, "quantidade": len(ids), "erro": str(e)})
+                    else:
+                        afetadas += afetadas_lote
+                        TarefaDAO._invalidar_cache(*ids)
+                    lidas += len(ids)
+                    numero += 1
+            return afetadas, erros
+        except LimiteSegurancaExcedido:
+            raise
+        except motor.Erro as e:
+            erros.append({"lote": None, "inicio": lidas, "quantidade": None, "erro": str(e)})
+            return _tratar_erro("Erro no banco de dados ao alterar tarefas por filtro", e, metodo, (afetadas, erros))
+        except Exception as e:
+            erros.append({"lote": None, "inicio": lidas, "quantidade": None, "erro": str(e)})
+            return _tratar_erro("Erro inesperado ao alterar tarefas por filtro", e, metodo, (afetadas, erros))
+
+
+    @staticmethod
+    def _travar_ids(cursor, ids, motor) -> dict[int, tuple[str, int]]:
+        """
+        IDs informados que existem no banco, travados até o fim da transação.
+
+        Chame `motor.iniciar_escrita(conn)` antes, na mesma transação. Retorna {id: (status, nível de prioridade)}, a chave de cada tarefa
+        nos contadores antes da escrita (ver `dao.contadores`).
+        """
+        ids = list(ids)
+        marcadores = ", ".join(["%s"] * len(ids))
+        cursor.execute(f"SELECT id, status, prioridade FROM {TarefaDAO.tabela} "
+                       f"WHERE id IN ({marcadores}){motor.bloqueio_leitura}", ids)
+        return {tarefa_id: (status, nivel) for tarefa_id, status, nivel in cursor.fetchall()}
+
+
+    @staticmethod
+    def _excluir_ids(cursor, ids: list[int], motor) -> int:
+        """Exclui as tarefas, seus trigramas e suas contagens na transação corrente; retorna as linhas excluídas."""
+        anteriores = TarefaDAO._travar_ids(cursor, ids, motor)
+        marcadores = ", ".join(["%s"] * len(ids))
+        cursor.execute(f"DELETE FROM {TarefaDAO.tabela} WHERE id IN ({marcadores})", ids)
+        excluidas = cursor.rowcount
+        indice_titulo.remover(cursor, ids)
+        contadores.ajustar(cursor, motor.nome, saidas=anteriores.values())
+        return excluidas
+
+
+    @staticmethod
+    def _valores_atualizacao(valores: dict) -> tuple[tuple[str, ...], list]:
+        """Valida os novos valores de uma atualização por filtro e os converte para as colunas."""
+        if not valores:
+            raise ValueError(f"Informe ao menos um campo para atualizar: {consultas.CAMPOS_ATUALIZAVEIS}")
+        invalidos = [campo for campo in valores if campo not in consultas.CAMPOS_ATUALIZAVEIS]
+        if invalidos:
+            raise ValueError(f"Campo {invalidos[0]!r} não pode ser atualizado por filtro. "
+                             f"Use: {consultas.CAMPOS_ATUALIZAVEIS}")
+        campos = tuple(campo for campo in consultas.CAMPOS_ATUALIZAVEIS if campo in valores)
+        parametros = []
+        for campo in campos:
+            if campo == "status":
+                status = valores[campo].capitalize()
+                if status not in Tarefa.STATUS_VALIDOS:
+                    raise ValueError(f"Status invalido. Use: {Tarefa.STATUS_VALIDOS}")
+                parametros.append(status)
+            else:
+                parametros.append(TarefaDAO._valor_coluna(campo, valores[campo]))
+        return campos, parametros
+
+
+    @staticmethod
+    def _montar(linhas: list[tuple]) -> list[Tarefa]:
+        """Converte linhas do banco em Tarefa, medindo a fase 'montagem' quando as métricas estão ativas."""
+        if not metricas.ativo():
+            return [Tarefa.de_linha(linha) for linha in linhas]
+        inicio = perf_counter()
+        tarefas = [Tarefa.de_linha(linha) for linha in linhas]
+        metricas.observar_fase("montagem", perf_counter() - inicio)
+        return tarefas
+
+
+    @staticmethod
+    def _invalidar_cache(*ids) -> None:
+        """
+        Remove do cache (se ativo) as tarefas alteradas por uma escrita.
+
+        Dentro de uma transação, os IDs são removidos de novo após o commit
+        (ver `transacao`).
+        """
+        if TarefaDAO._cache:
+            TarefaDAO._cache.invalidar(*ids)
+            if (atual := transacao.atual()) is not None:
+                atual.alterados.update(ids)
+
+
+    @staticmethod
+    def _conexao(motor):
+        """
+        Gerenciador de contexto da conexão de uma operação do DAO.
+
+        Fora de uma transação, é uma conexão nova do motor. Dentro de
+        `transacao()`, é a conexão da transação, num savepoint próprio da
+        operação (ver dao/transacao.py).
+        """
+        atual = transacao.atual()
+        return atual.ponto() if atual is not None else motor.conexao()
+
+
+    @staticmethod
+    def _parametros_filtros(filtros: dict | None, campos: tuple[str, ...], cursor) -> tuple[int, list] | None:
+        """
+        Monta os parâmetros dos filtros na ordem da consulta compilada.
+
+        Retorna (quantidade de trigramas do índice de título, parâmetros), ou
+        None quando o índice já mostra que nenhuma tarefa tem o título buscado.
+        """
+        trigramas = 0
+        parametros = []
+        for campo in campos:
+            valor = filtros[campo]
+            if campo == "titulo":
+                selecionados = indice_titulo.selecionar(cursor, valor) if TarefaDAO.usar_indice_titulo else None
+                if selecionados == []:
+                    return None
+                if selecionados:
+                    trigramas = len(selecionados)
+                    parametros.extend(selecionados)
+                parametros.extend((consultas.padrao_titulo(valor), consultas.ESCAPE_LIKE))
+            else:
+                parametros.append(TarefaDAO._valor_coluna(campo, valor))
+        return trigramas, parametros
+
+
+    @staticmethod
+    def _valor_coluna(campo: str, valor):
+        """Converte um valor do modelo para o formato gravado na coluna (prioridade vira nível)."""
+        return Tarefa.nivel_prioridade(valor) if campo == "prioridade" else valor
+
+
+    @staticmethod
+    def _gerar_token(campo_ordem: str | None, direcao: str, valor, ultimo_id: int) -> str:
+        """Codifica a posição da última linha da página em um token opaco."""
+        if isinstance(valor, datetime):
+            valor = {"dt": valor.isoformat()}
+        dados = json.dumps([campo_ordem, direcao, valor, ultimo_id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(dados.encode("utf-8")).decode("ascii")
+
+
+    @staticmethod
+    def _ler_token(token: str, campo_ordem: str | None, direcao: str) -> tuple:
+        """Decodifica um token de paginação, validando se pertence à mesma ordenação."""
+        try:
+            campo, dir_token, valor, ultimo_id = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        except (ValueError, TypeError) as e:
+            raise ValueError("Token de paginação inválido") from e
+        if campo != campo_ordem or dir_token != direcao:
+            raise ValueError("O token de paginação pertence a outra ordenação")
+        if isinstance(valor, dict) and "dt" in valor:
+            valor = datetime.fromisoformat(valor["dt"])
+        return valor, ultimo_id
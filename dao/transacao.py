@@ -0,0 +1,111 @@
+# dao/transacao.py
+"""
+Unidade de trabalho do TarefaDAO: várias chamadas numa conexão e num commit.
+
+`TarefaDAO.transacao()` guarda a transação corrente numa ContextVar. Enquanto
+ela existir, cada método do DAO usa a conexão da transação em vez de pedir
+uma ao motor (ver `TarefaDAO._conexao`) e roda dentro de um savepoint próprio:
+- o `conn.commit()` do método só renova o savepoint; o commit de verdade é o
+  do fim do bloco;
+- o `conn.rollback()` do método volta ao savepoint, desfazendo só a etapa em
+  andamento (ex: o lote com erro de `inserir_lote`);
+- uma exceção que sai do método desfaz tudo o que ele gravou.
+
+Transações aninhadas viram savepoints da transação externa. A ContextVar é
+própria de cada thread, então outras threads continuam com suas conexões.
+"""
+import contextvars
+from contextlib import contextmanager
+
+_atual = contextvars.ContextVar("transacao_dao", default=None)
+
+
+def atual():
+    """Transação aberta no contexto corrente, ou None."""
+    return _atual.get()
+
+
+class Transacao:
+    """
+    Conexão compartilhada pelas chamadas do DAO dentro de `TarefaDAO.transacao()`.
+
+    É entregue aos métodos do DAO no lugar da conexão do motor: `commit` e
+    `rollback` agem sobre o savepoint da operação corrente, e o resto
+    (cursor(), in_transaction, ...) vai para a conexão real.
+
+    Atributos:
+    ----------
+    motor : Motor
+        Motor que abriu a conexão.
+    alterados : set[int]
+        IDs de tarefas escritas na transação, removidos do cache de novo
+        depois do commit.
+    """
+
+    def __init__(self, motor, conn):
+        self.motor = motor
+        self.alterados = set()
+        self._conn = conn
+        self._pontos = []
+        self._contador = 0
+
+    def __getattr__(self, nome):
+        return getattr(self._conn, nome)
+
+    def _executar(self, sql: str) -> None:
+        with self.motor.cursor(self._conn) as cursor:
+            cursor.execute(sql)
+
+    @contextmanager
+    def ponto(self):
+        """Savepoint desfeito se o bloco lançar exceção e liberado ao final."""
+        self._contador += 1
+        nome = f"dao_{self._contador}"
+        self._executar(f"SAVEPOINT {nome}")
+        self._pontos.append(nome)
+        try:
+            yield self
+        except BaseException:
+            self._executar(f"ROLLBACK TO SAVEPOINT {nome}")
+            raise
+        finally:
+            self._pontos.pop()
+            self._executar(f"RELEASE SAVEPOINT {nome}")
+
+    def commit(self) -> None:
+        """Mantém o que a operação gravou até aqui: o próximo rollback volta só até este ponto."""
+        nome = self._pontos[-1]
+        self._executar(f"RELEASE SAVEPOINT {nome}")
+        self._executar(f"SAVEPOINT {nome}")
+
+    def rollback(self) -> None:
+        """Desfaz o que a operação gravou desde o último `commit`."""
+        self._executar(f"ROLLBACK TO SAVEPOINT {self._pontos[-1]}")
+
+
+@contextmanager
+def abrir(motor):
+    """
+    Abre a transação (ou, se já houver uma, um savepoint dentro dela).
+
+    Confirma ao final do bloco mais externo; qualquer exceção desfaz o bloco
+    e é relançada.
+    """
+    externa = _atual.get()
+    if externa is not None:
+        with externa.ponto():
+            yield externa
+        return
+
+    with motor.conexao() as conn:
+        transacao = Transacao(motor, conn)
+        marca = _atual.set(transacao)
+        try:
+            motor.iniciar_escrita(conn)
+            yield transacao
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            _atual.reset(marca)
@@ -0,0 +1,212 @@
+# db/consultas_lentas.py
+"""
+Log de consultas lentas do DAO, com o plano de execução de cada forma de consulta.
+
+Quando ativo, todo statement emitido pelo DAO é cronometrado (execução mais
+leitura das linhas, ver `db.motores.CursorMedido`). Os que passam do limite
+vão para logs/consultas_lentas.log, uma linha JSON por consulta:
+
+    {"tipo": "consulta", "instante": ..., "metodo": "filtrar_tarefas",
+     "duracao_ms": 152.3, "linhas": 40, "sql": "SELECT ...", "parametros": [...]}
+
+Na primeira vez que uma forma de consulta (o SQL normalizado) aparece, uma
+thread de fundo roda o EXPLAIN com os parâmetros reais e grava uma linha
+{"tipo": "plano", ...}. Nem a gravação nem o EXPLAIN acontecem na thread
+que fez a consulta: se as filas estiverem cheias, o registro é descartado.
+
+Configuração: SLOW_QUERY_MS (limite em ms; vazio desliga) e
+SLOW_QUERY_PARAMETROS ('redigidos', o padrão, 'completos' ou 'omitidos').
+"""
+import json
+import os
+import queue
+import re
+import threading
+from datetime import datetime
+
+from utils import metricas
+from utils.logger import LOG_DIR, EscritorLog
+
+SLOW_QUERY_MS = os.getenv("SLOW_QUERY_MS", "")
+SLOW_QUERY_PARAMETROS = os.getenv("SLOW_QUERY_PARAMETROS", "redigidos")
+LOG_CONSULTAS_LENTAS = "consultas_lentas.log"
+
+MODOS_PARAMETROS = ("redigidos", "completos", "omitidos")
+# Parâmetros gravados por consulta; o resto vira um contador
+MAX_PARAMETROS = 20
+# Formas aguardando EXPLAIN
+FILA_PLANOS = 100
+# Comandos para os quais o EXPLAIN faz sentido
+COMANDOS_EXPLICAVEIS = ("SELECT", "UPDATE", "DELETE")
+
+_ESPACOS = re.compile(r"\s+")
+_GRUPOS_REPETIDOS = re.compile(r"(\([^()]*\))(?:, \1)+")
+_LISTA_MARCADORES = re.compile(r"%s(?:, %s)+")
+
+_limite = None
+_modo_parametros = SLOW_QUERY_PARAMETROS
+_escritor = None
+_explicador = None
+_lock = threading.Lock()
+
+
+def normalizar(sql: str) -> str:
+    """
+    Forma da consulta: espaços colapsados e listas de marcadores de tamanho
+    variável (IN (...), VALUES (...), (...)) reduzidas a uma só.
+    """
+    sql = _ESPACOS.sub(" ", sql).strip()
+    sql = _GRUPOS_REPETIDOS.sub(r"\1, ...", sql)
+    return _LISTA_MARCADORES.sub("%s, ...", sql)
+
+
+def ativar(limite_ms: float = 100.0, parametros: str = SLOW_QUERY_PARAMETROS, caminho: str | None = None) -> None:
+    """
+    Liga o log de consultas lentas.
+
+    Parâmetros:
+    -----------
+    limite_ms : float
+        Duração a partir da qual a consulta é registrada (0 registra todas).
+    parametros : str
+        'redigidos' grava só o tipo de cada parâmetro, 'completos' grava os
+        valores e 'omitidos' não grava nada.
+    caminho : str | None
+        Arquivo do log (padrão: logs/consultas_lentas.log).
+    """
+    global _limite, _modo_parametros, _escritor, _explicador
+    if parametros not in MODOS_PARAMETROS:
+        raise ValueError(f"Modo de parâmetros inválido. Use: {MODOS_PARAMETROS}")
+    with _lock:
+        caminho = caminho or os.path.join(LOG_DIR, LOG_CONSULTAS_LENTAS)
+        if _escritor is None or _escritor.caminho != caminho:
+            if _escritor is not None:
+                _escritor.fechar()
+            _escritor = EscritorLog(caminho, politica="descartar", formatador=_formatar)
+            _escritor.iniciar()
+        if _explicador is None:
+            _explicador = _Explicador()
+        _modo_parametros = parametros
+        _limite = limite_ms / 1000
+    metricas.marcar_metodos(True)
+
+
+def desativar() -> None:
+    """Desliga o log. O que já estava na fila ainda é gravado."""
+    global _limite
+    _limite = None
+    metricas.marcar_metodos(False)
+
+
+def ativo() -> bool:
+    return _limite is not None
+
+
+def registrar(sql: str, parametros, segundos: float, linhas: int) -> None:
+    """Registra a consulta se ela passou do limite. Chamado por `CursorMedido`."""
+    limite = _limite
+    if limite is None or segundos < limite:
+        return
+    forma = normalizar(sql)
+    parametros = list(parametros or ())
+    lote = bool(parametros) and isinstance(parametros[0], (list, tuple))
+    _escritor.registrar({
+        "tipo": "consulta",
+        "metodo": metricas.metodo_atual(),
+        "duracao_ms": round(segundos * 1000, 3),
+        "linhas": linhas,
+        "sql": forma,
+        "parametros": {"linhas_do_lote": len(parametros)} if lote else _parametros_log(parametros),
+    })
+    if not lote and forma.split(" ", 1)[0].upper() in COMANDOS_EXPLICAVEIS:
+        _explicador.pedir(forma, sql, parametros)
+
+
+def descarregar(timeout: float | None = 2.0) -> bool:
+    """Espera os EXPLAIN pendentes e a gravação do log (útil em testes e ao encerrar)."""
+    if _explicador is None:
+        return True
+    return _explicador.descarregar(timeout) and _escritor.descarregar(timeout)
+
+
+def estatisticas() -> dict:
+    """Contadores do log (gravadas, descartadas...) e quantas formas já têm plano."""
+    if _escritor is None:
+        return {}
+    return {**_escritor.estatisticas(), "formas_explicadas": len(_explicador.formas)}
+
+
+def _parametros_log(parametros: list):
+    if _modo_parametros == "omitidos":
+        return None
+    excedentes = len(parametros) - MAX_PARAMETROS
+    parametros = parametros[:MAX_PARAMETROS]
+    if _modo_parametros == "redigidos":
+        parametros = [type(valor).__name__ for valor in parametros]
+    if excedentes > 0:
+        parametros.append(f"... (+{excedentes})")
+    return parametros
+
+
+def _formatar(instante: float, registro, excecao=None, origem=None) -> str:
+    if isinstance(registro, str):
+        registro = {"tipo": "aviso", "mensagem": registro}
+    registro = {"instante": datetime.fromtimestamp(instante).isoformat(timespec="milliseconds"), **registro}
+    return json.dumps(registro, ensure_ascii=False, default=str)
+
+
+class _Explicador:
+    """Thread que roda o EXPLAIN de cada forma de consulta uma única vez."""
+
+    def __init__(self):
+        self.formas: set[str] = set()
+        self._fila = queue.Queue(FILA_PLANOS)
+        self._lock = threading.Lock()
+        threading.Thread(target=self._executar, name="explicador-consultas", daemon=True).start()
+
+    def pedir(self, forma: str, sql: str, parametros) -> None:
+        with self._lock:
+            if forma in self.formas:
+                return
+            self.formas.add(forma)
+        try:
+            self._fila.put_nowait((forma, sql, parametros))
+        except queue.Full:
+            # Fica para a próxima vez que a forma for lenta
+            with self._lock:
+                self.formas.discard(forma)
+
+    def descarregar(self, timeout: float | None) -> bool:
+        pronto = threading.Event()
+        try:
+            self._fila.put(pronto, timeout=timeout)
+        except queue.Full:
+            return False
+        return pronto.wait(timeout)
+
+    def _executar(self) -> None:
+        from db import schema
+        from db.motores import MotorMedido, obter_motor
+
+        while True:
+            item = self._fila.get()
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            forma, sql, parametros = item
+            # O motor sem instrumentação, para o EXPLAIN não ser medido nem registrado
+            motor = obter_motor()
+            if isinstance(motor, MotorMedido):
+                motor = motor.motor
+            registro = {"tipo": "plano", "sql": forma}
+            try:
+                with motor.conexao() as conn, motor.cursor(conn) as cursor:
+                    varredura, ordenacao, plano = schema.analisar_plano(cursor, motor.nome, sql, parametros)
+                registro.update(plano=plano, varredura_completa=varredura, ordenacao_em_memoria=ordenacao)
+            except Exception as e:
+                registro["erro"] = f"{type(e).__name__} - {e}"
+            _escritor.registrar(registro)
+
+
+if SLOW_QUERY_MS:
+    ativar(float(SLOW_QUERY_MS))
@@ -1,4 +1,6 @@
-from fileinput import close
+import threading
+import time
+from collections import deque
 
 from dotenv import load_dotenv
 import os
@@ -13,15 +15,215 @@ DB_CONFIG = {
     "database": os.getenv("DB_DATABASE")
 }
 
+# Configuração do pool de conexões
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_PING_APOS = float(os.getenv("DB_POOL_PING_APOS", "0.5"))
+
+
+class PoolConexoes:
+    """
+    Pool limitado e thread-safe de conexões MySQL.
+
+    Parâmetros:
+    -----------
+    tamanho : int
+        Número máximo de conexões abertas ao mesmo tempo.
+    timeout : float
+        Tempo máximo (segundos) de espera por uma conexão livre.
+    ping_apos : float
+        Conexões ociosas há mais tempo que isso são validadas com ping
+        (e reconectadas se necessário) antes de serem entregues.
+    fabrica : callable | None
+        Função que cria uma nova conexão. Padrão: mysql.connector.connect(**DB_CONFIG).
+
+    Observações:
+    ------------
+    - As conexões ociosas são reutilizadas em ordem LIFO, mantendo "quentes"
+      as mais recentes.
+    - Ao devolver, transações abertas sofrem rollback; conexões que falham
+      no rollback são descartadas.
+    """
+
+    def __init__(self, tamanho: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT,
+                 ping_apos: float = DB_POOL_PING_APOS, fabrica=None):
+        if tamanho < 1:
+            raise ValueError("O tamanho do pool deve ser pelo menos 1")
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self.ping_apos = ping_apos
+        self._fabrica = fabrica or (lambda: mysql.connector.connect(**DB_CONFIG))
+        self._cond = threading.Condition()
+        self._ociosas = deque()  # pares (conexão, momento da devolução)
+        self._criadas = 0
+        self._em_uso = 0
+
+        # Estatísticas
+        self._checkouts = 0
+        self._esperas = 0
+        self._espera_total = 0.0
+        self._espera_max = 0.0
+        self._descartadas = 0
+
+
+    def obter(self):
+        """
+        Retira uma conexão saudável do pool, criando uma nova se houver vaga.
+
+        Lança mysql.connector.errors.PoolError se nenhuma conexão ficar livre
+        dentro do timeout.
+        """
+        inicio = time.perf_counter()
+        limite = inicio + self.timeout
+        conn = devolvida_em = None
+        with self._cond:
+            while True:
+                if self._ociosas:
+                    conn, devolvida_em = self._ociosas.pop()
+                    break
+                if self._criadas < self.tamanho:
+                    self._criadas += 1
+                    break
+                restante = limite - time.perf_counter()
+                if restante <= 0 or not self._cond.wait(restante):
+                    if not self._ociosas and self._criadas >= self.tamanho:
+                        raise mysql.connector.errors.PoolError(
+                            f"Pool esgotado: nenhuma conexão livre em {self.timeout}s")
+            self._em_uso += 1
+            espera = time.perf_counter() - inicio
+            self._checkouts += 1
+            self._espera_total += espera
+            self._espera_max = max(self._espera_max, espera)
+            if espera > 0.001:
+                self._esperas += 1
+
+        # Conexão/validação fora do lock para não serializar o handshake
+        try:
+            if conn is None:
+                conn = self._fabrica()
+            elif time.monotonic() - devolvida_em >= self.ping_apos:
+                conn = self._validar(conn)
+            return conn
+        except Exception:
+            with self._cond:
+                self._criadas -= 1
+                self._em_uso -= 1
+                self._cond.notify()
+            raise
+
+
+    def _validar(self, conn):
+        """Garante que a conexão ainda responde; caso contrário abre outra."""
+        try:
+            conn.ping(reconnect=True, attempts=1, delay=0)
+            return conn
+        except mysql.connector.Error:
+            self._fechar(conn)
+            with self._cond:
+                self._descartadas += 1
+            return self._fabrica()
+
+
+    def devolver(self, conn, erro: bool = False) -> None:
+        """
+        Devolve a conexão ao pool.
+
+        Se houve erro (ou ficou alguma transação aberta) é feito rollback antes
+        da conexão voltar a ficar disponível.
+        """
+        descartar = False
+        try:
+            if erro or getattr(conn, "in_transaction", False):
+                conn.rollback()
+        except Exception:
+            descartar = True
+
+        with self._cond:
+            self._em_uso -= 1
+            if descartar:
+                self._criadas -= 1
+                self._descartadas += 1
+            else:
+                self._ociosas.append((conn, time.monotonic()))
+            self._cond.notify()
+        if descartar:
+            self._fechar(conn)
+
+
+    def fechar(self) -> None:
+        """Fecha todas as conexões ociosas do pool."""
+        with self._cond:
+            ociosas = list(self._ociosas)
+            self._ociosas.clear()
+            self._criadas -= len(ociosas)
+        for conn, _ in ociosas:
+            self._fechar(conn)
+
+
+    @staticmethod
+    def _fechar(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna um retrato das estatísticas do pool.
+
+        Retorna:
+        --------
+        dict
+            Chaves: tamanho, criadas, em_uso, ociosas, checkouts, esperas,
+            tempo_espera_total, tempo_espera_medio, tempo_espera_max e descartadas
+            (tempos em segundos).
+        """
+        with self._cond:
+            return {
+                "tamanho": self.tamanho,
+                "criadas": self._criadas,
+                "em_uso": self._em_uso,
+                "ociosas": len(self._ociosas),
+                "checkouts": self._checkouts,
+                "esperas": self._esperas,
+                "tempo_espera_total": self._espera_total,
+                "tempo_espera_medio": self._espera_total / self._checkouts if self._checkouts else 0.0,
+                "tempo_espera_max": self._espera_max,
+                "descartadas": self._descartadas,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def obter_pool() -> PoolConexoes:
+    """Retorna o pool global, criando-o na primeira chamada."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PoolConexoes()
+    return _pool
+
+
+def estatisticas_pool() -> dict:
+    """Atalho para as estatísticas do pool global."""
+    return obter_pool().estatisticas()
+
+
 class DataCon:
-    def __init__(self):
+    def __init__(self, pool: PoolConexoes | None = None):
         self.conn = None
+        self.pool = pool
 
 
     def __enter__(self):
-        """Abre a conexão automaticamente ao entrar no bloco with."""
+        """Obtém uma conexão do pool automaticamente ao entrar no bloco with."""
         try:
-            self.conn = mysql.connector.connect(**DB_CONFIG)
+            self.pool = self.pool or obter_pool()
+            self.conn = self.pool.obter()
             return self.conn
         except mysql.connector.Error as e:
             print(f"Erro ao conectar com ao banco: {e}")
@@ -29,8 +231,7 @@ class DataCon:
 
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Fecha automaticamente ao sair do bloco with."""
-        if exc_type:
-            self.conn.rollback()
+        """Devolve a conexão ao pool ao sair do bloco with (com rollback em caso de erro)."""
         if self.conn:
-            self.conn.close()
\ No newline at end of file
+            self.pool.devolver(self.conn, erro=exc_type is not None)
+            self.conn = None
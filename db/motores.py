@@ -0,0 +1,422 @@
+# db/motores.py
+import os
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from time import perf_counter
+
+from dotenv import load_dotenv
+
+from db import consultas_lentas
+from utils import metricas
+
+load_dotenv()  # lê o arquivo .env
+
+# Motor de armazenamento usado pelo DAO: "mysql" (padrão) ou "sqlite"
+DB_ENGINE = os.getenv("DB_ENGINE", "mysql")
+
+# Statements preparados mantidos abertos por conexão MySQL (remoção LRU)
+DB_PREPARADOS_POR_CONEXAO = int(os.getenv("DB_PREPARADOS_POR_CONEXAO", "64"))
+
+
+class Motor(ABC):
+    """
+    Interface de um motor de armazenamento usado pelo TarefaDAO.
+
+    Atributos:
+    ----------
+    nome : str
+        Identificador do motor ('mysql', 'sqlite').
+    Erro : type[Exception]
+        Classe base das exceções de banco lançadas pelo motor.
+    bloqueio_leitura : str
+        Sufixo que trava as linhas lidas por um SELECT até o fim da transação
+        (' FOR UPDATE' no MySQL; vazio no SQLite, que já serializa as escritas
+        depois de `iniciar_escrita`).
+
+    Observações:
+    ------------
+    - Subclasses implementam `conexao`, `cursor` e `ids_inseridos`; os
+      demais têm implementação padrão.
+    - O SQL do DAO é escrito uma vez só, com marcadores `%s`; cada motor
+      entrega conexões e cursores que aceitam esse formato.
+    - `conexao()` devolve um gerenciador de contexto. Ao sair dele, qualquer
+      transação não confirmada sofre rollback.
+    - `cursor(conn, preparado=True)` pede que cada SQL seja preparado uma vez
+      por conexão e reexecutado só com novos parâmetros. Use com SQL de
+      texto fixo (ver dao/consultas.py), não com SQL montado por tamanho
+      de lote.
+    - `cursor(conn)` não guarda o resultado inteiro em memória: `fetchmany`
+      traz as linhas do banco aos poucos (usado em `TarefaDAO.exportar`).
+    """
+    nome = ""
+    Erro = Exception
+    bloqueio_leitura = ""
+
+    @abstractmethod
+    def conexao(self):
+        """Gerenciador de contexto que entrega uma conexão do motor."""
+
+    @abstractmethod
+    def cursor(self, conn, preparado: bool = False):
+        """Gerenciador de contexto que entrega um cursor de tuplas sobre `conn`."""
+
+    @abstractmethod
+    def ids_inseridos(self, cursor, quantidade: int) -> range:
+        """IDs gerados pelo último INSERT de múltiplas linhas executado em `cursor`."""
+
+    def ids_consecutivos(self, cursor) -> bool:
+        """
+        Se um INSERT de múltiplas linhas sempre recebe IDs consecutivos.
+
+        Quando não recebe, `ids_inseridos` não vale e o DAO relê os IDs do
+        lote com um SELECT (ver `TarefaDAO.inserir_lote`). Padrão: True.
+        """
+        return True
+
+    def iniciar_escrita(self, conn) -> None:
+        """
+        Abre em `conn` a transação de escrita antes de leituras que decidem a escrita.
+
+        Depois desta chamada, o que um SELECT com `bloqueio_leitura` lê não
+        muda até o commit. Padrão: nada a fazer.
+        """
+
+    def estatisticas(self) -> dict:
+        """Estatísticas das conexões do motor."""
+        return {}
+
+    def fechar(self) -> None:
+        """Libera as conexões mantidas pelo motor."""
+
+
+class CursorPreparado:
+    """
+    Cursor MySQL que executa cada SQL por um statement preparado no servidor.
+
+    Os cursores preparados ficam em `preparados` (um OrderedDict por conexão)
+    e são reaproveitados enquanto a conexão viver no pool; o servidor só
+    analisa o SQL na primeira execução.
+    """
+
+    def __init__(self, conn, preparados: OrderedDict):
+        self._conn = conn
+        self._preparados = preparados
+        self._atual = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _descartar_pendentes(self) -> None:
+        # O protocolo não aceita outro comando com linhas ainda não lidas
+        if self._atual is not None and self._conn.unread_result:
+            self._atual.fetchall()
+
+    def execute(self, sql: str, parametros=()):
+        self._descartar_pendentes()
+        if (item := self._preparados.get(sql)) is None:
+            # O conector só reaproveita o statement se receber o mesmo objeto
+            # str da execução anterior, então o SQL guardado é que é usado.
+            item = self._preparados[sql] = (self._conn.cursor(prepared=True), sql)
+            if len(self._preparados) > DB_PREPARADOS_POR_CONEXAO:
+                _, (antigo, _) = self._preparados.popitem(last=False)
+                antigo.close()
+        else:
+            self._preparados.move_to_end(sql)
+        self._atual, sql = item
+        self._atual.execute(sql, tuple(parametros))
+        return self
+
+    def fetchone(self):
+        return self._atual.fetchone()
+
+    def fetchmany(self, tamanho: int):
+        return self._atual.fetchmany(tamanho)
+
+    def fetchall(self):
+        return self._atual.fetchall()
+
+    def close(self):
+        # Os statements continuam abertos para as próximas execuções
+        self._descartar_pendentes()
+        self._atual = None
+
+    @property
+    def rowcount(self) -> int:
+        return self._atual.rowcount
+
+    @property
+    def lastrowid(self) -> int:
+        return self._atual.lastrowid
+
+    @property
+    def description(self):
+        return self._atual.description
+
+
+class MotorMySQL(Motor):
+    """
+    Motor MySQL: conexões do pool global via DataCon.
+
+    As migrações não são aplicadas sozinhas. Ao criar o motor, a versão do
+    schema é conferida e, se estiver atrasada, lança RuntimeError pedindo
+    `python -m db.schema migrar` (`conferir_schema=False` pula a checagem).
+    """
+    nome = "mysql"
+    bloqueio_leitura = " FOR UPDATE"
+
+    def __init__(self, pool=None, conferir_schema: bool = True):
+        import mysql.connector
+        from db.db import obter_pool
+
+        self.Erro = mysql.connector.Error
+        self.pool = pool or obter_pool()
+        self._incremento = None
+        self._modo_autoincremento = None
+        # (id da sessão, statements preparados) de cada conexão; somem junto com ela
+        self._preparados = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        if conferir_schema:
+            self._conferir_schema()
+
+    def _conferir_schema(self) -> None:
+        from db import schema
+
+        with self.conexao() as conn:
+            if conn is None:
+                # Sem conexão agora: o erro aparece na primeira operação do DAO
+                return
+            with self.cursor(conn) as cursor:
+                schema.conferir_versao(cursor, self.nome)
+            conn.commit()
+
+    def conexao(self):
+        from db.db import DataCon
+        return DataCon(self.pool)
+
+    def cursor(self, conn, preparado: bool = False):
+        if not preparado:
+            return conn.cursor()
+        with self._lock:
+            sessao, preparados = self._preparados.get(conn, (None, None))
+            if sessao != conn.connection_id:
+                # Conexão nova ou reconectada pelo ping do pool: os
+                # statements da sessão anterior não existem mais no servidor.
+                preparados = OrderedDict()
+                self._preparados[conn] = (conn.connection_id, preparados)
+        return CursorPreparado(conn, preparados)
+
+    def ids_inseridos(self, cursor, quantidade: int) -> range:
+        # Com innodb_autoinc_lock_mode 0 ou 1, o InnoDB reserva IDs
+        # consecutivos (de @@auto_increment_increment em
+        # @@auto_increment_increment) para um INSERT de várias linhas, e
+        # lastrowid é o primeiro deles. Com o modo 2 (padrão do MySQL 8) INSERTs
+        # concorrentes intercalam IDs: ver `ids_consecutivos`.
+        primeiro_id = cursor.lastrowid
+        self._ler_autoincremento(cursor)
+        return range(primeiro_id, primeiro_id + self._incremento * quantidade, self._incremento)
+
+    def ids_consecutivos(self, cursor) -> bool:
+        self._ler_autoincremento(cursor)
+        return self._modo_autoincremento <= 1
+
+    def _ler_autoincremento(self, cursor) -> None:
+        if self._incremento is None:
+            cursor.execute("SELECT @@auto_increment_increment, @@innodb_autoinc_lock_mode")
+            self._incremento, self._modo_autoincremento = cursor.fetchone()
+
+    def estatisticas(self) -> dict:
+        return self.pool.estatisticas()
+
+    def fechar(self) -> None:
+        self.pool.fechar()
+
+
+class CursorMedido:
+    """
+    Cursor instrumentado: mede as fases 'execucao' e 'leitura' (ver
+    utils.metricas) e passa cada statement, com a duração da execução somada
+    à da leitura das linhas, ao log de consultas lentas (db.consultas_lentas).
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        # [sql, parametros, segundos, linhas lidas] do statement corrente
+        self._consulta = None
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._encerrar_consulta()
+        return self._cursor.__exit__(exc_type, exc_val, exc_tb)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _executar(self, executar, sql: str, parametros):
+        self._encerrar_consulta()
+        inicio = perf_counter()
+        try:
+            executar(sql, parametros)
+        finally:
+            duracao = perf_counter() - inicio
+            if metricas.ativo():
+                metricas.observar_fase("execucao", duracao)
+            self._consulta = [sql, parametros, duracao, 0]
+        return self
+
+    def execute(self, sql: str, parametros=()):
+        return self._executar(self._cursor.execute, sql, parametros)
+
+    def executemany(self, sql: str, parametros):
+        return self._executar(self._cursor.executemany, sql, parametros)
+
+    def _ler(self, buscar, *args):
+        inicio = perf_counter()
+        linhas = buscar(*args)
+        duracao = perf_counter() - inicio
+        quantidade = len(linhas) if isinstance(linhas, list) else int(linhas is not None)
+        if metricas.ativo():
+            metricas.observar_fase("leitura", duracao)
+            metricas.contar_linhas(quantidade)
+        if self._consulta:
+            self._consulta[2] += duracao
+            self._consulta[3] += quantidade
+        return linhas
+
+    def _encerrar_consulta(self) -> None:
+        if self._consulta is None:
+            return
+        sql, parametros, duracao, linhas = self._consulta
+        self._consulta = None
+        if consultas_lentas.ativo():
+            if not linhas and self._cursor.description is None:
+                linhas = self._cursor.rowcount
+            consultas_lentas.registrar(sql, parametros, duracao, linhas)
+
+    def fetchone(self):
+        return self._ler(self._cursor.fetchone)
+
+    def fetchmany(self, tamanho: int):
+        return self._ler(self._cursor.fetchmany, tamanho)
+
+    def fetchall(self):
+        return self._ler(self._cursor.fetchall)
+
+    def close(self):
+        self._encerrar_consulta()
+        self._cursor.close()
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> int:
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+
+class MotorMedido(Motor):
+    """
+    Envolve outro motor medindo a fase 'conexao' (tempo para obter a conexão,
+    incluindo a espera no pool) e entregando cursores `CursorMedido`.
+
+    `obter_motor` devolve este invólucro enquanto utils.metricas ou o log de
+    consultas lentas estiverem ativos.
+    """
+
+    def __init__(self, motor: Motor):
+        self.motor = motor
+        self.nome = motor.nome
+        self.Erro = motor.Erro
+        self.bloqueio_leitura = motor.bloqueio_leitura
+
+    @contextmanager
+    def conexao(self):
+        inicio = perf_counter()
+        with self.motor.conexao() as conn:
+            metricas.observar_fase("conexao", perf_counter() - inicio)
+            yield conn
+
+    def cursor(self, conn, preparado: bool = False):
+        return CursorMedido(self.motor.cursor(conn, preparado))
+
+    def ids_inseridos(self, cursor, quantidade: int) -> range:
+        return self.motor.ids_inseridos(cursor, quantidade)
+
+    def ids_consecutivos(self, cursor) -> bool:
+        return self.motor.ids_consecutivos(cursor)
+
+    def iniciar_escrita(self, conn) -> None:
+        self.motor.iniciar_escrita(conn)
+
+    def estatisticas(self) -> dict:
+        return self.motor.estatisticas()
+
+    def fechar(self) -> None:
+        self.motor.fechar()
+
+
+_motor = None
+_motor_medido = None
+_motor_lock = threading.Lock()
+
+
+def criar_motor(nome: str, conferir_schema: bool = True) -> Motor:
+    """
+    Cria o motor de armazenamento pelo nome ('mysql' ou 'sqlite').
+
+    `conferir_schema=False` deixa criar o motor MySQL com o schema
+    desatualizado (usado por `python -m db.schema migrar`). O SQLite aplica
+    as migrações sozinho.
+    """
+    if nome == "mysql":
+        return MotorMySQL(conferir_schema=conferir_schema)
+    if nome == "sqlite":
+        from db.sqlite import MotorSQLite
+        return MotorSQLite()
+    raise ValueError(f"Motor de armazenamento desconhecido: {nome!r}. Use 'mysql' ou 'sqlite'")
+
+
+def obter_motor() -> Motor:
+    """
+    Retorna o motor configurado em DB_ENGINE, criando-o na primeira chamada.
+
+    Com utils.metricas ou db.consultas_lentas ativos, o motor vem envolvido
+    em `MotorMedido`.
+    """
+    global _motor, _motor_medido
+    if _motor is None:
+        with _motor_lock:
+            if _motor is None:
+                _motor = criar_motor(os.getenv("DB_ENGINE", DB_ENGINE))
+    if not (metricas.ativo() or consultas_lentas.ativo()):
+        return _motor
+    motor = _motor
+    if _motor_medido is None or _motor_medido.motor is not motor:
+        _motor_medido = MotorMedido(motor)
+    return _motor_medido
+
+
+def definir_motor(motor: Motor | None) -> None:
+    """
+    Substitui o motor global (None volta a usar DB_ENGINE na próxima chamada).
+
+    O motor anterior é fechado.
+    """
+    global _motor
+    with _motor_lock:
+        anterior, _motor = _motor, motor
+    if anterior is not None and anterior is not motor:
+        anterior.fechar()
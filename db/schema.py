@@ -0,0 +1,412 @@
+# db/schema.py
+"""
+Gerenciamento do schema do banco: migrações versionadas e checagem de índices.
+
+Uso:
+    python -m db.schema migrar      # aplica as migrações pendentes
+    python -m db.schema versao      # mostra a versão atual do schema
+    python -m db.schema verificar   # roda EXPLAIN nas consultas do DAO e aponta varreduras completas
+"""
+import argparse
+import os
+import sys
+from itertools import combinations
+
+TABELA_VERSAO = "schema_versao"
+
+DDL_VERSAO = {
+    "mysql": f"""
+        CREATE TABLE IF NOT EXISTS {TABELA_VERSAO} (
+            versao INT PRIMARY KEY,
+            descricao VARCHAR(255) NOT NULL,
+            aplicada_em DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+    "sqlite": f"""
+        CREATE TABLE IF NOT EXISTS {TABELA_VERSAO} (
+            versao INTEGER PRIMARY KEY,
+            descricao VARCHAR(255) NOT NULL,
+            aplicada_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+}
+
+TABELAS = {
+    "mysql": (
+        """
+        CREATE TABLE IF NOT EXISTS tarefas (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            titulo VARCHAR(255) NOT NULL,
+            descricao TEXT,
+            prioridade VARCHAR(10) NOT NULL DEFAULT 'Media',
+            status VARCHAR(20) NOT NULL DEFAULT 'Pendente',
+            data_criacao DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tarefas_trigramas (
+            trigrama CHAR(3) NOT NULL,
+            tarefa_id INT NOT NULL,
+            PRIMARY KEY (trigrama, tarefa_id),
+            KEY ix_trigramas_tarefa (tarefa_id)
+        ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_bin
+        """,
+    ),
+    "sqlite": (
+        """
+        CREATE TABLE IF NOT EXISTS tarefas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            titulo VARCHAR(255) NOT NULL COLLATE NOCASE,
+            descricao TEXT,
+            prioridade VARCHAR(10) NOT NULL DEFAULT 'Media'
+                CHECK (prioridade IN ('Baixa', 'Media', 'Alta')),
+            status VARCHAR(20) NOT NULL DEFAULT 'Pendente'
+                CHECK (status IN ('Pendente', 'Concluída')),
+            data_criacao TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS tarefas_trigramas (
+            trigrama CHAR(3) NOT NULL,
+            tarefa_id INTEGER NOT NULL,
+            PRIMARY KEY (trigrama, tarefa_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_trigramas_tarefa ON tarefas_trigramas (tarefa_id)",
+    ),
+}
+
+# Índices compostos das combinações de filtro (status, prioridade) e
+# ordenação (titulo, prioridade, status, data_criacao) que o DAO gera. O id no
+# final mantém a ordem da paginação por chave (campo_ordem, id). Ordenar por
+# status/prioridade sem filtro usa o prefixo de um desses índices e só
+# desempata o id em memória; cobrir também esses casos dobraria o custo de
+# escrita da tabela.
+INDICES = (
+    ("ix_tarefas_status_prioridade_data", "tarefas", ("status", "prioridade", "data_criacao", "id")),
+    ("ix_tarefas_status_titulo", "tarefas", ("status", "titulo", "id")),
+    ("ix_tarefas_status_data", "tarefas", ("status", "data_criacao", "id")),
+    ("ix_tarefas_prioridade_data", "tarefas", ("prioridade", "data_criacao", "id")),
+    ("ix_tarefas_prioridade_titulo", "tarefas", ("prioridade", "titulo", "id")),
+    ("ix_tarefas_titulo", "tarefas", ("titulo", "id")),
+    ("ix_tarefas_data", "tarefas", ("data_criacao", "id")),
+)
+
+
+def _criar_indice(cursor, motor_nome: str, nome: str, tabela: str, colunas: tuple) -> None:
+    """Cria o índice se ele ainda não existir."""
+    if motor_nome == "sqlite":
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {nome} ON {tabela} ({', '.join(colunas)})")
+        return
+    cursor.execute(
+        "SELECT COUNT(*) FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+        (tabela, nome)
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(f"CREATE INDEX {nome} ON {tabela} ({', '.join(colunas)})")
+
+
+def _migracao_1(cursor, motor_nome: str) -> None:
+    from dao import indice_titulo
+
+    for ddl in TABELAS[motor_nome]:
+        cursor.execute(ddl)
+    for nome, tabela, colunas in INDICES:
+        _criar_indice(cursor, motor_nome, nome, tabela, colunas)
+
+    # Bancos que já tinham tarefas: preenche o índice de trigramas
+    ultimo_id = 0
+    while True:
+        cursor.execute("SELECT id, titulo FROM tarefas WHERE id > %s ORDER BY id LIMIT 5000", (ultimo_id,))
+        if not (linhas := cursor.fetchall()):
+            break
+        indice_titulo.remover(cursor, [tarefa_id for tarefa_id, _ in linhas])
+        indice_titulo.indexar(cursor, linhas)
+        ultimo_id = linhas[-1][0]
+
+
+# Tabela tarefas com a prioridade gravada como nível (1=Baixa, 2=Media, 3=Alta)
+TAREFAS_SQLITE_V2 = """
+    CREATE TABLE tarefas_nova (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        titulo VARCHAR(255) NOT NULL COLLATE NOCASE,
+        descricao TEXT,
+        prioridade TINYINT NOT NULL DEFAULT 2 CHECK (prioridade IN (1, 2, 3)),
+        status VARCHAR(20) NOT NULL DEFAULT 'Pendente'
+            CHECK (status IN ('Pendente', 'Concluída')),
+        data_criacao TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+
+# Linhas já convertidas caem no ELSE e ficam como estão: rodar a migração de
+# novo (depois de uma falha no meio, por exemplo) não rebaixa ninguém para 2
+NIVEL_POR_NOME_SQL = (
+    "CASE prioridade WHEN 'Baixa' THEN 1 WHEN 'Media' THEN 2 WHEN 'Alta' THEN 3 "
+    "ELSE prioridade END"
+)
+
+
+def _migracao_2(cursor, motor_nome: str) -> None:
+    """Prioridade deixa de ser texto e vira nível numérico, ordenável pelo índice."""
+    if motor_nome == "mysql":
+        # Os nomes viram '1'/'2'/'3' e o MODIFY converte a coluna (e seus índices) para inteiro
+        cursor.execute(f"UPDATE tarefas SET prioridade = {NIVEL_POR_NOME_SQL}")
+        cursor.execute("ALTER TABLE tarefas MODIFY prioridade TINYINT UNSIGNED NOT NULL DEFAULT 2")
+        return
+
+    # SQLite não altera o tipo de uma coluna: recria a tabela, preservando
+    # IDs e a sequência do AUTOINCREMENT
+    cursor.execute("DROP TABLE IF EXISTS tarefas_nova")
+    cursor.execute(TAREFAS_SQLITE_V2)
+    cursor.execute(f"""
+        INSERT INTO tarefas_nova (id, titulo, descricao, prioridade, status, data_criacao)
+        SELECT id, titulo, descricao, {NIVEL_POR_NOME_SQL}, status, data_criacao FROM tarefas
+    """)
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tarefas'")
+    sequencia = (cursor.fetchone() or (0,))[0]
+    cursor.execute("DROP TABLE tarefas")
+    cursor.execute("ALTER TABLE tarefas_nova RENAME TO tarefas")
+    cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, %s) WHERE name = 'tarefas'", (sequencia,))
+    for nome, tabela, colunas in INDICES:
+        _criar_indice(cursor, motor_nome, nome, tabela, colunas)
+
+
+CONTADORES = {
+    "mysql": """
+        CREATE TABLE IF NOT EXISTS tarefas_contadores (
+            status VARCHAR(20) NOT NULL,
+            prioridade TINYINT UNSIGNED NOT NULL,
+            fatia TINYINT UNSIGNED NOT NULL,
+            quantidade BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (status, prioridade, fatia)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """,
+    "sqlite": """
+        CREATE TABLE IF NOT EXISTS tarefas_contadores (
+            status VARCHAR(20) NOT NULL,
+            prioridade TINYINT NOT NULL,
+            fatia TINYINT NOT NULL,
+            quantidade INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (status, prioridade, fatia)
+        ) WITHOUT ROWID
+        """,
+}
+
+
+def _migracao_3(cursor, motor_nome: str) -> None:
+    """Contadores por (status, prioridade), preenchidos com as tarefas existentes."""
+    from dao import contadores
+
+    cursor.execute(CONTADORES[motor_nome])
+    contadores.reconstruir(cursor)
+
+
+# (versão, descrição, função que recebe (cursor, motor_nome))
+MIGRACOES = (
+    (1, "Tabelas tarefas e tarefas_trigramas com índices compostos", _migracao_1),
+    (2, "Prioridade gravada como nível numérico", _migracao_2),
+    (3, "Tabela tarefas_contadores com totais por status e prioridade", _migracao_3),
+)
+
+
+def versao_atual(cursor, motor_nome: str) -> int:
+    """Retorna a versão do schema aplicada (0 para um banco vazio)."""
+    cursor.execute(DDL_VERSAO[motor_nome])
+    cursor.execute(f"SELECT MAX(versao) FROM {TABELA_VERSAO}")
+    return cursor.fetchone()[0] or 0
+
+
+def conferir_versao(cursor, motor_nome: str) -> None:
+    """
+    Lança RuntimeError se o banco não estiver na última migração.
+
+    Usado pelos motores que não migram sozinhos (MySQL): sem isso, um banco
+    antigo só apareceria como erros registrados no log a cada escrita.
+    """
+    versao = versao_atual(cursor, motor_nome)
+    ultima = MIGRACOES[-1][0]
+    if versao < ultima:
+        raise RuntimeError(f"Schema do banco na versão {versao}, mas o código precisa da versão {ultima}. "
+                           "Rode `python -m db.schema migrar` antes de usar o sistema.")
+
+
+def aplicar_migracoes(conn, cursor, motor_nome: str) -> list[int]:
+    """
+    Aplica, em ordem, as migrações ainda não registradas em schema_versao.
+
+    Parâmetros:
+    -----------
+    conn :
+        Conexão usada (cada migração é confirmada separadamente).
+    cursor :
+        Cursor de `conn` com marcadores `%s`.
+    motor_nome : str
+        'mysql' ou 'sqlite'.
+
+    Retorna:
+    --------
+    list[int]
+        Versões aplicadas nesta chamada.
+    """
+    atual = versao_atual(cursor, motor_nome)
+    conn.commit()
+    aplicadas = []
+    for versao, descricao, migracao in MIGRACOES:
+        if versao <= atual:
+            continue
+        migracao(cursor, motor_nome)
+        cursor.execute(f"INSERT INTO {TABELA_VERSAO} (versao, descricao) VALUES (%s, %s)", (versao, descricao))
+        conn.commit()
+        aplicadas.append(versao)
+    return aplicadas
+
+
+def migrar(motor=None) -> list[int]:
+    """Aplica as migrações pendentes no motor informado (padrão: o configurado)."""
+    from db.motores import obter_motor
+
+    motor = motor or obter_motor()
+    with motor.conexao() as conn, motor.cursor(conn) as cursor:
+        return aplicar_migracoes(conn, cursor, motor.nome)
+
+
+def formas_consulta():
+    """
+    Gera as formas de consulta de listagem/filtro que o DAO pode emitir.
+
+    Produz tuplas (filtros, campo_ordem, paginado), com filtros sendo uma
+    tupla de campos. `listar()` sem filtro nem ordenação fica de fora: ela lê
+    a tabela inteira por definição.
+    """
+    from dao import consultas
+
+    for quantidade in range(4):
+        for filtros in combinations(consultas.CAMPOS_FILTRO, quantidade):
+            for campo_ordem in (None, *consultas.CAMPOS_ORDENACAO):
+                for paginado in (False, True):
+                    if filtros or campo_ordem or paginado:
+                        yield filtros, campo_ordem, paginado
+
+
+def _consulta_exemplo(filtros: tuple, campo_ordem: str | None, paginado: bool) -> tuple[str, list]:
+    """Compila a consulta de uma forma (ver dao.consultas) com valores de exemplo."""
+    from dao import consultas
+
+    valores = {"prioridade": 3, "status": "Pendente"}
+    parametros = []
+    for campo in filtros:
+        if campo == "titulo":
+            parametros += ["exe", "xem", "emp", consultas.padrao_titulo("exemplo"), consultas.ESCAPE_LIKE]
+        else:
+            parametros.append(valores[campo])
+
+    # Paginado representa uma página depois da primeira, com o predicado de chave
+    query = consultas.compilar(filtros, campo_ordem, "ASC", trigramas=3 if "titulo" in filtros else 0,
+                               pagina=paginado, limitada=paginado)
+    if paginado:
+        if campo_ordem:
+            valor = valores.get(campo_ordem, "2024-01-01 00:00:00" if campo_ordem == "data_criacao" else "m")
+            parametros += [valor, valor]
+        parametros += [1000, 51]
+    return query, parametros
+
+
+def analisar_plano(cursor, motor_nome: str, query: str, parametros: list) -> tuple[bool, bool, str]:
+    """
+    Executa o EXPLAIN da consulta.
+
+    Retorna (varredura_completa, ordenacao_em_memoria, plano_resumido).
+    """
+    if motor_nome == "sqlite":
+        cursor.execute("EXPLAIN QUERY PLAN " + query, parametros)
+        detalhes = [linha[-1] for linha in cursor.fetchall()]
+        # SCAN sobre uma subconsulta (CO-ROUTINE/MATERIALIZE) não lê a tabela
+        subconsultas = {d.split()[1] for d in detalhes if d.startswith(("CO-ROUTINE ", "MATERIALIZE "))}
+        varredura = any(d.startswith("SCAN ") and " USING " not in d and d.split()[1] not in subconsultas
+                        for d in detalhes)
+        ordenacao = any("TEMP B-TREE" in d for d in detalhes)
+        return varredura, ordenacao, " | ".join(detalhes)
+
+    cursor.execute("EXPLAIN " + query, parametros)
+    colunas = [c[0].lower() for c in cursor.description]
+    linhas = [dict(zip(colunas, linha)) for linha in cursor.fetchall()]
+    varredura = any(l.get("type") == "ALL" for l in linhas)
+    ordenacao = any("filesort" in (l.get("extra") or "") for l in linhas)
+    plano = " | ".join(f"{l.get('table')}:{l.get('type')}:{l.get('key')}" for l in linhas)
+    return varredura, ordenacao, plano
+
+
+def verificar(motor=None) -> list[dict]:
+    """
+    Roda EXPLAIN em cada forma de consulta do DAO.
+
+    Retorna:
+    --------
+    list[dict]
+        Um item por forma com 'filtros', 'campo_ordem', 'paginado',
+        'varredura_completa', 'ordenacao_em_memoria' e 'plano'.
+
+    Observações:
+    ------------
+    - O otimizador decide com base nas estatísticas do banco; rode a
+      checagem num banco com volume de dados representativo.
+    """
+    from db.motores import obter_motor
+
+    motor = motor or obter_motor()
+    resultado = []
+    with motor.conexao() as conn, motor.cursor(conn) as cursor:
+        for filtros, campo_ordem, paginado in formas_consulta():
+            query, parametros = _consulta_exemplo(filtros, campo_ordem, paginado)
+            varredura, ordenacao, plano = analisar_plano(cursor, motor.nome, query, parametros)
+            resultado.append({
+                "filtros": filtros,
+                "campo_ordem": campo_ordem,
+                "paginado": paginado,
+                "varredura_completa": varredura,
+                "ordenacao_em_memoria": ordenacao,
+                "plano": plano,
+            })
+    return resultado
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m db.schema", description="Gerencia o schema do banco de tarefas.")
+    parser.add_argument("comando", choices=("migrar", "versao", "verificar"))
+    args = parser.parse_args(argv)
+
+    from db.motores import DB_ENGINE, criar_motor, obter_motor
+    if args.comando == "verificar":
+        motor = obter_motor()
+    else:
+        # migrar/versao precisam funcionar justamente com o schema desatualizado
+        motor = criar_motor(os.getenv("DB_ENGINE", DB_ENGINE), conferir_schema=False)
+
+    if args.comando == "migrar":
+        aplicadas = migrar(motor)
+        print(f"Migrações aplicadas: {aplicadas}" if aplicadas else "Schema já está atualizado.")
+        return 0
+
+    if args.comando == "versao":
+        with motor.conexao() as conn, motor.cursor(conn) as cursor:
+            print(f"Versão do schema: {versao_atual(cursor, motor.nome)} (última: {MIGRACOES[-1][0]})")
+        return 0
+
+    problemas = 0
+    for item in verificar(motor):
+        forma = f"filtros={'+'.join(item['filtros']) or '-'} ordem={item['campo_ordem'] or '-'}" \
+                f"{' paginado' if item['paginado'] else ''}"
+        if item["varredura_completa"]:
+            problemas += 1
+            print(f"[VARREDURA] {forma}\n    {item['plano']}")
+        elif item["ordenacao_em_memoria"]:
+            print(f"[ORDENAÇÃO] {forma}\n    {item['plano']}")
+        else:
+            print(f"[OK]        {forma}")
+    print(f"\n{problemas} forma(s) de consulta com varredura completa da tabela.")
+    return 1 if problemas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# db/sqlite.py
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+from db import schema
+from db.motores import Motor
+
+DB_SQLITE_PATH = os.getenv("DB_SQLITE_PATH", "tarefas.db")
+
+# Pragmas aplicados a cada conexão: WAL permite leitores concorrentes com um
+# escritor, e synchronous=NORMAL é seguro em WAL (só o último commit pode se
+# perder numa queda de energia).
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",       # 64 MiB
+    "PRAGMA mmap_size = 268435456",     # 256 MiB
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA foreign_keys = ON",
+)
+
+# Datas gravadas em ISO 8601 e lidas de volta como datetime nas colunas TIMESTAMP
+sqlite3.register_adapter(datetime, lambda valor: valor.isoformat(" "))
+sqlite3.register_converter("TIMESTAMP", lambda valor: datetime.fromisoformat(valor.decode()))
+
+
+@lru_cache(maxsize=512)
+def _converter_marcadores(sql: str) -> str:
+    """Troca os marcadores `%s` do DAO pelos `?` do sqlite3."""
+    return sql.replace("%s", "?")
+
+
+class CursorSQLite:
+    """Cursor sqlite3 com suporte a `with` e a marcadores `%s`."""
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._cursor = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._cursor.close()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, sql: str, parametros=()):
+        self._cursor.execute(_converter_marcadores(sql), parametros)
+        return self
+
+    def executemany(self, sql: str, parametros):
+        self._cursor.executemany(_converter_marcadores(sql), parametros)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, tamanho: int):
+        return self._cursor.fetchmany(tamanho)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> int:
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+
+class _Ociosas(list):
+    """Conexões ociosas de uma thread (uma lista que aceita weakref.finalize)."""
+
+
+def _fechar_da_thread(criadas: list, todas: set, lock: threading.Lock) -> None:
+    """Fecha as conexões abertas por uma thread que terminou."""
+    with lock:
+        for conn in criadas:
+            todas.discard(conn)
+    for conn in criadas:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+class MotorSQLite(Motor):
+    """
+    Motor SQLite embutido, sem servidor e sem ida e volta pela rede.
+
+    Parâmetros:
+    -----------
+    caminho : str
+        Arquivo do banco (padrão: DB_SQLITE_PATH). As migrações pendentes
+        (db/schema.py) são aplicadas na primeira conexão.
+
+    Observações:
+    ------------
+    - Usa WAL e os pragmas de PRAGMAS.
+    - Cada thread reaproveita as próprias conexões ociosas; uma conexão
+      nunca é compartilhada entre threads ao mesmo tempo.
+    - As conexões de uma thread são fechadas quando ela termina (o
+      threading.local dela é descartado), então threads de vida curta não
+      deixam arquivos abertos.
+    """
+    nome = "sqlite"
+    Erro = sqlite3.Error
+
+    def __init__(self, caminho: str = DB_SQLITE_PATH):
+        self.caminho = caminho
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._todas = set()
+        self._schema_criado = False
+
+    def _conectar(self, criadas: list) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.caminho, detect_types=sqlite3.PARSE_DECLTYPES,
+                               check_same_thread=False, cached_statements=256)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        criadas.append(conn)
+        with self._lock:
+            self._todas.add(conn)
+            if not self._schema_criado:
+                with self.cursor(conn) as cursor:
+                    schema.aplicar_migracoes(conn, cursor, self.nome)
+                self._schema_criado = True
+        return conn
+
+    @contextmanager
+    def conexao(self):
+        ociosas = getattr(self._local, "ociosas", None)
+        if ociosas is None:
+            ociosas = self._local.ociosas = _Ociosas()
+            self._local.criadas = []
+            weakref.finalize(ociosas, _fechar_da_thread, self._local.criadas, self._todas, self._lock)
+        conn = ociosas.pop() if ociosas else self._conectar(self._local.criadas)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            ociosas.append(conn)
+
+    def cursor(self, conn, preparado: bool = False):
+        # O sqlite3 já guarda os statements compilados por conexão
+        # (cached_statements), então todo cursor reaproveita o SQL repetido.
+        return CursorSQLite(conn.cursor())
+
+    def ids_inseridos(self, cursor, quantidade: int) -> range:
+        # Num INSERT de várias linhas, lastrowid é o ID da última linha e os
+        # anteriores são consecutivos.
+        ultimo_id = cursor.lastrowid
+        return range(ultimo_id - quantidade + 1, ultimo_id + 1)
+
+    def iniciar_escrita(self, conn) -> None:
+        # O sqlite3 só abre a transação no primeiro INSERT/UPDATE/DELETE; um
+        # SELECT anterior leria linhas que outra conexão ainda pode alterar.
+        # BEGIN IMMEDIATE pega a trava de escrita do banco já na leitura.
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {"conexoes": len(self._todas)}
+
+    def fechar(self) -> None:
+        with self._lock:
+            todas, self._todas = list(self._todas), set()
+        for conn in todas:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
@@ -1,13 +1,26 @@
-from ui.menu import exibir_menu
+import sys
 
-def main():
-    """Função principal: inicia o gerenciador de tarefas."""
+
+def main(argv=None):
+    """
+    Função principal: sem argumentos, inicia o menu interativo; com
+    argumentos, executa um comando da linha de comando (ver ui/cli.py).
+
+    Os módulos de interface e de banco só são importados aqui dentro, para
+    que a linha de comando não pague o custo do menu e do DAO sem precisar.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        from ui import cli
+        return cli.main(argv)
+
+    from ui.menu import exibir_menu
     try:
         exibir_menu()
     except Exception as e:
         print(f"Ocorreu um erro inesperado {e}")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
-
+    sys.exit(main())
@@ -6,6 +6,14 @@ class Tarefa:
     PRIORIDADE_VALIDAS = ["Baixa", "Media", "Alta"]
     STATUS_VALIDOS = ["Pendente", "Concluída"]
 
+    # Nível gravado no banco para cada prioridade (1=Baixa ... 3=Alta), para
+    # que ordenar pela coluna siga a urgência e não a ordem alfabética
+    NIVEL_PRIORIDADE = {nome: nivel for nivel, nome in enumerate(PRIORIDADE_VALIDAS, start=1)}
+    PRIORIDADE_POR_NIVEL = dict(enumerate(PRIORIDADE_VALIDAS, start=1))
+
+    # Atributos fixos: sem __dict__ por instância, menos memória e acesso mais rápido
+    __slots__ = ("id", "titulo", "descricao", "prioridade", "status", "data_criacao")
+
     def __init__(self, titulo: str, descricao: str,
                  prioridade: str = "Media", status: str = "Pendente",
                  data_criacao: datetime = None,  id: int = None):
@@ -29,6 +37,43 @@ class Tarefa:
         self.data_criacao = data_criacao or datetime.now()
 
 
+    @classmethod
+    def de_linha(cls, linha: tuple) -> "Tarefa":
+        """
+        Cria uma Tarefa a partir de uma linha vinda do banco, sem revalidar.
+
+        Parâmetros:
+        -----------
+        linha : tuple
+            Valores na ordem (id, titulo, descricao, prioridade, status, data_criacao),
+            a mesma de TarefaDAO.atributos, com a prioridade no nível gravado no banco.
+
+        Observações:
+        ------------
+        - Construtor "confiável": pula a normalização e a validação do __init__,
+          pois os dados já foram validados ao serem gravados. Use apenas com
+          linhas do próprio banco.
+        """
+        tarefa = object.__new__(cls)
+        (tarefa.id, tarefa.titulo, tarefa.descricao,
+         nivel, tarefa.status, tarefa.data_criacao) = linha
+        tarefa.prioridade = Tarefa.PRIORIDADE_POR_NIVEL[nivel]
+        return tarefa
+
+
+    @staticmethod
+    def nivel_prioridade(prioridade: str) -> int:
+        """
+        Converte o nome da prioridade no nível gravado no banco.
+
+        Lança ValueError se a prioridade não for válida.
+        """
+        try:
+            return Tarefa.NIVEL_PRIORIDADE[prioridade.capitalize()]
+        except KeyError:
+            raise ValueError(f"Prioridade invalida. Use: {Tarefa.PRIORIDADE_VALIDAS}") from None
+
+
     def __repr__(self):
         return (f"Tarefa(id={self.id}, titulo='{self.titulo}', "
                 f"status='{self.status}', prioridade='{self.prioridade}', "
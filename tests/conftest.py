@@ -0,0 +1,8 @@
+# tests/conftest.py
+import os
+import tempfile
+
+# Sem DB_ENGINE definido no ambiente, os testes rodam no SQLite embutido,
+# num arquivo temporário. Para testar contra o MySQL: DB_ENGINE=mysql pytest
+os.environ.setdefault("DB_ENGINE", "sqlite")
+os.environ.setdefault("DB_SQLITE_PATH", os.path.join(tempfile.mkdtemp(), "tarefas_teste.db"))
@@ -0,0 +1,51 @@
+# tests/test_benchmarks.py
+import io
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks import carga, suite
+from benchmarks.dados import gerar_tarefas
+from utils import metricas
+
+
+def test_gerador_e_deterministico():
+    """Verifica se a mesma semente gera as mesmas tarefas (e outra semente, outras)."""
+    def chaves(semente):
+        return [(t.titulo, t.descricao, t.prioridade, t.status, t.data_criacao)
+                for t in gerar_tarefas(200, semente)]
+
+    assert chaves(7) == chaves(7)
+    assert chaves(7) != chaves(8)
+
+
+def test_comparar_aponta_regressao_acima_da_tolerancia():
+    """Verifica se só o cenário mais lento que a tolerância (e acima do ruído) vira regressão."""
+    def relatorio(**tempos):
+        return {"resultados": [{"tamanho": 10, "cenario": nome, "min_ms_por_op": ms} for nome, ms in tempos.items()]}
+
+    base = relatorio(listar=10.0, filtrar=10.0, buscar=0.001, inserir=1.0)
+    novo = relatorio(listar=12.0, filtrar=7.0, buscar=0.002, inserir=1.1)
+    situacoes = {item["cenario"]: item["situacao"] for item in suite.comparar(base, novo, tolerancia=0.15)}
+
+    assert situacoes == {"listar": "regressao", "filtrar": "melhora", "buscar": "igual", "inserir": "igual"}
+
+
+def test_mix_de_carga_rejeita_operacao_ou_peso_invalido():
+    """Verifica se o mix só aceita operações conhecidas com pesos numéricos não negativos."""
+    assert carga.ler_mix("buscar_por_id=3, inserir=1") == {"buscar_por_id": 3.0, "inserir": 1.0}
+    for mix in ("buscar=1", "inserir=muito", "inserir=-1", "inserir=0"):
+        with pytest.raises(ValueError):
+            carga.ler_mix(mix)
+
+
+def test_carga_curta_reporta_intervalos_e_operacoes():
+    """Verifica se um teste de carga curto, em threads, soma as operações dos intervalos e termina sem erros."""
+    config = SimpleNamespace(threads=2, processos=1, duracao=0.4, intervalo=0.2, mix=carga.ler_mix(carga.MIX_PADRAO),
+                             popular=50, cache=False, semente=1)
+    relatorio = carga.executar(config, saida=io.StringIO())
+
+    assert len(relatorio["intervalos"]) == 2
+    assert relatorio["operacoes"] == sum(item["operacoes"] for item in relatorio["intervalos"]) > 0
+    assert relatorio["erros"] == {}
+    assert not metricas.ativo()
@@ -0,0 +1,44 @@
+# tests/test_cache.py
+from dao.cache import CacheLRU
+
+
+class RelogioFalso:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+
+def test_cache_remove_menos_usado_recentemente():
+    """Verifica se, ao estourar o tamanho, a entrada menos usada é removida."""
+    cache = CacheLRU(tamanho_max=2)
+    cache.guardar(1, "a")
+    cache.guardar(2, "b")
+    cache.obter(1)
+    cache.guardar(3, "c")
+
+    assert cache.obter(2) is None, "A chave menos usada deveria ter sido removida"
+    assert cache.obter(1) == "a" and cache.obter(3) == "c"
+    assert cache.estatisticas()["remocoes"] == 1
+
+
+def test_cache_expira_apos_ttl():
+    """Verifica se entradas expiram depois do TTL."""
+    relogio = RelogioFalso()
+    cache = CacheLRU(ttl=10, relogio=relogio)
+    cache.guardar(1, "a")
+    relogio.agora = 11
+
+    assert cache.obter(1) is None
+    assert cache.estatisticas()["expiradas"] == 1
+
+
+def test_cache_descarta_valor_lido_antes_de_invalidacao():
+    """Verifica se um valor lido antes de uma invalidação concorrente não é gravado."""
+    cache = CacheLRU()
+    marca = cache.marca()
+    cache.invalidar(1)
+    cache.guardar(1, "antigo", marca)
+
+    assert cache.obter(1) is None
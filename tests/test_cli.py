@@ -0,0 +1,54 @@
+# tests/test_cli.py
+import json
+import sqlite3
+
+import pytest
+
+from benchmarks import bench_inicializacao
+from ui import cli
+
+
+def executar(capsys, *argv):
+    """Roda um comando e devolve (código de saída, linhas JSON da saída)."""
+    codigo = cli.main(list(argv))
+    return codigo, [json.loads(linha) for linha in capsys.readouterr().out.splitlines()]
+
+
+def test_comandos_escrevem_json_e_codigos_de_saida(capsys):
+    """Verifica add/get/update/filter/delete, a saída em JSON e os códigos de saída."""
+    codigo, [criada] = executar(capsys, "add", "--titulo", "CLI pytest", "--prioridade", "alta")
+    assert codigo == 0
+    try:
+        assert executar(capsys, "get", str(criada["id"]))[1][0]["prioridade"] == "Alta"
+        codigo, [tarefa] = executar(capsys, "update", str(criada["id"]), "--status", "concluída")
+        assert (codigo, tarefa["status"], tarefa["titulo"]) == (0, "Concluída", "CLI pytest")
+        codigo, linhas = executar(capsys, "filter", "--titulo", "CLI pytest", "--status", "Concluída")
+        assert [linha["id"] for linha in linhas] == [criada["id"]]
+    finally:
+        assert executar(capsys, "delete", str(criada["id"])) == (0, [{"excluidas": 1}])
+
+    assert executar(capsys, "get", str(criada["id"]))[0] == 1
+    with pytest.raises(SystemExit) as saida:
+        cli.main(["filter"])
+    assert saida.value.code == 2
+
+
+@pytest.mark.parametrize("erro", [sqlite3.OperationalError("unable to open database file"),
+                                  RuntimeError("Banco na versão 2; rode: python -m db.schema migrar")])
+def test_erro_de_banco_vai_para_stderr_com_codigo_1(capsys, monkeypatch, erro):
+    """Verifica se erros de banco e de schema viram uma mensagem em stderr e código 1, sem traceback."""
+    from dao.tarefa_dao import TarefaDAO
+
+    def falhar(*args, **kwargs):
+        raise erro
+
+    monkeypatch.setattr(TarefaDAO, "buscar_por_id", falhar)
+    assert cli.main(["get", "1"]) == 1
+    assert capsys.readouterr().err == f"erro: {erro}\n"
+
+
+def test_inicializacao_dentro_do_orcamento():
+    """Verifica se importar a linha de comando não carrega o DAO nem o banco e cabe no orçamento."""
+    medicao = bench_inicializacao.medir_importacao(repeticoes=3)
+    assert medicao["pesados"] == []
+    assert medicao["min_ms"] <= bench_inicializacao.ORCAMENTO_MS, medicao
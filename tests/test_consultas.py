@@ -0,0 +1,32 @@
+# tests/test_consultas.py
+import pytest
+
+from dao import consultas
+from dao.tarefa_dao import TarefaDAO
+
+
+def test_mesma_forma_reaproveita_o_sql_compilado():
+    """Verifica se filtros em qualquer ordem caem na mesma consulta compilada (mesmo objeto)."""
+    a = consultas.compilar(consultas.campos_filtro({"status": "Pendente", "titulo": "x"}), "titulo", "DESC")
+    b = consultas.compilar(consultas.campos_filtro({"titulo": "y", "status": "Feito"}), "titulo", "DESC")
+
+    assert a is b
+    assert a.endswith("WHERE titulo LIKE %s ESCAPE %s AND status = %s ORDER BY titulo DESC")
+
+
+@pytest.mark.parametrize("campo_ordem, direcao", [
+    ("titulo; DROP TABLE tarefas", "ASC"),
+    ("titulo", "ASC; DROP TABLE tarefas"),
+])
+def test_ordenacao_fora_da_lista_e_rejeitada(campo_ordem, direcao):
+    """Verifica se campo/direção de ordenação não permitidos nunca chegam ao SQL."""
+    with pytest.raises(ValueError):
+        TarefaDAO.listar(campo_ordem, direcao)
+    with pytest.raises(ValueError):
+        TarefaDAO.filtrar_tarefas({"status": "Pendente"}, campo_ordem, direcao)
+
+
+def test_filtro_por_campo_desconhecido_e_rejeitado():
+    """Verifica se só campos de CAMPOS_FILTRO podem ser filtrados."""
+    with pytest.raises(ValueError):
+        TarefaDAO.filtrar_tarefas({"descricao = descricao OR 1": 1})
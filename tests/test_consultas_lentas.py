@@ -0,0 +1,33 @@
+# tests/test_consultas_lentas.py
+import json
+
+from dao.tarefa_dao import TarefaDAO
+from db import consultas_lentas
+
+
+def test_normalizar_reduz_listas_de_marcadores():
+    """Verifica se IN e VALUES de tamanhos diferentes caem na mesma forma de consulta."""
+    a = consultas_lentas.normalizar("SELECT id FROM tarefas\n   WHERE id IN (%s, %s, %s)")
+    b = consultas_lentas.normalizar("SELECT id FROM tarefas WHERE id IN (%s)")
+    assert a == "SELECT id FROM tarefas WHERE id IN (%s, ...)"
+    assert b == "SELECT id FROM tarefas WHERE id IN (%s)"
+    assert (consultas_lentas.normalizar("INSERT INTO t VALUES (%s, %s), (%s, %s)")
+            == "INSERT INTO t VALUES (%s, ...), ...")
+
+
+def test_consulta_lenta_registrada_com_plano_uma_vez(tmp_path):
+    """Verifica se consultas acima do limite vão para o log, com parâmetros redigidos e um único EXPLAIN por forma."""
+    caminho = tmp_path / "consultas_lentas.log"
+    consultas_lentas.ativar(limite_ms=0, caminho=str(caminho))
+    try:
+        TarefaDAO.filtrar_tarefas({"status": "Pendente"}, "titulo", "ASC")
+        TarefaDAO.filtrar_tarefas({"status": "Concluída"}, "titulo", "ASC")
+        assert consultas_lentas.descarregar()
+    finally:
+        consultas_lentas.desativar()
+
+    registros = [json.loads(linha) for linha in caminho.read_text(encoding="utf-8").splitlines()]
+    consultas = [r for r in registros if r["tipo"] == "consulta" and r["metodo"] == "filtrar_tarefas"]
+    planos = [r for r in registros if r["tipo"] == "plano" and r["sql"] == consultas[0]["sql"]]
+    assert len(consultas) == 2 and consultas[0]["parametros"] == ["str"]
+    assert len(planos) == 1 and "plano" in planos[0]
@@ -1,9 +1,16 @@
 # tests/test_dao.py
+import csv
+import gzip
+import json
+
 import pytest
-from dao.tarefa_dao import TarefaDAO
+from dao import exportacao
+from dao.tarefa_dao import LimiteSegurancaExcedido, TarefaDAO
+from db.motores import obter_motor
 from models.tarefa import Tarefa
 from datetime import datetime
 
+
 # ----------------- FIXTURE -----------------
 @pytest.fixture()
 def tarefa_temp():
@@ -23,6 +30,7 @@ def tarefa_temp():
     # Teardown: remove a tarefa do banco após o teste
     TarefaDAO.excluir(tarefa_id)
 
+
 # ----------------- TESTES PRINCIPAIS -----------------
 def test_inserir_e_buscar_por_id(tarefa_temp):
     """Verifica se uma tarefa é inserida e pode ser buscada corretamente."""
@@ -77,6 +85,267 @@ def test_listar_tarefas(tarefa_temp):
     assert isinstance(tarefas, list), "O método não retornou uma lista de objetos"
     assert tarefa_id in ids, "A tarefa criada não foi listada corretamente"
 
+
+@pytest.mark.parametrize("consecutivos", [True, False])
+def test_inserir_lote_retorna_ids_em_ordem(monkeypatch, consecutivos):
+    """Verifica se o insert em lote gera um ID por tarefa, na ordem da entrada (também relendo os IDs)."""
+    motor = obter_motor()
+    monkeypatch.setattr(motor, "ids_consecutivos", lambda cursor: consecutivos)
+    tarefas = (Tarefa(titulo=f"Lote {i}", descricao="Teste lote") for i in range(5))
+    ids, erros = TarefaDAO.inserir_lote(tarefas, chunk_size=2)
+    try:
+        assert not erros, f"Lotes com erro: {erros}"
+        assert len(ids) == 5, "Deveria haver um ID para cada tarefa"
+        for i, tarefa_id in enumerate(ids):
+            assert TarefaDAO.buscar_por_id(tarefa_id).titulo == f"Lote {i}"
+    finally:
+        for tarefa_id in ids:
+            if tarefa_id:
+                TarefaDAO.excluir(tarefa_id)
+
+
+def test_filtrar_paginado_percorre_todas_as_paginas():
+    """Verifica se a paginação por token retorna todas as tarefas, sem repetir, na ordem pedida."""
+    titulos = [f"Paginacao pytest {letra}" for letra in "edcba"]
+    ids, _ = TarefaDAO.inserir_lote(Tarefa(titulo=t, descricao="") for t in titulos)
+    try:
+        encontrados = []
+        token = None
+        while True:
+            pagina, token = TarefaDAO.filtrar_paginado({"titulo": "Paginacao pytest"}, "titulo", "DESC",
+                                                       limite=2, token=token)
+            encontrados.extend(t.titulo for t in pagina)
+            if token is None:
+                break
+        assert encontrados == sorted(titulos, reverse=True)
+    finally:
+        for tarefa_id in ids:
+            TarefaDAO.excluir(tarefa_id)
+
+
+def test_cache_buscar_por_id_invalida_apos_atualizar(tarefa_temp):
+    """Verifica se o cache atende leituras repetidas e não fica desatualizado após atualizar."""
+    TarefaDAO.ativar_cache()
+    try:
+        TarefaDAO.buscar_por_id(tarefa_temp)
+        TarefaDAO.buscar_por_id(tarefa_temp)
+        assert TarefaDAO.estatisticas_cache()["acertos"] == 1
+
+        TarefaDAO.atualizar(Tarefa(id=tarefa_temp, titulo="Cache atualizado", descricao=""))
+        assert TarefaDAO.buscar_por_id(tarefa_temp).titulo == "Cache atualizado"
+    finally:
+        TarefaDAO.desativar_cache()
+
+
+def test_buscar_por_ids_retorna_encontradas_e_faltantes(tarefa_temp):
+    """Verifica se a busca em lote separa as tarefas encontradas dos IDs inexistentes."""
+    encontradas, faltantes = TarefaDAO.buscar_por_ids([tarefa_temp, 9999, tarefa_temp])
+
+    assert list(encontradas) == [tarefa_temp]
+    assert encontradas[tarefa_temp].titulo == "Teste pytest"
+    assert faltantes == [9999]
+
+
+def test_filtrar_por_titulo_usa_indice_atualizado(tarefa_temp):
+    """Verifica se a busca por trecho do título acompanha inserções e atualizações."""
+    def titulos(valor):
+        return [t.id for t in TarefaDAO.filtrar_tarefas({"titulo": valor})]
+
+    assert tarefa_temp in titulos("PYTEST"), "Busca deveria ignorar maiúsculas/minúsculas"
+    assert tarefa_temp in titulos("py"), "Busca curta deveria continuar funcionando"
+
+    TarefaDAO.atualizar(Tarefa(id=tarefa_temp, titulo="Relatorio trimestral", descricao=""))
+    assert tarefa_temp not in titulos("pytest")
+    assert tarefa_temp in titulos("trimestral")
+
+
+def test_filtrar_por_titulo_trata_curingas_como_texto():
+    """Verifica se % e _ no título buscado valem literalmente, com e sem o índice de trigramas."""
+    ids, _ = TarefaDAO.inserir_lote(Tarefa(titulo=t, descricao="") for t in ("abc curinga", "a_c curinga",
+                                                                              "100% curinga", "1000 curinga"))
+    try:
+        def titulos(valor):
+            return sorted(t.titulo for t in TarefaDAO.filtrar_tarefas({"titulo": valor}))
+
+        assert titulos("a_c") == ["a_c curinga"]
+        assert titulos("a%c") == []
+        assert titulos("_c") == ["a_c curinga"]
+        assert titulos("0%") == ["100% curinga"]
+        assert titulos("% curinga") == ["100% curinga"]
+    finally:
+        TarefaDAO.excluir_lote(ids)
+
+
+def test_ordenar_por_prioridade_segue_urgencia():
+    """Verifica se a ordenação por prioridade segue Baixa < Media < Alta, e não a ordem alfabética."""
+    prioridades = ["Media", "Alta", "Baixa"]
+    ids, _ = TarefaDAO.inserir_lote(Tarefa(titulo="Prioridade pytest", descricao="", prioridade=p)
+                                    for p in prioridades)
+    try:
+        tarefas = TarefaDAO.filtrar_tarefas({"titulo": "Prioridade pytest"}, "prioridade", "DESC")
+        assert [t.prioridade for t in tarefas] == ["Alta", "Media", "Baixa"]
+    finally:
+        for tarefa_id in ids:
+            TarefaDAO.excluir(tarefa_id)
+
+
+def test_atualizar_por_filtro_e_excluir_lote():
+    """Verifica a transição de status por filtro, em vários lotes, e a exclusão em lote."""
+    ids, _ = TarefaDAO.inserir_lote(Tarefa(titulo="Massa pytest", descricao="", prioridade=p)
+                                    for p in ["Alta", "Alta", "Alta", "Baixa"])
+    try:
+        afetadas, erros = TarefaDAO.atualizar_por_filtro({"titulo": "Massa pytest", "prioridade": "Alta"},
+                                                         {"status": "concluída"}, chunk_size=2)
+        assert (afetadas, erros) == (3, [])
+        concluidas = TarefaDAO.filtrar_tarefas({"titulo": "Massa pytest", "status": "Concluída"})
+        assert sorted(t.id for t in concluidas) == ids[:3]
+    finally:
+        excluidas, erros = TarefaDAO.excluir_lote(ids, chunk_size=3)
+    assert (excluidas, erros) == (4, [])
+    assert TarefaDAO.filtrar_tarefas({"titulo": "Massa pytest"}) == []
+
+
+def test_atualizar_lote_reindexa_titulos(tarefa_temp):
+    """Verifica se o update em lote grava os novos títulos e atualiza o índice de trigramas."""
+    tarefa = TarefaDAO.buscar_por_id(tarefa_temp)
+    tarefa.titulo = "Renomeada em lote pytest"
+    afetadas, erros = TarefaDAO.atualizar_lote([tarefa, Tarefa(id=999999, titulo="x", descricao="")])
+
+    assert (afetadas, erros) == (1, [])
+    assert [t.id for t in TarefaDAO.filtrar_tarefas({"titulo": "Renomeada em lote"})] == [tarefa_temp]
+
+
+def test_exportar_csv_gzip_e_jsonl_com_filtro(tmp_path):
+    """Verifica se a exportação em fluxo grava as mesmas tarefas, na mesma ordem, que filtrar_tarefas."""
+    ids, _ = TarefaDAO.inserir_lote(Tarefa(titulo=f"Exportar pytest {i}", descricao="a, \"b\"\nc",
+                                           prioridade="Alta" if i % 2 else "Baixa") for i in range(5))
+    try:
+        filtros = {"titulo": "Exportar pytest", "prioridade": "Alta"}
+        esperadas = TarefaDAO.filtrar_tarefas(filtros, "titulo", "DESC")
+
+        linhas, _ = exportacao.exportar_arquivo(str(tmp_path / "t.csv.gz"), filtros=filtros, campo_ordem="titulo",
+                                                direcao="DESC", tamanho_lote=1)
+        with gzip.open(tmp_path / "t.csv.gz", "rt", encoding="utf-8", newline="") as arquivo:
+            registros = list(csv.DictReader(arquivo))
+        assert linhas == len(registros) == len(esperadas) == 2
+        assert [(int(r["id"]), r["prioridade"], r["descricao"]) for r in registros] == \
+               [(t.id, "Alta", t.descricao) for t in esperadas]
+
+        exportacao.exportar_arquivo(str(tmp_path / "t.jsonl"), filtros=filtros, campo_ordem="titulo", direcao="DESC")
+        with open(tmp_path / "t.jsonl", encoding="utf-8") as arquivo:
+            assert [json.loads(linha)["titulo"] for linha in arquivo] == [t.titulo for t in esperadas]
+    finally:
+        TarefaDAO.excluir_lote(ids)
+
+
+def test_contagens_agrupadas_no_banco():
+    """Verifica as contagens por status/prioridade (com filtro) e por dia de criação."""
+    dados = [("Alta", "Pendente", datetime(2023, 5, 1, 9)), ("Alta", "Pendente", datetime(2023, 5, 1, 23, 59)),
+             ("Baixa", "Concluída", datetime(2023, 5, 3, 0, 0))]
+    ids, _ = TarefaDAO.inserir_lote(Tarefa(titulo="Contagem pytest", descricao="", prioridade=p, status=s,
+                                           data_criacao=d) for p, s, d in dados)
+    try:
+        filtros = {"titulo": "Contagem pytest"}
+        assert TarefaDAO.contar_por("status", filtros=filtros) == {"Pendente": 2, "Concluída": 1}
+        por_par = TarefaDAO.contar_por("prioridade", "status", filtros=filtros)
+        assert por_par[("Pendente", "Alta")] == 2 and por_par[("Pendente", "Media")] == 0
+        assert sum(por_par.values()) == 3
+
+        por_dia = TarefaDAO.contar_por_dia(datetime(2023, 4, 30), datetime(2023, 5, 3))
+        assert list(por_dia.values()) == [0, 2, 0, 1]
+        with pytest.raises(ValueError):
+            TarefaDAO.contar_por("titulo")
+    finally:
+        TarefaDAO.excluir_lote(ids)
+
+
+def test_contadores_acompanham_todas_as_escritas():
+    """Verifica se os contadores conferem com o GROUP BY após cada caminho de escrita e se a reconstrução repara divergências."""
+    def conferir():
+        assert TarefaDAO.verificar_contadores() == {}
+        TarefaDAO.usar_contadores = False
+        try:
+            real = TarefaDAO.contar_por("status", "prioridade")
+        finally:
+            TarefaDAO.usar_contadores = True
+        assert TarefaDAO.contar_por("status", "prioridade") == real
+
+    ids, _ = TarefaDAO.inserir_lote(Tarefa(titulo=f"Contador pytest {i}", descricao="", prioridade="Baixa")
+                                    for i in range(4))
+    ids.append(TarefaDAO.inserir(Tarefa(titulo="Contador pytest 4", descricao="", prioridade="Alta")))
+    try:
+        conferir()
+        tarefa = TarefaDAO.buscar_por_id(ids[0])
+        tarefa.status = "Concluída"
+        assert TarefaDAO.atualizar(tarefa)
+        TarefaDAO.atualizar_lote([Tarefa(id=ids[1], titulo="Contador pytest 1", descricao="", prioridade="Media")])
+        TarefaDAO.atualizar_por_filtro({"titulo": "Contador pytest", "prioridade": "Baixa"}, {"prioridade": "Alta"})
+        conferir()
+        assert TarefaDAO.excluir(ids[2])
+        TarefaDAO.excluir_por_filtro({"titulo": "Contador pytest 3"})
+        conferir()
+
+        from dao import contadores
+        from db.motores import obter_motor
+        motor = obter_motor()
+        with motor.conexao() as conn, motor.cursor(conn) as cursor:
+            contadores.ajustar(cursor, motor.nome, [("Pendente", 3)] * 5)
+            # Par sem linha: o primeiro ajuste cria a fatia e o segundo soma nela
+            contadores.ajustar(cursor, motor.nome, [("Arquivada", 1)])
+            contadores.ajustar(cursor, motor.nome, [("Arquivada", 1)])
+            conn.commit()
+        diferencas = TarefaDAO.verificar_contadores()
+        assert sorted(diferencas) == [("Arquivada", 1), ("Pendente", 3)]
+        assert diferencas[("Arquivada", 1)] == (2, 0)
+        assert TarefaDAO.reconstruir_contadores() is not None
+        conferir()
+    finally:
+        TarefaDAO.excluir_lote(ids)
+    conferir()
+
+
+def test_transacao_usa_uma_conexao_e_desfaz_tudo_em_erro(monkeypatch):
+    """Verifica se a transação usa uma só conexão, desfaz tudo numa exceção e aninha com savepoints."""
+    from db.motores import obter_motor
+    motor = obter_motor()
+    conexoes = []
+    conexao_original = motor.conexao
+    monkeypatch.setattr(motor, "conexao", lambda: conexoes.append(1) or conexao_original())
+
+    def titulos():
+        return sorted(t.titulo for t in TarefaDAO.filtrar_tarefas({"titulo": "Transacao pytest"}))
+
+    with pytest.raises(RuntimeError):
+        with TarefaDAO.transacao():
+            TarefaDAO.inserir(Tarefa(titulo="Transacao pytest descartada", descricao=""))
+            assert titulos() == ["Transacao pytest descartada"]
+            raise RuntimeError("desfaz")
+    assert titulos() == []
+
+    conexoes.clear()
+    with TarefaDAO.transacao():
+        mantida = TarefaDAO.inserir(Tarefa(titulo="Transacao pytest A", descricao=""))
+        TarefaDAO.inserir_lote([Tarefa(titulo="Transacao pytest B", descricao="")])
+        tarefa = TarefaDAO.buscar_por_id(mantida)
+        tarefa.status = "Concluída"
+        assert TarefaDAO.atualizar(tarefa)
+        try:
+            with TarefaDAO.transacao():
+                TarefaDAO.excluir(mantida)
+                invalida = Tarefa(titulo="x", descricao="")
+                invalida.titulo = None
+                TarefaDAO.inserir(invalida)
+        except obter_motor().Erro:
+            pass
+    assert len(conexoes) == 1
+    try:
+        assert titulos() == ["Transacao pytest A", "Transacao pytest B"]
+        assert TarefaDAO.buscar_por_id(mantida).status == "Concluída"
+        assert TarefaDAO.verificar_contadores() == {}
+    finally:
+        TarefaDAO.excluir_por_filtro({"titulo": "Transacao pytest"})
+
+
 # ----------------- TESTES DE BORDA -----------------
 def test_excluir_tarefa_inexistente():
     """Verifica se excluir uma tarefa inexistente retorna False."""
@@ -98,6 +367,29 @@ def test_atualizar_tarefa_inexistente():
     assert resultado is False, "Esperava False ao atualizar tarefa inexistente"
 
 
+def test_atualizar_lote_com_tarefa_sem_id_segue_nos_lotes_seguintes(tarefa_temp):
+    """Verifica se o lote com uma tarefa sem ID vai para o relatório e os outros lotes são gravados."""
+    tarefa = TarefaDAO.buscar_por_id(tarefa_temp)
+    tarefa.titulo = "Depois do lote sem id"
+    sem_id = Tarefa(titulo="sem id", descricao="")
+    afetadas, erros = TarefaDAO.atualizar_lote([sem_id, tarefa], chunk_size=1)
+
+    assert afetadas == 1
+    assert [(erro["lote"], erro["inicio"], erro["quantidade"]) for erro in erros] == [(0, 0, 1)]
+    assert TarefaDAO.buscar_por_id(tarefa_temp).titulo == "Depois do lote sem id"
+
+
+def test_operacoes_por_filtro_respeitam_limite_de_seguranca(tarefa_temp):
+    """Verifica se o filtro que passa do limite não altera nada e se o filtro vazio exige confirmação."""
+    with pytest.raises(LimiteSegurancaExcedido) as excedido:
+        TarefaDAO.excluir_por_filtro({"status": "Pendente"}, limite_seguranca=0)
+
+    assert excedido.value.limite == 0
+    assert TarefaDAO.buscar_por_id(tarefa_temp) is not None
+    with pytest.raises(ValueError):
+        TarefaDAO.excluir_por_filtro({})
+
+
 def test_listar_tarefas_vazias(monkeypatch):
     """Verifica se listar quando não há tarefas retorna lista vazia."""
     # Monkeypatch para simular um banco vazio
@@ -0,0 +1,103 @@
+# tests/test_escrita_adiada.py
+import os
+import subprocess
+import sys
+import time
+
+from dao.escrita_adiada import EscritaAdiada
+from dao.tarefa_dao import TarefaDAO
+from models.tarefa import Tarefa
+from utils import metricas
+
+
+def test_aglutina_atualizacoes_e_atribui_ids():
+    """Verifica se atualizações do mesmo ID viram uma escrita e se a descarga grava e devolve os IDs."""
+    escrita = EscritaAdiada(lote_max=50, intervalo=60)
+    tarefas = [Tarefa(f"Adiada pytest {i}", "") for i in range(3)]
+    try:
+        for tarefa in tarefas:
+            escrita.inserir(tarefa)
+        tarefas[0].prioridade = "Alta"
+        escrita.atualizar(tarefas[0])    # ainda não inserida: substitui a inserção
+        assert escrita.pendentes() == 3
+        assert escrita.descarregar()
+        assert all(tarefa.id for tarefa in tarefas)
+        assert TarefaDAO.buscar_por_id(tarefas[0].id).prioridade == "Alta"
+
+        for status in ("Concluída", "Pendente", "Concluída"):
+            tarefas[1].status = status
+            escrita.atualizar(tarefas[1])
+        assert escrita.pendentes() == 1
+        escrita.fechar()
+        assert TarefaDAO.buscar_por_id(tarefas[1].id).status == "Concluída"
+
+        estatisticas = escrita.estatisticas()
+        assert (estatisticas["descargas"], estatisticas["gravadas"], estatisticas["aglutinadas"]) == (2, 4, 3)
+        assert estatisticas["latencia"]["contagem"] == 2
+    finally:
+        TarefaDAO.excluir_lote([tarefa.id for tarefa in tarefas if tarefa.id])
+
+
+def test_thread_descarrega_por_tamanho_e_repete_falhas_em_ordem(monkeypatch):
+    """Verifica a descarga pela thread, o medidor de pendentes e se uma escrita com erro não sobrescreve uma mais nova."""
+    tarefa = Tarefa("Adiada pytest ordem", "")
+    tarefa.id = TarefaDAO.inserir(tarefa)
+    extra = Tarefa("Adiada pytest extra", "")
+    escrita = EscritaAdiada(lote_max=2, intervalo=60, nome="escrita_pytest")
+    escrita.iniciar()
+    try:
+        assert "tarefas_dao_escrita_pytest_pendentes 0" in metricas.exportar_prometheus()
+
+        #Primeira descarga falha; enquanto isso chega uma atualização mais nova
+        original = TarefaDAO.atualizar_lote
+
+        def falhar_uma_vez(tarefas, chunk_size=1000):
+            monkeypatch.setattr(TarefaDAO, "atualizar_lote", original)
+            tarefa.titulo = "Adiada pytest nova"
+            escrita.atualizar(tarefa)
+            raise RuntimeError("falha simulada")
+
+        monkeypatch.setattr(TarefaDAO, "atualizar_lote", falhar_uma_vez)
+        tarefa.titulo = "Adiada pytest antiga"
+        escrita.atualizar(tarefa)
+        escrita.inserir(extra)   # 2 pendentes: dispara a thread
+
+        limite = time.monotonic() + 5
+        while escrita.estatisticas()["falhas"] == 0 and time.monotonic() < limite:
+            time.sleep(0.01)
+        escrita.fechar()
+        assert escrita.estatisticas()["falhas"] == 2
+        assert TarefaDAO.buscar_por_id(tarefa.id).titulo == "Adiada pytest nova"
+        assert extra.id and TarefaDAO.buscar_por_id(extra.id)
+    finally:
+        escrita.fechar()
+        TarefaDAO.excluir_lote([tarefa.id] + ([extra.id] if extra.id else []))
+
+
+def test_fechar_conta_escritas_que_nao_foram_gravadas(monkeypatch):
+    """Verifica se as escritas que nem a descarga final consegue gravar são contadas e não somem em silêncio."""
+    def falhar(tarefas, chunk_size=1000):
+        raise RuntimeError("falha simulada")
+
+    monkeypatch.setattr(TarefaDAO, "atualizar_lote", falhar)
+    escrita = EscritaAdiada(lote_max=10, intervalo=60)
+    escrita.atualizar(Tarefa("Adiada pytest perdida", "", id=999999))
+    assert [tarefa.titulo for tarefa in escrita.fechar()] == ["Adiada pytest perdida"]
+
+    estatisticas = escrita.estatisticas()
+    assert (estatisticas["pendentes"], estatisticas["falhas"], estatisticas["descartadas"]) == (0, 1, 1)
+    assert escrita.fechar() == []
+
+
+def test_saida_do_programa_grava_a_fila_sem_iniciar():
+    """Verifica se o atexit grava as escritas pendentes mesmo sem a thread de descarga."""
+    codigo = ("from dao.escrita_adiada import EscritaAdiada; from models.tarefa import Tarefa; "
+              "EscritaAdiada(intervalo=60).inserir(Tarefa('Adiada pytest atexit', ''))")
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", codigo], cwd=raiz, check=True)
+
+    gravadas = TarefaDAO.filtrar_tarefas({"titulo": "Adiada pytest atexit"})
+    try:
+        assert len(gravadas) == 1
+    finally:
+        TarefaDAO.excluir_lote(tarefa.id for tarefa in gravadas)
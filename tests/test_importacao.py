@@ -0,0 +1,87 @@
+# tests/test_importacao.py
+import csv
+import json
+import os
+
+import pytest
+
+from dao import importacao
+from dao.tarefa_dao import TarefaDAO
+
+COLUNAS = ("titulo", "descricao", "prioridade", "status", "data_criacao")
+
+
+@pytest.fixture()
+def arquivo_csv(tmp_path):
+    """Gera um CSV de importação e remove as tarefas importadas dele após o teste."""
+    caminho = tmp_path / "tarefas.csv"
+
+    def gravar(linhas):
+        with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(COLUNAS)
+            escritor.writerows(linhas)
+        return str(caminho)
+
+    yield gravar
+    TarefaDAO.excluir_lote(t.id for t in TarefaDAO.filtrar_tarefas({"titulo": "Importar pytest"}))
+
+
+def test_importar_rejeita_invalidas_e_descarta_duplicadas(arquivo_csv):
+    """Verifica se linhas inválidas vão para o arquivo de rejeitadas e chaves repetidas não são gravadas."""
+    caminho = arquivo_csv([
+        ("Importar pytest A", "x", "Alta", "Pendente", "2024-01-01 10:00:00"),
+        ("", "sem título", "Alta", "Pendente", ""),
+        ("Importar pytest B", "y", "Urgente", "Pendente", ""),
+        ("Importar pytest A", "repetida", "Baixa", "Concluída", "2024-01-01 10:00:00"),
+        ("Importar pytest C", "multi\nlinha", "baixa", "", "2024-01-02 08:30:00"),
+    ])
+    resultado = importacao.importar_arquivo(caminho, tamanho_lote=2, processos=1, conexoes=2,
+                                            chave=("titulo", "data_criacao"), saida=None)
+
+    assert (resultado["lidas"], resultado["inseridas"], resultado["rejeitadas"], resultado["duplicadas"]) == (5, 2, 2, 1)
+    with open(caminho + importacao.SUFIXO_REJEITADAS, encoding="utf-8") as arquivo:
+        assert sorted(json.loads(linha)["linha"] for linha in arquivo) == [3, 4, 5]
+    importadas = TarefaDAO.filtrar_tarefas({"titulo": "Importar pytest"}, "titulo")
+    assert [(t.titulo, t.descricao, t.prioridade) for t in importadas] == \
+           [("Importar pytest A", "x", "Alta"), ("Importar pytest C", "multi\nlinha", "Baixa")]
+
+    # A mesma importação de novo: tudo já existe no banco
+    resultado = importacao.importar_arquivo(caminho, tamanho_lote=2, processos=1, chave=("titulo", "data_criacao"),
+                                            saida=None)
+    assert (resultado["inseridas"], resultado["duplicadas"]) == (0, 3)
+
+
+def test_importar_retoma_a_partir_do_progresso_salvo(arquivo_csv):
+    """Verifica se blocos anotados no progresso são pulados e o progresso é apagado ao terminar."""
+    caminho = arquivo_csv([(f"Importar pytest {i}", "", "Media", "Pendente", "") for i in range(5)])
+    # Simula uma importação anterior que caiu depois de gravar o bloco 1
+    importacao._Progresso(caminho + importacao.SUFIXO_PROGRESSO, caminho, 2).concluir(1)
+
+    resultado = importacao.importar_arquivo(caminho, tamanho_lote=2, processos=1, saida=None)
+
+    assert (resultado["blocos"], resultado["blocos_pulados"], resultado["inseridas"]) == (3, 1, 3)
+    titulos = sorted(t.titulo for t in TarefaDAO.filtrar_tarefas({"titulo": "Importar pytest"}))
+    assert titulos == ["Importar pytest 0", "Importar pytest 1", "Importar pytest 4"]
+    assert not os.path.exists(caminho + importacao.SUFIXO_PROGRESSO)
+    with pytest.raises(ValueError):
+        importacao.importar_arquivo(caminho, tamanho_lote=3, processos=1, chave=("descricao",), saida=None)
+
+
+def test_importar_bloco_maior_que_um_insert(arquivo_csv, monkeypatch):
+    """Verifica se um bloco acima de LINHAS_POR_INSERT é dividido em vários INSERTs e gravado por inteiro."""
+    caminho = arquivo_csv([(f"Importar pytest {i}", "", "Media", "Pendente", "") for i in range(5)])
+    monkeypatch.setattr(importacao, "LINHAS_POR_INSERT", 2)
+    tamanhos = []
+    inserir_lote = TarefaDAO.inserir_lote
+
+    def espiar(tarefas, chunk_size):
+        tamanhos.append(chunk_size)
+        return inserir_lote(tarefas, chunk_size)
+
+    monkeypatch.setattr(TarefaDAO, "inserir_lote", espiar)
+    resultado = importacao.importar_arquivo(caminho, tamanho_lote=5, processos=1, saida=None)
+
+    assert (resultado["blocos"], resultado["inseridas"], resultado["blocos_com_erro"]) == (1, 5, [])
+    assert tamanhos == [2]
+    assert len(TarefaDAO.filtrar_tarefas({"titulo": "Importar pytest"})) == 5
@@ -0,0 +1,73 @@
+# tests/test_logger.py
+from utils.logger import EscritorLog, formatar
+
+
+def test_formato_da_linha_de_log_preservado():
+    """Verifica se a linha gravada mantém o formato original do log de erros."""
+    instante = 1700000000.0
+    linha = formatar(instante, "Falha ao buscar", "Error - conexão perdida", "buscar_por_id")
+
+    from datetime import datetime
+    agora = datetime.fromtimestamp(instante).strftime("%Y-%m-%d %H:%M:%S")
+    assert linha == f"[[{agora}]ERRO em buscar_por_id] Falha ao buscar | EXCEÇÃO: Error - conexão perdida"
+    assert formatar(instante, "Sem origem") == f"[[{agora}] ERRO:] Sem origem"
+
+
+def test_escritor_rotaciona_por_tamanho(tmp_path):
+    """Verifica se o arquivo é rotacionado ao passar de max_bytes, mantendo os backups."""
+    caminho = tmp_path / "erros.log"
+    escritor = EscritorLog(str(caminho), max_bytes=100, backups=2)
+    escritor.iniciar()
+    for i in range(5):
+        escritor.registrar(f"mensagem {i} " + "x" * 80)
+        assert escritor.descarregar(timeout=2)
+    escritor.fechar()
+
+    assert escritor.estatisticas()["rotacoes"] == 4
+    assert (tmp_path / "erros.log.2").exists() and not (tmp_path / "erros.log.3").exists()
+    assert "mensagem 4" in caminho.read_text(encoding="utf-8")
+
+
+def test_escritor_descarta_com_fila_cheia_e_avisa(tmp_path):
+    """Verifica se, com a fila cheia, a mensagem é descartada na hora e o descarte fica registrado."""
+    caminho = tmp_path / "erros.log"
+    escritor = EscritorLog(str(caminho), fila_max=2)
+    assert escritor.registrar("um") and escritor.registrar("dois")
+    assert not escritor.registrar("três"), "A terceira mensagem deveria ser descartada"
+
+    escritor.iniciar()
+    escritor.fechar()
+    linhas = caminho.read_text(encoding="utf-8").splitlines()
+    assert escritor.estatisticas()["descartadas"] == 1
+    assert len(linhas) == 3 and "1 mensagem(ns) de log descartada(s)" in linhas[-1]
+
+
+def test_escritor_reabre_o_arquivo_depois_de_erro(tmp_path, capsys):
+    """Verifica se, após um OSError na gravação, o handle é fechado e a gravação seguinte abre outro."""
+    class ArquivoComFalha:
+        def __init__(self, arquivo):
+            self.arquivo = arquivo
+            self.fechado = False
+
+        def write(self, texto):
+            raise OSError("disco cheio")
+
+        def close(self):
+            self.fechado = True
+            self.arquivo.close()
+
+    caminho = tmp_path / "erros.log"
+    escritor = EscritorLog(str(caminho))
+    escritor.iniciar()
+    escritor.registrar("um")
+    assert escritor.descarregar(timeout=2)
+    com_falha = escritor._arquivo = ArquivoComFalha(escritor._arquivo)
+
+    escritor.registrar("perdida")
+    assert escritor.descarregar(timeout=2)
+    assert com_falha.fechado and escritor._arquivo is None
+    assert "disco cheio" in capsys.readouterr().err
+
+    escritor.registrar("três")
+    escritor.fechar()
+    assert [linha.rsplit("] ", 1)[1] for linha in caminho.read_text(encoding="utf-8").splitlines()] == ["um", "três"]
@@ -0,0 +1,53 @@
+# tests/test_metricas.py
+import pytest
+
+from dao.tarefa_dao import TarefaDAO
+from models.tarefa import Tarefa
+from utils import metricas
+
+
+@pytest.fixture()
+def metricas_ativas():
+    metricas.zerar()
+    metricas.ativar()
+    yield
+    metricas.desativar()
+    metricas.zerar()
+
+
+def test_histograma_estima_percentis():
+    """Verifica se os percentis saem dos baldes certos e nunca passam do máximo."""
+    histograma = metricas.Histograma()
+    for _ in range(90):
+        histograma.observar(0.0002)
+    for _ in range(10):
+        histograma.observar(0.2)
+
+    assert 0.0001 < histograma.percentil(0.5) <= 0.00025
+    assert 0.1 < histograma.percentil(0.99) <= 0.2
+
+
+def test_metricas_por_metodo_e_fase(metricas_ativas):
+    """Verifica se uma chamada ao DAO registra chamadas, linhas e as fases medidas."""
+    TarefaDAO.desativar_cache()
+    tarefa_id = TarefaDAO.inserir(Tarefa(titulo="Métricas pytest", descricao=""))
+    try:
+        assert TarefaDAO.buscar_por_id(tarefa_id) is not None
+        TarefaDAO.listar("titulo", "ASC")
+    finally:
+        TarefaDAO.excluir(tarefa_id)
+
+    dados = metricas.instantaneo()
+    assert dados["buscar_por_id"]["chamadas"] == 1 and dados["buscar_por_id"]["linhas"] == 1
+    assert {"total", "conexao", "execucao", "leitura", "montagem"} <= set(dados["listar"]["fases"])
+
+    texto = metricas.exportar_prometheus()
+    assert 'tarefas_dao_chamadas_total{metodo="listar"} 1' in texto
+    assert 'tarefas_dao_duracao_segundos_count{metodo="listar",fase="total"} 1' in texto
+
+
+def test_metricas_contam_erros(metricas_ativas):
+    """Verifica se exceções que saem do DAO são contadas como erro do método."""
+    with pytest.raises(ValueError):
+        TarefaDAO.listar("campo_invalido", "ASC")
+    assert metricas.instantaneo()["listar"]["erros"] == 1
@@ -0,0 +1,107 @@
+# tests/test_pool.py
+import sqlite3
+import threading
+import time
+
+import mysql.connector
+import pytest
+
+from db.db import PoolConexoes
+
+
+class ConexaoFalsa:
+    """Conexão mínima usada para testar o pool sem um servidor MySQL."""
+    def __init__(self):
+        self.in_transaction = False
+        self.rollbacks = 0
+        self.fechada = False
+
+    def ping(self, **kwargs):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.fechada = True
+
+
+def test_pool_reutiliza_conexoes():
+    """Verifica se conexões devolvidas são reaproveitadas em vez de recriadas."""
+    pool = PoolConexoes(tamanho=2, fabrica=ConexaoFalsa)
+    conn = pool.obter()
+    pool.devolver(conn)
+
+    assert pool.obter() is conn, "O pool deveria reutilizar a conexão ociosa"
+    assert pool.estatisticas()["criadas"] == 1
+
+
+def test_pool_limita_e_espera_conexao_livre():
+    """Verifica se o pool respeita o tamanho máximo e entrega a conexão devolvida a quem espera."""
+    pool = PoolConexoes(tamanho=1, timeout=1, fabrica=ConexaoFalsa)
+    conn = pool.obter()
+
+    def devolver_depois():
+        time.sleep(0.05)
+        pool.devolver(conn)
+
+    threading.Thread(target=devolver_depois).start()
+    assert pool.obter() is conn
+    assert pool.estatisticas()["esperas"] == 1
+
+
+def test_pool_esgotado_lanca_pool_error():
+    """Verifica se o timeout de espera gera PoolError."""
+    pool = PoolConexoes(tamanho=1, timeout=0.05, fabrica=ConexaoFalsa)
+    pool.obter()
+    with pytest.raises(mysql.connector.errors.PoolError):
+        pool.obter()
+
+
+def test_pool_faz_rollback_ao_devolver_com_erro():
+    """Verifica se a conexão sofre rollback antes de voltar ao pool quando houve erro."""
+    pool = PoolConexoes(tamanho=1, fabrica=ConexaoFalsa)
+    conn = pool.obter()
+    pool.devolver(conn, erro=True)
+
+    assert conn.rollbacks == 1
+    estatisticas = pool.estatisticas()
+    assert estatisticas["em_uso"] == 0 and estatisticas["ociosas"] == 1
+
+
+def test_sqlite_fecha_conexoes_de_threads_encerradas(tmp_path):
+    """Verifica se as conexões SQLite de uma thread são fechadas quando ela termina."""
+    from db.sqlite import MotorSQLite
+
+    motor = MotorSQLite(str(tmp_path / "threads.db"))
+    abertas = []
+
+    def usar():
+        with motor.conexao() as conn:
+            abertas.append(conn)
+            conn.execute("SELECT 1")
+
+    try:
+        for _ in range(5):
+            thread = threading.Thread(target=usar)
+            thread.start()
+            thread.join()
+        usar()
+        assert motor.estatisticas()["conexoes"] == 1, "Só a conexão da thread viva deveria continuar aberta"
+        with pytest.raises(sqlite3.ProgrammingError):
+            abertas[0].execute("SELECT 1")
+    finally:
+        motor.fechar()
+
+
+def test_motor_incompleto_nao_pode_ser_criado():
+    """Verifica se um motor sem conexao/cursor/ids_inseridos é recusado ao ser instanciado."""
+    from db.motores import Motor
+
+    class MotorIncompleto(Motor):
+        def conexao(self):
+            pass
+
+    with pytest.raises(TypeError, match="cursor"):
+        MotorIncompleto()
@@ -0,0 +1,44 @@
+# tests/test_schema.py
+import sqlite3
+
+import pytest
+
+from db import schema
+from db.motores import obter_motor
+
+
+def test_migracoes_deixam_schema_na_ultima_versao():
+    """Verifica se o banco de testes está na última versão e se migrar de novo não faz nada."""
+    assert schema.migrar() == [], "Não deveria haver migrações pendentes"
+
+    motor = obter_motor()
+    with motor.conexao() as conn, motor.cursor(conn) as cursor:
+        assert schema.versao_atual(cursor, motor.nome) == schema.MIGRACOES[-1][0]
+
+
+def test_consultas_do_dao_nao_varrem_a_tabela():
+    """Verifica, via EXPLAIN, se nenhuma forma de consulta do DAO faz varredura completa."""
+    varreduras = [item for item in schema.verificar() if item["varredura_completa"]]
+    assert not varreduras, f"Formas com varredura completa: {varreduras}"
+
+
+def test_banco_desatualizado_pede_migracao(tmp_path):
+    """Verifica se um banco sem as migrações é recusado com a instrução de rodar `migrar`."""
+    conn = sqlite3.connect(tmp_path / "antigo.db")
+    try:
+        with pytest.raises(RuntimeError, match="python -m db.schema migrar"):
+            schema.conferir_versao(conn.cursor(), "sqlite")
+    finally:
+        conn.close()
+
+
+def test_conversao_de_prioridade_pode_rodar_de_novo():
+    """Verifica se a conversão nome -> nível mantém valores que já são níveis."""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE TABLE tarefas (prioridade)")
+        conn.executemany("INSERT INTO tarefas VALUES (?)", [("Baixa",), ("Media",), ("Alta",), (1,), (2,), (3,)])
+        niveis = [linha[0] for linha in conn.execute(f"SELECT {schema.NIVEL_POR_NOME_SQL} FROM tarefas")]
+        assert niveis == [1, 2, 3, 1, 2, 3]
+    finally:
+        conn.close()
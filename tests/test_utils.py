@@ -0,0 +1,33 @@
+# tests/test_utils.py
+from models.tarefa import Tarefa
+from utils import utils
+
+
+def test_paginador_navega_sem_buscar_paginas_ja_vistas(monkeypatch, capsys):
+    """Verifica se voltar/pular para páginas vistas não chama a busca de novo e se títulos longos são cortados."""
+    paginas = {
+        None: ([Tarefa(id=1, titulo="Curta", descricao="")], "t2"),
+        "t2": ([Tarefa(id=2, titulo="Um título bem longo " * 10, descricao="")], "t3"),
+        "t3": ([Tarefa(id=3, titulo="Última", descricao="", status="Concluída")], None),
+    }
+    buscas = []
+
+    def buscar_pagina(token):
+        buscas.append(token)
+        return paginas[token]
+
+    respostas = iter(["", "a", "3", "1", "9", ""])
+    monkeypatch.setattr("builtins.input", lambda msg: next(respostas))
+    monkeypatch.setenv("COLUMNS", "60")
+
+    utils.exibir_tarefas_paginado(buscar_pagina, total=3)
+
+    assert buscas == [None, "t2", "t3"]
+    saida = capsys.readouterr().out
+    assert [linha for linha in saida.splitlines() if linha.startswith("Página")] == [
+        "Página 1 | 3 tarefa(s)", "Página 2 | 3 tarefa(s)", "Página 1 | 3 tarefa(s)",
+        "Página 3 de 3 | 3 tarefa(s)", "Página 1 de 3 | 3 tarefa(s)", "Página 3 de 3 | 3 tarefa(s)",
+    ]
+    assert "⚠️ Só há 3 página(s)." in saida
+    assert max(len(linha) for linha in saida.splitlines()) < 60
+    assert "Um título bem longo Um título be…" in saida
@@ -0,0 +1,214 @@
+# ui/cli.py
+"""
+Linha de comando não interativa do gerenciador de tarefas, para scripts e cron.
+
+Uso:
+    python main.py add --titulo "Pagar contas" --prioridade Alta
+    python main.py get 12
+    python main.py update 12 --status Concluída
+    python main.py delete 12 13
+    python main.py list --ordem data_criacao --direcao DESC
+    python main.py filter --status Pendente --formato csv
+    python main.py export tarefas.csv.gz --status Pendente
+
+A saída é feita para máquinas: add/get/update/delete/export escrevem um
+objeto JSON por linha; list e filter escrevem uma tarefa por linha em JSONL
+(ou CSV com --formato csv), em fluxo. Mensagens de erro vão para stderr.
+
+Códigos de saída: 0 sucesso, 1 tarefa não encontrada ou erro no banco,
+2 argumentos inválidos.
+
+Observações:
+------------
+- Este módulo só importa a biblioteca padrão e models.tarefa. O DAO (e com
+  ele dotenv, mysql.connector e o motor de banco) é importado dentro de cada
+  comando, então --help e erros de argumento não pagam esse custo. O
+  orçamento de inicialização é conferido por benchmarks/bench_inicializacao.py
+  e pelos testes.
+"""
+import argparse
+import json
+import sys
+
+from models.tarefa import Tarefa
+
+FORMATOS = ("jsonl", "csv")
+CAMPOS_ORDENACAO = ("titulo", "prioridade", "status", "data_criacao")
+
+
+def _como_dict(tarefa: Tarefa) -> dict:
+    """Tarefa como dicionário serializável, com a data em ISO 8601 (como em dao.exportacao)."""
+    return {
+        "id": tarefa.id,
+        "titulo": tarefa.titulo,
+        "descricao": tarefa.descricao,
+        "prioridade": tarefa.prioridade,
+        "status": tarefa.status,
+        "data_criacao": tarefa.data_criacao.isoformat(" ") if tarefa.data_criacao else None,
+    }
+
+
+def _escrever(dados: dict) -> None:
+    sys.stdout.write(json.dumps(dados, ensure_ascii=False) + "\n")
+
+
+def _erro(mensagem: str) -> int:
+    print(f"erro: {mensagem}", file=sys.stderr)
+    return 1
+
+
+def _erros_de_banco() -> tuple[type[Exception], ...]:
+    """Classes de erro dos drivers já importados; um driver não importado não pode ter lançado nada."""
+    erros = []
+    if (sqlite3 := sys.modules.get("sqlite3")) is not None:
+        erros.append(sqlite3.Error)
+    if (conector := sys.modules.get("mysql.connector")) is not None:
+        erros.append(conector.Error)
+    return tuple(erros)
+
+
+def _filtros(args) -> dict:
+    return {campo: valor for campo in ("titulo", "prioridade", "status")
+            if (valor := getattr(args, campo, None)) is not None}
+
+
+def _adicionar(args) -> int:
+    tarefa = Tarefa(titulo=args.titulo, descricao=args.descricao, prioridade=args.prioridade, status=args.status)
+    from dao.tarefa_dao import TarefaDAO
+
+    if (novo_id := TarefaDAO.inserir(tarefa)) is None:
+        return _erro("não foi possível inserir a tarefa; veja logs/erros.log")
+    _escrever({"id": novo_id})
+    return 0
+
+
+def _buscar(args) -> int:
+    from dao.tarefa_dao import TarefaDAO
+
+    if (tarefa := TarefaDAO.buscar_por_id(args.id)) is None:
+        return _erro(f"tarefa {args.id} não encontrada")
+    _escrever(_como_dict(tarefa))
+    return 0
+
+
+def _atualizar(args) -> int:
+    novos = {campo: valor for campo in ("titulo", "descricao", "prioridade", "status")
+             if (valor := getattr(args, campo)) is not None}
+    if not novos:
+        raise ValueError("informe ao menos um campo para atualizar")
+    from dao.tarefa_dao import TarefaDAO
+
+    if (atual := TarefaDAO.buscar_por_id(args.id)) is None:
+        return _erro(f"tarefa {args.id} não encontrada")
+    valores = {**_como_dict(atual), **novos}
+    tarefa = Tarefa(id=args.id, titulo=valores["titulo"], descricao=valores["descricao"],
+                    prioridade=valores["prioridade"], status=valores["status"], data_criacao=atual.data_criacao)
+    if not TarefaDAO.atualizar(tarefa):
+        return _erro(f"tarefa {args.id} não foi atualizada; veja logs/erros.log")
+    _escrever(_como_dict(tarefa))
+    return 0
+
+
+def _excluir(args) -> int:
+    from dao.tarefa_dao import TarefaDAO
+
+    excluidas, erros = TarefaDAO.excluir_lote(args.ids)
+    _escrever({"excluidas": excluidas})
+    if erros:
+        return _erro("erro ao excluir parte das tarefas; veja logs/erros.log")
+    return 0 if excluidas else 1
+
+
+def _listar(args) -> int:
+    filtros = _filtros(args)
+    if args.comando == "filter" and not filtros:
+        raise ValueError("informe ao menos um filtro (--titulo, --prioridade ou --status)")
+    from dao.tarefa_dao import TarefaDAO
+
+    if TarefaDAO.exportar(sys.stdout, args.formato, filtros, args.campo_ordem, args.direcao) is None:
+        return _erro("erro ao ler as tarefas; a saída ficou incompleta")
+    return 0
+
+
+def _exportar(args) -> int:
+    from dao import exportacao
+
+    linhas, segundos = exportacao.exportar_arquivo(args.caminho, args.formato, _filtros(args),
+                                                   args.campo_ordem, args.direcao, args.gzip)
+    if linhas is None:
+        return _erro("erro ao exportar as tarefas; o arquivo ficou incompleto")
+    _escrever({"exportadas": linhas, "segundos": round(segundos, 3)})
+    return 0
+
+
+def _argumentos_filtro(parser, titulo_ajuda: str = "filtra pelo título (busca parcial)") -> None:
+    parser.add_argument("--titulo", help=titulo_ajuda)
+    parser.add_argument("--prioridade", choices=Tarefa.PRIORIDADE_VALIDAS, type=str.capitalize)
+    parser.add_argument("--status", choices=Tarefa.STATUS_VALIDOS, type=str.capitalize)
+
+
+def _argumentos_ordem(parser) -> None:
+    parser.add_argument("--ordem", dest="campo_ordem", choices=CAMPOS_ORDENACAO)
+    parser.add_argument("--direcao", choices=("ASC", "DESC"), type=str.upper)
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """Monta o parser de argumentos com um subcomando por operação."""
+    parser = argparse.ArgumentParser(prog="python main.py",
+                                     description="Gerenciador de tarefas. Sem comando, abre o menu interativo.")
+    comandos = parser.add_subparsers(dest="comando", required=True, metavar="comando")
+
+    add = comandos.add_parser("add", help="cria uma tarefa e escreve {\"id\": ...}")
+    add.add_argument("--titulo", required=True)
+    add.add_argument("--descricao", default="")
+    add.add_argument("--prioridade", choices=Tarefa.PRIORIDADE_VALIDAS, type=str.capitalize, default="Media")
+    add.add_argument("--status", choices=Tarefa.STATUS_VALIDOS, type=str.capitalize, default="Pendente")
+    add.set_defaults(executar=_adicionar)
+
+    get = comandos.add_parser("get", help="escreve a tarefa em JSON")
+    get.add_argument("id", type=int)
+    get.set_defaults(executar=_buscar)
+
+    update = comandos.add_parser("update", help="altera os campos informados e escreve a tarefa em JSON")
+    update.add_argument("id", type=int)
+    _argumentos_filtro(update, titulo_ajuda="novo título")
+    update.add_argument("--descricao")
+    update.set_defaults(executar=_atualizar)
+
+    delete = comandos.add_parser("delete", help="exclui as tarefas e escreve {\"excluidas\": ...}")
+    delete.add_argument("ids", type=int, nargs="+")
+    delete.set_defaults(executar=_excluir)
+
+    for nome, ajuda in (("list", "escreve todas as tarefas, uma por linha"),
+                        ("filter", "escreve as tarefas que atendem aos filtros, uma por linha")):
+        listagem = comandos.add_parser(nome, help=ajuda)
+        if nome == "filter":
+            _argumentos_filtro(listagem)
+        _argumentos_ordem(listagem)
+        listagem.add_argument("--formato", choices=FORMATOS, default="jsonl")
+        listagem.set_defaults(executar=_listar)
+
+    export = comandos.add_parser("export", help="exporta para arquivo (.csv, .jsonl, com .gz para gzip)")
+    export.add_argument("caminho")
+    export.add_argument("--formato", choices=FORMATOS, help="padrão: pela extensão do arquivo")
+    export.add_argument("--gzip", action="store_true", default=None, help="compacta mesmo sem a extensão .gz")
+    _argumentos_filtro(export)
+    _argumentos_ordem(export)
+    export.set_defaults(executar=_exportar)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.executar(args)
+    except ValueError as e:
+        parser.error(str(e))
+    except (RuntimeError, *_erros_de_banco()) as e:
+        # Banco fora do ar, sem permissão ou com migrações pendentes (db.schema.conferir_versao)
+        return _erro(str(e))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,12 @@
+from datetime import date, timedelta
+
 from dao.tarefa_dao import TarefaDAO
 from models.tarefa import Tarefa
 from utils import utils
 
+# Tarefas por página nas listagens
+TAMANHO_PAGINA = 20
+
 def adicionar_tarefa():
     """
     Coleta informações do usuário para criar uma nova tarefa e insere no banco de dados.
@@ -32,14 +37,18 @@ def listar_tarefas():
 
     Opções:
     - Permite ao usuário escolher se deseja ordenar os resultados.
-    - Chama TarefaDAO.listar() e exibe usando utils.exibir_tarefas.
+    - Busca uma página por vez com TarefaDAO.listar_paginado e exibe usando
+      utils.exibir_tarefas_paginado. O total vem de TarefaDAO.contar_por.
     """
     campo_ordem = direcao = None
     escolha = input("Deseja ordenar as tarefas? (s/n): ").strip().lower()
     if escolha in ("s", "sim"):
         campo_ordem , direcao = utils.ler_ordenacao()
-    tarefas = TarefaDAO.listar(campo_ordem, direcao)
-    utils.exibir_tarefas(tarefas)
+    contagens = TarefaDAO.contar_por("status")
+    utils.exibir_tarefas_paginado(
+        lambda token: TarefaDAO.listar_paginado(campo_ordem, direcao, TAMANHO_PAGINA, token),
+        sum(contagens.values()) if contagens is not None else None
+    )
 
 
 def atualizar_tarefa():
@@ -114,7 +123,7 @@ def filtrar_tarefas_menu():
     Fluxo:
     - Usa filtros estratégicos múltiplos do utils.
     - Permite ordenar resultados após aplicação dos filtros.
-    - Exibe resultados com utils.exibir_tarefas.
+    - Exibe resultados página a página com utils.exibir_tarefas_paginado.
     """
     campo_ordem = direcao = None
     filtros_selecionados = utils.filtros_estrategicos_multiplos()
@@ -122,8 +131,28 @@ def filtrar_tarefas_menu():
         escolha = input("Deseja ordenar os resultados? (s/n): ").strip().lower()
         if escolha in ("sim", "s"):
             campo_ordem, direcao = utils.ler_ordenacao()
-        tarefas = TarefaDAO.filtrar_tarefas(filtros_selecionados,campo_ordem, direcao)
-        utils.exibir_tarefas(tarefas)
+        utils.exibir_tarefas_paginado(
+            lambda token: TarefaDAO.filtrar_paginado(filtros_selecionados, campo_ordem, direcao, TAMANHO_PAGINA, token)
+        )
+
+
+def resumo_tarefas():
+    """
+    Exibe um resumo das tarefas: totais por status e prioridade e as criadas
+    nos últimos 7 dias.
+
+    Fluxo:
+    - Chama TarefaDAO.contar_por e TarefaDAO.contar_por_dia (contagens feitas
+      no banco, sem carregar as tarefas).
+    - Exibe o resultado com utils.exibir_resumo.
+    """
+    contagens = TarefaDAO.contar_por("status", "prioridade")
+    hoje = date.today()
+    por_dia = TarefaDAO.contar_por_dia(hoje - timedelta(days=6), hoje)
+    if contagens is None or por_dia is None:
+        print("⚠️ Erro: não foi possível calcular o resumo. Tente novamente.")
+        return
+    utils.exibir_resumo(contagens, por_dia)
 
 
 opcoes = {
@@ -131,7 +160,8 @@ opcoes = {
     2: listar_tarefas,
     3: atualizar_tarefa,
     4: excluir_tarefa,
-    5: filtrar_tarefas_menu
+    5: filtrar_tarefas_menu,
+    6: resumo_tarefas
 }
 
 
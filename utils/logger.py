@@ -1,21 +1,37 @@
+import atexit
+import contextlib
 import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
-from xml.etree.ElementPath import prepare_predicate
+from functools import lru_cache
 
+from utils import metricas
 
-def _log_erro(mensagem: str, excecao: Exception | None = None, origem: str | None =None ) -> None:
-    """
-    Registra uma mensagem de erro em um arquivo de log com data e hora
-    """
+#Configuração do arquivo de log e da escrita em segundo plano
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_ARQUIVO = "erros.log"
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_ROTACAO_SEGUNDOS = float(os.getenv("LOG_ROTACAO_SEGUNDOS", "86400"))
+LOG_BACKUPS = int(os.getenv("LOG_BACKUPS", "5"))
+LOG_FILA_MAX = int(os.getenv("LOG_FILA_MAX", "10000"))
+#Fila cheia: "descartar" (padrão) perde a mensagem na hora; "bloquear" espera até LOG_ESPERA_MAX
+LOG_POLITICA = os.getenv("LOG_POLITICA", "descartar")
+LOG_ESPERA_MAX = float(os.getenv("LOG_ESPERA_MAX", "0.1"))
 
-    #Garantia da existencia da pasta logs
-    os.makedirs("logs", exist_ok=True)
+#Máximo de mensagens gravadas de uma vez pela thread
+LOTE_MAX = 512
 
-    #Montando caminho do arquivo
-    caminho_log = os.path.join("logs", "erros.log")
+_FIM = object()
 
-    #Data e hora
-    agora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def formatar(instante: float, mensagem: str, excecao: str | None = None, origem: str | None = None) -> str:
+    """
+    Monta a linha de log: data e hora, origem, mensagem e exceção
+    """
+    agora = _data_hora(int(instante))
 
     prefixo = f"[{agora}]"
     if origem:
@@ -23,16 +39,258 @@ def _log_erro(mensagem: str, excecao: Exception | None = None, origem: str | Non
     else:
         prefixo += " ERRO:"
 
-    #Monta o texto de log
     texto_erro = f"[{prefixo}] {mensagem}"
     if excecao:
-        texto_erro += f" | EXCEÇÃO: {type(excecao).__name__} - {excecao}"
+        texto_erro += f" | EXCEÇÃO: {excecao}"
+    return texto_erro
+
+
+@lru_cache(maxsize=8)
+def _data_hora(segundo: int) -> str:
+    #Mensagens do mesmo segundo reaproveitam a data já formatada
+    return datetime.fromtimestamp(segundo).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class EscritorLog:
+    """
+    Grava as linhas de log em arquivo a partir de uma thread de fundo.
+
+    Parâmetros:
+    -----------
+    caminho : str
+        Arquivo de log. A pasta é criada na primeira gravação.
+    max_bytes : int
+        Tamanho a partir do qual o arquivo é rotacionado (0 desliga).
+    rotacao_segundos : float
+        Idade a partir da qual o arquivo é rotacionado (0 desliga).
+    backups : int
+        Quantos arquivos antigos manter (caminho.1 é o mais recente).
+    fila_max : int
+        Mensagens que podem aguardar gravação.
+    politica : str
+        O que fazer com a fila cheia: 'descartar' ou 'bloquear' (espera até
+        `espera_max` segundos e então descarta).
+    formatador : callable
+        Monta a linha a partir de (instante, *campos de `registrar`). Também
+        recebe (instante, texto, None, 'logger') para o aviso de descarte.
+        Padrão: `formatar`.
+
+    Observações:
+    ------------
+    - `registrar` só coloca a mensagem na fila; a thread mantém o arquivo
+      aberto e grava em lotes de até LOTE_MAX linhas, com um flush por lote.
+    - Mensagens descartadas são contadas e avisadas no próprio log.
+    - `iniciar` registra `fechar` no atexit, então o que estiver na fila é
+      gravado quando o programa termina.
+    """
+
+    def __init__(self, caminho: str, max_bytes: int = LOG_MAX_BYTES,
+                 rotacao_segundos: float = LOG_ROTACAO_SEGUNDOS, backups: int = LOG_BACKUPS,
+                 fila_max: int = LOG_FILA_MAX, politica: str = LOG_POLITICA,
+                 espera_max: float = LOG_ESPERA_MAX, relogio=time.time, formatador=formatar):
+        if politica not in ("descartar", "bloquear"):
+            raise ValueError("politica deve ser 'descartar' ou 'bloquear'")
+        self.caminho = caminho
+        self.max_bytes = max_bytes
+        self.rotacao_segundos = rotacao_segundos
+        self.backups = backups
+        self.politica = politica
+        self.espera_max = espera_max
+        self._relogio = relogio
+        self.formatador = formatador
+        self._fila = queue.Queue(fila_max)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._arquivo = None
+        self._tamanho = 0
+        self._aberto_em = 0.0
+        self._descartadas = 0
+        self._descartadas_avisadas = 0
+        self._gravadas = 0
+        self._rotacoes = 0
+
+    def iniciar(self) -> None:
+        """Inicia a thread de gravação (uma vez só)."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, name="escritor-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.fechar)
+
+    def registrar(self, *campos) -> bool:
+        """
+        Coloca uma mensagem na fila, com os campos do formatador (mensagem, exceção, origem).
+
+        Retorna False se ela foi descartada por fila cheia.
+        """
+        item = (self._relogio(), *campos)
+        try:
+            if self.politica == "bloquear":
+                self._fila.put(item, timeout=self.espera_max)
+            else:
+                self._fila.put_nowait(item)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._descartadas += 1
+            return False
+
+    def descarregar(self, timeout: float | None = None) -> bool:
+        """Espera a thread gravar tudo o que já está na fila. Retorna False se o tempo acabar."""
+        if self._thread is None or not self._thread.is_alive():
+            return self._fila.empty()
+        gravado = threading.Event()
+        try:
+            self._fila.put(gravado, timeout=timeout)
+        except queue.Full:
+            return False
+        return gravado.wait(timeout)
+
+    def fechar(self, timeout: float = 2.0) -> None:
+        """Grava o que está na fila, fecha o arquivo e encerra a thread."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        try:
+            self._fila.put(_FIM, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                "pendentes": self._fila.qsize(),
+                "gravadas": self._gravadas,
+                "descartadas": self._descartadas,
+                "rotacoes": self._rotacoes,
+            }
 
-    # Vai escrever no arquivo
-    with open (caminho_log, "a", encoding="utf-8") as f:
-        f.write(texto_erro + "\n")
+    def _executar(self) -> None:
+        while True:
+            lote = [self._fila.get()]
+            while len(lote) < LOTE_MAX:
+                try:
+                    lote.append(self._fila.get_nowait())
+                except queue.Empty:
+                    break
+
+            linhas = []
+            eventos = []
+            encerrar = False
+            for item in lote:
+                if item is _FIM:
+                    encerrar = True
+                elif isinstance(item, threading.Event):
+                    eventos.append(item)
+                else:
+                    linhas.append(self.formatador(*item))
+
+            with self._lock:
+                descartadas = self._descartadas - self._descartadas_avisadas
+                self._descartadas_avisadas = self._descartadas
+            if descartadas:
+                linhas.append(self.formatador(self._relogio(), f"{descartadas} mensagem(ns) de log descartada(s) "
+                                                               "com a fila cheia", None, "logger"))
+            if linhas:
+                self._gravar(linhas)
+            for evento in eventos:
+                evento.set()
+            if encerrar:
+                if self._arquivo:
+                    self._arquivo.close()
+                    self._arquivo = None
+                return
+
+    def _gravar(self, linhas: list[str]) -> None:
+        texto = "".join(linha + "\n" for linha in linhas)
+        try:
+            if self._arquivo is None:
+                self._abrir()
+            elif self._precisa_rotacionar():
+                self._rotacionar()
+            self._arquivo.write(texto)
+            self._arquivo.flush()
+            self._tamanho += len(texto.encode("utf-8"))
+            with self._lock:
+                self._gravadas += len(linhas)
+        except OSError as e:
+            #Sem onde gravar: avisa no stderr e descarta o lote para não travar a aplicação
+            print(f"[AVISO] Não foi possível gravar o log em {self.caminho}: {e}", file=sys.stderr)
+            if self._arquivo is not None:
+                #Fecha o handle com problema; a próxima gravação abre outro
+                with contextlib.suppress(OSError):
+                    self._arquivo.close()
+                self._arquivo = None
+
+    def _abrir(self) -> None:
+        pasta = os.path.dirname(self.caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+        self._tamanho = self._arquivo.tell()
+        self._aberto_em = self._relogio()
+
+    def _precisa_rotacionar(self) -> bool:
+        if not self._tamanho:
+            return False
+        if self.max_bytes and self._tamanho >= self.max_bytes:
+            return True
+        return bool(self.rotacao_segundos) and self._relogio() - self._aberto_em >= self.rotacao_segundos
+
+    def _rotacionar(self) -> None:
+        self._arquivo.close()
+        self._arquivo = None
+        if self.backups:
+            for i in range(self.backups - 1, 0, -1):
+                if os.path.exists(f"{self.caminho}.{i}"):
+                    os.replace(f"{self.caminho}.{i}", f"{self.caminho}.{i + 1}")
+            os.replace(self.caminho, f"{self.caminho}.1")
+        else:
+            os.remove(self.caminho)
+        with self._lock:
+            self._rotacoes += 1
+        self._abrir()
+
+
+_escritor = None
+_escritor_lock = threading.Lock()
+
+
+def obter_escritor() -> EscritorLog:
+    """Retorna o escritor de logs/erros.log, iniciando a thread na primeira chamada."""
+    global _escritor
+    if _escritor is None:
+        with _escritor_lock:
+            if _escritor is None:
+                escritor = EscritorLog(os.path.join(LOG_DIR, LOG_ARQUIVO))
+                escritor.iniciar()
+                _escritor = escritor
+    return _escritor
+
+
+def descarregar_log(timeout: float | None = 2.0) -> bool:
+    """Espera as mensagens pendentes serem gravadas no arquivo."""
+    return obter_escritor().descarregar(timeout)
+
+
+def estatisticas_log() -> dict:
+    """Contadores do escritor de logs (pendentes, gravadas, descartadas, rotações)."""
+    return obter_escritor().estatisticas()
+
+
+def _log_erro(mensagem: str, excecao: Exception | None = None, origem: str | None =None ) -> None:
+    """
+    Registra uma mensagem de erro em um arquivo de log com data e hora
+
+    A gravação é feita em segundo plano por `EscritorLog`; aqui a mensagem só
+    entra na fila.
+    """
+    if metricas.ativo():
+        metricas.contar_erro(origem)
+    detalhe = f"{type(excecao).__name__} - {excecao}" if excecao else None
+    obter_escritor().registrar(mensagem, detalhe, origem)
 
 
 def _tratar_erro(mensagem: str, e: Exception, metodo: str, retorno_padrao):
     _log_erro(mensagem, e, metodo)
-    return retorno_padrao
\ No newline at end of file
+    return retorno_padrao
@@ -0,0 +1,265 @@
+# utils/metricas.py
+"""
+Métricas de latência e volume do TarefaDAO.
+
+Para cada método público do DAO são medidos:
+- a duração total da chamada (fase 'total');
+- as fases 'conexao' (obter a conexão do motor/pool), 'execucao'
+  (cursor.execute), 'leitura' (fetch das linhas) e 'montagem' (linhas
+  convertidas em Tarefa);
+- contadores de chamadas, erros e linhas lidas.
+
+As durações vão para histogramas de baldes fixos, de onde saem p50/p95/p99.
+Tudo fica desligado por padrão (METRICAS=1 liga na inicialização) e, assim,
+custa só um teste de flag por chamada.
+
+Uso:
+    from utils import metricas
+    metricas.ativar()
+    ...
+    metricas.instantaneo()           # dicionário
+    metricas.exportar_prometheus()   # formato texto do Prometheus
+
+Valores instantâneos de fora do DAO (ex: tamanho da fila de
+dao.escrita_adiada) entram com `registrar_medidor` e são lidos só na
+exportação.
+"""
+import contextvars
+import os
+import threading
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+
+# Limites superiores dos baldes, em segundos (de 50 µs a 10 s)
+BALDES = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+          0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PERCENTIS = (0.5, 0.95, 0.99)
+
+# Método do DAO em execução, para atribuir as fases medidas mais abaixo
+_metodo_atual = contextvars.ContextVar("metodo_dao", default="fora_do_dao")
+
+_ativo = os.getenv("METRICAS", "0") == "1"
+# Só marca o método em execução, sem medir (usado pelo log de consultas lentas)
+_marcar = False
+
+
+class Histograma:
+    """Contagens por balde, soma e máximo das durações observadas."""
+    __slots__ = ("contagens", "soma", "total", "maximo")
+
+    def __init__(self):
+        self.contagens = [0] * (len(BALDES) + 1)    # último balde: acima de BALDES[-1]
+        self.soma = 0.0
+        self.total = 0
+        self.maximo = 0.0
+
+    def observar(self, segundos: float) -> None:
+        self.contagens[bisect_left(BALDES, segundos)] += 1
+        self.soma += segundos
+        self.total += 1
+        if segundos > self.maximo:
+            self.maximo = segundos
+
+    def percentil(self, p: float) -> float:
+        """Estimativa do percentil `p` (0 a 1), interpolando dentro do balde."""
+        if not self.total:
+            return 0.0
+        alvo = p * self.total
+        acumulado = 0
+        for indice, quantidade in enumerate(self.contagens):
+            if quantidade and acumulado + quantidade >= alvo:
+                inferior = BALDES[indice - 1] if indice else 0.0
+                superior = BALDES[indice] if indice < len(BALDES) else self.maximo
+                estimativa = inferior + (superior - inferior) * (alvo - acumulado) / quantidade
+                return min(estimativa, self.maximo)
+            acumulado += quantidade
+        return self.maximo
+
+    def resumo(self) -> dict:
+        resumo = {"contagem": self.total, "soma": self.soma, "max": self.maximo}
+        for p in PERCENTIS:
+            resumo[f"p{int(p * 100)}"] = self.percentil(p)
+        return resumo
+
+
+class _Registro:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencias: dict[tuple[str, str], Histograma] = {}
+        self.chamadas: dict[str, int] = {}
+        self.erros: dict[str, int] = {}
+        self.linhas: dict[str, int] = {}
+
+
+_registro = _Registro()
+
+# Medidores: nome -> (descrição, função que devolve o valor atual)
+_medidores: dict[str, tuple[str, object]] = {}
+
+
+def ativar() -> None:
+    """Liga a coleta de métricas."""
+    global _ativo
+    _ativo = True
+
+
+def desativar() -> None:
+    """Desliga a coleta; os valores já coletados são mantidos."""
+    global _ativo
+    _ativo = False
+
+
+def ativo() -> bool:
+    return _ativo
+
+
+def marcar_metodos(ligado: bool) -> None:
+    """Mantém `metodo_atual()` atualizado mesmo com as métricas desligadas."""
+    global _marcar
+    _marcar = ligado
+
+
+def zerar() -> None:
+    """Descarta todas as métricas coletadas."""
+    global _registro
+    _registro = _Registro()
+
+
+def medido(func):
+    """
+    Decorador dos métodos públicos do DAO: mede a duração total, conta chamadas
+    e exceções, e marca o método para as fases medidas dentro dele.
+    """
+    metodo = func.__name__
+
+    @wraps(func)
+    def medir(*args, **kwargs):
+        if not _ativo:
+            if not _marcar:
+                return func(*args, **kwargs)
+            token = _metodo_atual.set(metodo)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _metodo_atual.reset(token)
+        token = _metodo_atual.set(metodo)
+        inicio = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            contar_erro(metodo)
+            raise
+        finally:
+            duracao = perf_counter() - inicio
+            _metodo_atual.reset(token)
+            with _registro.lock:
+                _registro.chamadas[metodo] = _registro.chamadas.get(metodo, 0) + 1
+            observar(metodo, "total", duracao)
+    return medir
+
+
+def metodo_atual() -> str:
+    """Nome do método do DAO em execução ('fora_do_dao' se nenhum)."""
+    return _metodo_atual.get()
+
+
+def observar(metodo: str, fase: str, segundos: float) -> None:
+    """Registra a duração de uma fase de um método."""
+    registro = _registro
+    with registro.lock:
+        if (histograma := registro.latencias.get((metodo, fase))) is None:
+            histograma = registro.latencias[(metodo, fase)] = Histograma()
+        histograma.observar(segundos)
+
+
+def observar_fase(fase: str, segundos: float) -> None:
+    """Registra a duração de uma fase do método do DAO em execução."""
+    observar(_metodo_atual.get(), fase, segundos)
+
+
+def contar_linhas(quantidade: int) -> None:
+    """Soma linhas lidas ao método do DAO em execução."""
+    metodo = _metodo_atual.get()
+    with _registro.lock:
+        _registro.linhas[metodo] = _registro.linhas.get(metodo, 0) + quantidade
+
+
+def contar_erro(metodo: str | None = None) -> None:
+    """Conta um erro do método informado (padrão: o método do DAO em execução)."""
+    metodo = metodo or _metodo_atual.get()
+    with _registro.lock:
+        _registro.erros[metodo] = _registro.erros.get(metodo, 0) + 1
+
+
+def instantaneo() -> dict:
+    """
+    Retorna as métricas atuais por método.
+
+    Formato: {metodo: {'chamadas', 'erros', 'linhas', 'fases': {fase: {'contagem',
+    'soma', 'max', 'p50', 'p95', 'p99'}}}}, com durações em segundos.
+    """
+    registro = _registro
+    with registro.lock:
+        metodos = set(registro.chamadas) | set(registro.erros) | set(registro.linhas)
+        metodos |= {metodo for metodo, _ in registro.latencias}
+        return {
+            metodo: {
+                "chamadas": registro.chamadas.get(metodo, 0),
+                "erros": registro.erros.get(metodo, 0),
+                "linhas": registro.linhas.get(metodo, 0),
+                "fases": {fase: histograma.resumo()
+                          for (nome, fase), histograma in sorted(registro.latencias.items())
+                          if nome == metodo},
+            }
+            for metodo in sorted(metodos)
+        }
+
+
+def registrar_medidor(nome: str, descricao: str, funcao) -> None:
+    """Registra um valor instantâneo, lido chamando `funcao()` a cada exportação."""
+    _medidores[nome] = (descricao, funcao)
+
+
+def remover_medidor(nome: str) -> None:
+    _medidores.pop(nome, None)
+
+
+def medidores() -> dict[str, float]:
+    """Valores atuais dos medidores registrados."""
+    return {nome: funcao() for nome, (_, funcao) in sorted(_medidores.items())}
+
+
+def exportar_prometheus(prefixo: str = "tarefas_dao") -> str:
+    """Exporta as métricas no formato texto de exposição do Prometheus."""
+    registro = _registro
+    linhas = [
+        f"# HELP {prefixo}_duracao_segundos Duração das chamadas do DAO por método e fase.",
+        f"# TYPE {prefixo}_duracao_segundos histogram",
+    ]
+    with registro.lock:
+        for (metodo, fase), histograma in sorted(registro.latencias.items()):
+            rotulos = f'metodo="{metodo}",fase="{fase}"'
+            acumulado = 0
+            for limite, quantidade in zip(BALDES, histograma.contagens):
+                acumulado += quantidade
+                linhas.append(f'{prefixo}_duracao_segundos_bucket{{{rotulos},le="{limite}"}} {acumulado}')
+            linhas.append(f'{prefixo}_duracao_segundos_bucket{{{rotulos},le="+Inf"}} {histograma.total}')
+            linhas.append(f"{prefixo}_duracao_segundos_sum{{{rotulos}}} {histograma.soma}")
+            linhas.append(f"{prefixo}_duracao_segundos_count{{{rotulos}}} {histograma.total}")
+
+        for nome, descricao, valores in (
+            ("chamadas", "Chamadas aos métodos do DAO.", registro.chamadas),
+            ("erros", "Erros nos métodos do DAO.", registro.erros),
+            ("linhas", "Linhas lidas do banco pelos métodos do DAO.", registro.linhas),
+        ):
+            linhas.append(f"# HELP {prefixo}_{nome}_total {descricao}")
+            linhas.append(f"# TYPE {prefixo}_{nome}_total counter")
+            for metodo, valor in sorted(valores.items()):
+                linhas.append(f'{prefixo}_{nome}_total{{metodo="{metodo}"}} {valor}')
+
+    for nome, (descricao, funcao) in sorted(_medidores.items()):
+        linhas.append(f"# HELP {prefixo}_{nome} {descricao}")
+        linhas.append(f"# TYPE {prefixo}_{nome} gauge")
+        linhas.append(f"{prefixo}_{nome} {funcao()}")
+    return "\n".join(linhas) + "\n"
@@ -1,3 +1,7 @@
+import shutil
+import sys
+
+
 def mostrar_menu():
     """
     Exibe o menu principal de tarefas no terminal.
@@ -11,10 +15,11 @@ def mostrar_menu():
     print("3. Atualizar tarefa")
     print("4. Excluir tarefa")
     print("5. Filtrar tarefas")
+    print("6. Resumo")
     print("0. Sair")
 
 
-def ler_menu(msg, opcoes=(0,1,2,3,4,5)):
+def ler_menu(msg, opcoes=(0,1,2,3,4,5,6)):
     """
     Lê a opção escolhida pelo usuário no menu.
 
@@ -23,7 +28,7 @@ def ler_menu(msg, opcoes=(0,1,2,3,4,5)):
     msg : str
         Mensagem a ser exibida ao solicitar input do usuário.
     opcoes : tuple[int]
-        Tupla de opções válidas (padrão: 0 a 5).
+        Tupla de opções válidas (padrão: 0 a 6).
 
     Retorna:
     --------
@@ -256,6 +261,41 @@ def ler_ordenacao():
             print("Opção invalida")
 
 
+def formatar_tabela(tarefas):
+    """
+    Monta a tabela de tarefas (ID, Título, Prioridade e Status) num único texto.
+
+    Parâmetros:
+    -----------
+    tarefas : list[Tarefa]
+        Tarefas de uma página.
+
+    Retorna:
+    --------
+    str
+        Linhas da tabela, cada uma terminada em quebra de linha.
+
+    Observações:
+    ------------
+    - A largura de cada coluna vem das próprias tarefas. O título é cortado
+      (com "…") para a linha caber na largura do terminal.
+    """
+    id_ = max(len("ID"), *(len(str(t.id)) for t in tarefas))
+    prioridade = max(len("Prioridade"), *(len(t.prioridade) for t in tarefas))
+    status = max(len("Status"), *(len(t.status) for t in tarefas))
+    # Colunas separadas por 2 espaços; o título fica com o que sobra do terminal
+    disponivel = shutil.get_terminal_size((80, 24)).columns - 1 - (id_ + prioridade + status + 6)
+    titulo = max(len("Titulo"), min(max(len(t.titulo) for t in tarefas), disponivel))
+    total = id_ + titulo + prioridade + status + 6
+
+    linhas = [f"{'ID':<{id_}}  {'Titulo':<{titulo}}  {'Prioridade':<{prioridade}}  {'Status':<{status}}", "-"*total]
+    for t in tarefas:
+        texto = t.titulo if len(t.titulo) <= titulo else t.titulo[:titulo - 1] + "…"
+        linhas.append(f"{t.id:<{id_}}  {texto:<{titulo}}  {t.prioridade:<{prioridade}}  {t.status:<{status}}")
+    linhas.append("="*total)
+    return "\n".join(linhas) + "\n"
+
+
 def exibir_tarefas(tarefas):
     """
     Exibe uma lista de tarefas formatadas em tabela no terminal.
@@ -268,16 +308,105 @@ def exibir_tarefas(tarefas):
     Observações:
     ------------
     - Exibe mensagem caso a lista esteja vazia.
-    - Formata colunas de ID, Título, Prioridade e Status.
+    - A tabela (ver `formatar_tabela`) sai numa única escrita no terminal.
+      Para listas grandes, use `exibir_tarefas_paginado`.
     """
     if not tarefas:
         print("⚠️ Nenhuma tarefa encontrada ")
         return
 
-    print("\n=== LISTA DE TAREFAS ===")
-    print(f"{'ID':<5} {'Titulo':<20} {'Prioridade':<14}  {'Status':<13}")
-    print("-"*50)
+    sys.stdout.write("\n=== LISTA DE TAREFAS ===\n" + formatar_tabela(tarefas))
+    sys.stdout.flush()
 
-    for t in tarefas:
-        print(f"{t.id:<5} {t.titulo:<20} {t.prioridade:<14}  {t.status:<13}")
+
+def exibir_tarefas_paginado(buscar_pagina, total=None):
+    """
+    Exibe tarefas uma página por vez, buscando cada página só quando ela é pedida.
+
+    Parâmetros:
+    -----------
+    buscar_pagina : Callable[[str | None], tuple[list[Tarefa], str | None]]
+        Recebe o token da página (None para a primeira) e retorna as tarefas
+        e o token da próxima página (None na última), como
+        TarefaDAO.filtrar_paginado.
+    total : int | None
+        Quantidade total de tarefas, exibida no rodapé quando informada.
+
+    Observações:
+    ------------
+    - ENTER avança, 'a' volta, um número vai para a página e 0 sai. ENTER na
+      última página também sai.
+    - As páginas já vistas ficam guardadas já formatadas: voltar ou pular
+      para uma delas não consulta o banco de novo. Pular para frente busca,
+      em ordem, as páginas que faltam (a paginação por token não salta
+      páginas).
+    - Cada página é escrita no terminal de uma vez.
+    """
+    paginas = []
+    token = None
+    fim = False
+    atual = 0
+    while True:
+        while atual >= len(paginas) and not fim:
+            tarefas, token = buscar_pagina(token)
+            if tarefas:
+                paginas.append(formatar_tabela(tarefas))
+            fim = not tarefas or token is None
+        if not paginas:
+            print("⚠️ Nenhuma tarefa encontrada ")
+            return
+        if atual >= len(paginas):
+            print(f"⚠️ Só há {len(paginas)} página(s).")
+            atual = len(paginas) - 1
+
+        rodape = f"Página {atual + 1}" + (f" de {len(paginas)}" if fim else "")
+        if total is not None:
+            rodape += f" | {total} tarefa(s)"
+        sys.stdout.write("\n=== LISTA DE TAREFAS ===\n" + paginas[atual] + rodape + "\n")
+        sys.stdout.flush()
+
+        ultima = fim and atual == len(paginas) - 1
+        escolha = input("ENTER=Próxima | a=Anterior | nº=Ir para a página | 0=Sair: ").strip().lower()
+        if escolha == "":
+            if ultima:
+                return
+            atual += 1
+        elif escolha == "a":
+            if atual == 0:
+                print("⚠️ Esta já é a primeira página.")
+            atual = max(atual - 1, 0)
+        elif escolha.isdigit():
+            if int(escolha) == 0:
+                return
+            atual = int(escolha) - 1
+        else:
+            print("⚠️ Opção inválida.")
+
+
+def exibir_resumo(contagens, por_dia):
+    """
+    Exibe o resumo das tarefas em tabelas no terminal.
+
+    Parâmetros:
+    -----------
+    contagens : dict[tuple[str, str], int]
+        Quantidade de tarefas por (status, prioridade), como em TarefaDAO.contar_por.
+    por_dia : dict[date, int]
+        Quantidade de tarefas criadas por dia, como em TarefaDAO.contar_por_dia.
+    """
+    prioridades = ("Alta", "Media", "Baixa")
+    status = sorted({s for s, _ in contagens})
+
+    print("\n=== RESUMO DAS TAREFAS ===")
+    print(f"{'Status':<13}" + "".join(f"{p:>8}" for p in prioridades) + f"{'Total':>8}")
+    print("-"*50)
+    for s in status:
+        linha = [contagens.get((s, p), 0) for p in prioridades]
+        print(f"{s:<13}" + "".join(f"{n:>8}" for n in linha) + f"{sum(linha):>8}")
+    totais = [sum(contagens.get((s, p), 0) for s in status) for p in prioridades]
+    print(f"{'Total':<13}" + "".join(f"{n:>8}" for n in totais) + f"{sum(totais):>8}")
+
+    print("\nCriadas nos últimos dias:")
+    for dia, quantidade in por_dia.items():
+        print(f"  {dia.strftime('%d/%m/%Y')}  {quantidade:>6}")
     print('='*50)